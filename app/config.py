@@ -18,6 +18,21 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///db/the55.db"
+    db_pool_size: int = 10  # Connections per Gunicorn worker (threadpool routes + synthesis)
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_read_engine: bool = True  # Separate read-only pool for GET-only polling routes
+    # aiosqlite runs one thread per connection; a small pool avoids GIL thrash under bursts
+    db_async_pool_size: int = 2
+    db_async_max_overflow: int = 2
+
+    # SQLite pragmas (applied to every connection)
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_synchronous: str = "NORMAL"  # Safe with WAL; FULL fsyncs every commit
+    sqlite_cache_size_kb: int = 16384  # Page cache per connection
+    sqlite_mmap_size: int = 134217728  # 128 MB memory-mapped reads (0 disables)
+    sqlite_temp_store_memory: bool = True
+    sqlite_foreign_keys: bool = True
 
     # Auth
     secret_key: str  # Required - for session signing
@@ -29,7 +44,42 @@ class Settings(BaseSettings):
     # Image Library
     image_library_path: str = "static/images/library/reducedlive"  # Web-optimized images
     images_per_page: int = 42  # Images per page in browser
-    image_cache_ttl: int = 300  # Cache TTL in seconds (5 minutes)
+    image_cache_ttl: int = 300  # Directory rescan interval when no manifest exists (seconds)
+    image_manifest_path: str = "db/image_manifest.json"  # Written by the image processor (not web-served)
+    image_shuffle_cache_size: int = 128  # Seeds (sessions) whose shuffled image order is kept
+    image_processing_on_startup: bool = True  # Process new originals in the background after startup
+    image_processing_workers: int = 0  # Resize processes (0 = CPU count)
+    image_processing_state_path: str = "db/image_sources.json"  # Source hashes from the last run
+    image_avif_variants: bool = False  # Also make AVIF grid variants (slower to encode; needs Pillow AVIF)
+
+    # Synthesis worker
+    synthesis_concurrency: int = 2  # Concurrent Claude calls per Gunicorn worker
+    synthesis_max_attempts: int = 3
+    synthesis_retry_base_seconds: float = 5.0  # Backoff: base * 2^(attempt - 1)
+    synthesis_job_timeout: int = 300  # Running jobs older than this are treated as lost
+    synthesis_poll_interval: float = 2.0  # Queue check interval (jobs queued by other workers)
+    synthesis_cache_enabled: bool = True  # Reuse results for identical prompt inputs
+    synthesis_cache_max_entries: int = 500  # Least recently used entries beyond this are evicted
+    synthesis_cache_ttl_days: int = 90  # Entries older than this are not reused
+
+    # Demo synthesis (anonymous landing-page traffic, limits are per Gunicorn worker)
+    demo_synthesis_concurrency: int = 4  # Concurrent Claude calls
+    demo_synthesis_max_waiting: int = 8  # Requests beyond this queue get the pre-baked synthesis
+    demo_synthesis_cache_size: int = 256  # LRU entries keyed by normalized bullets
+    demo_synthesis_timeout: float = 30.0  # Seconds before a Claude call falls back
+
+    # Report export
+    pdf_cache_size: int = 64  # Finished session reports kept per Gunicorn worker
+    export_concurrency: int = 2  # PDF renders at once per Gunicorn worker (others wait)
+    export_archive_batch_size: int = 20  # Sessions loaded and rendered together in bulk exports
+
+    # QR codes
+    qr_cache_dir: str = "db/qr_cache"  # Rendered codes shared by all workers (not web-served)
+    qr_cache_size: int = 64  # Rendered codes kept in memory per Gunicorn worker
+    qr_cache_max_files: int = 512  # Files kept in qr_cache_dir; least recently used are removed
+
+    # Live status
+    status_cache_ttl: float = 3.0  # Max staleness (seconds) for writes made by another worker
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,31 +1,124 @@
 """
 The 55 App - Database engine and session management
 
-SQLAlchemy setup with WAL mode for SQLite concurrency.
+SQLAlchemy setup with WAL mode for SQLite concurrency. Engines are built from
+Settings.database_url with a tunable pragma profile and an explicitly sized pool.
+GET-only polling routes can use a separate read-only engine so they never wait
+for a pool connection behind writers.
+
+Hot async routes (participant join/submit, status polling) use AsyncSession on
+aiosqlite so a slow query or busy wait never blocks the worker's event loop.
 """
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import weakref
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import Settings, get_settings
+
+
+def _is_memory_database(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _unicode_lower(value):
+    """Python's str.lower() for SQL - SQLite's own lower() only folds ASCII."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def _register_sqlite_pragmas(db_engine: Engine, settings: Settings, read_only: bool) -> None:
+    """Apply the configured pragma profile to every new connection."""
+    @event.listens_for(db_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        """Configure SQLite pragmas for each connection."""
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # Persistent in the database file; readers inherit it
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous.upper()}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        if settings.sqlite_temp_store_memory:
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+        dbapi_connection.create_function("unicode_lower", 1, _unicode_lower, deterministic=True)
+
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///db/the55.db"
+def create_db_engine(settings: Settings, read_only: bool = False) -> Engine:
+    """Create an engine for the configured database with pragmas applied on connect."""
+    url = settings.database_url
+    is_sqlite = url.startswith("sqlite")
+    kwargs = {}
+    if is_sqlite:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_database(url):
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    db_engine = create_engine(url, **kwargs)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+    if is_sqlite:
+        _register_sqlite_pragmas(db_engine, settings, read_only)
 
+    return db_engine
 
-# Enable WAL mode and busy_timeout for better concurrency
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Configure SQLite pragmas for each connection."""
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=5000")
-    cursor.close()
 
+def create_async_db_engine(settings: Settings, read_only: bool = False) -> AsyncEngine:
+    """Create an aiosqlite engine for the configured database (same pragmas and pool sizing)."""
+    url = settings.database_url
+    if url.startswith("sqlite:"):
+        url = "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    kwargs = {}
+    if not _is_memory_database(settings.database_url):
+        # aiosqlite defaults to NullPool for files - reuse connections instead.
+        # Checkout waits here are awaited, so a small pool can't stall the event loop.
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_async_pool_size,
+            max_overflow=settings.db_async_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    db_engine = create_async_engine(url, **kwargs)
+
+    if url.startswith("sqlite"):
+        _register_sqlite_pragmas(db_engine.sync_engine, settings, read_only)
+
+    return db_engine
+
+
+_settings = get_settings()
+
+engine = create_db_engine(_settings)
+
+# Read-only engine for GET-only routes (falls back to the main engine for in-memory databases)
+if _settings.db_read_engine and not _is_memory_database(_settings.database_url):
+    read_engine = create_db_engine(_settings, read_only=True)
+else:
+    read_engine = engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = create_async_db_engine(_settings)
+if read_engine is not engine:
+    async_read_engine = create_async_db_engine(_settings, read_only=True)
+else:
+    async_read_engine = async_engine
+
+# expire_on_commit=False: attributes stay readable after commit without lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -37,3 +130,57 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Yield a read-only database session for GET-only routes."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Yield an AsyncSession for async route handlers."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Yield a read-only AsyncSession for GET-only async route handlers."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+# SQLite allows one writer at a time. Async writers queue on this lock (per event
+# loop) instead of all hitting the database and backing off in busy_timeout sleeps.
+_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def async_write_lock() -> asyncio.Lock:
+    """Lock to hold from an async route's first write until its commit."""
+    loop = asyncio.get_running_loop()
+    lock = _write_locks.get(loop)
+    if lock is None:
+        lock = _write_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def begin_write(db: Session) -> None:
+    """
+    Take SQLite's write lock now instead of at the first write (BEGIN IMMEDIATE).
+
+    Call first in read-check-write routes that can race across workers: a
+    concurrent request waits (busy_timeout) until this one commits, then reads
+    its result. No-op on other databases.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("BEGIN IMMEDIATE"))
+
+
+async def dispose_engines() -> None:
+    """Close pooled async connections (application shutdown)."""
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
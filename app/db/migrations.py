@@ -0,0 +1,67 @@
+"""
+The 55 App - Lightweight schema migrations
+
+Base.metadata.create_all() creates missing tables but never alters existing ones.
+These idempotent steps bring older the55.db files up to the current models at startup.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex
+
+from app.db.database import Base
+
+# Columns added after the initial schema: (table, column, SQLite column definition)
+ADDED_COLUMNS = [
+    ("sessions", "status_version", "INTEGER NOT NULL DEFAULT 0"),
+    ("sessions", "synthesis_partial", "TEXT"),
+    ("synthesis_jobs", "force_regenerate", "BOOLEAN NOT NULL DEFAULT 0"),
+    ("sessions", "synthesis_generation", "INTEGER NOT NULL DEFAULT 0"),
+    ("synthesis_jobs", "generation", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+def apply_migrations(engine: Engine) -> None:
+    """Add any missing columns and indexes to existing tables."""
+    inspector = inspect(engine)
+    for table, column, definition in ADDED_COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column in existing:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+            print(f"Migration: added {table}.{column}")
+        except OperationalError as e:
+            # Another Gunicorn worker may have applied it first
+            if "duplicate column" not in str(e).lower():
+                raise
+
+    _create_missing_indexes(engine)
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    """Create indexes declared on the models that older databases lack."""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            with engine.begin() as conn:
+                if index.unique and index.dialect_options["sqlite"]["where"] is None:
+                    _remove_duplicates(conn, table.name, [c.name for c in index.columns])
+                # IF NOT EXISTS: another Gunicorn worker may be creating it concurrently
+                conn.execute(CreateIndex(index, if_not_exists=True))
+            print(f"Migration: created index {index.name}")
+
+
+def _remove_duplicates(conn, table: str, columns: list) -> None:
+    """Keep only the newest row (highest id) per key so a unique index can be built."""
+    key = ", ".join(columns)
+    result = conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY {key})"
+    ))
+    if result.rowcount:
+        print(f"Migration: removed {result.rowcount} duplicate rows from {table} ({key})")
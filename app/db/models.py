@@ -8,7 +8,7 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+    Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Index, text
 )
 from sqlalchemy.orm import relationship
 
@@ -40,6 +40,11 @@ class Team(Base):
     members = relationship("Member", back_populates="team", cascade="all, delete-orphan")
     sessions = relationship("Session", back_populates="team", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Dashboard team and company lists (sorted by company, team; keyset pagination)
+        Index("ix_teams_company_team", "company_name", "team_name", "id"),
+    )
+
 
 class Member(Base):
     """A team member who participates in sessions."""
@@ -53,6 +58,11 @@ class Member(Base):
     team = relationship("Team", back_populates="members")
     responses = relationship("Response", back_populates="member")
 
+    __table_args__ = (
+        # Team roster lookups (filter by team, order by name)
+        Index("ix_members_team_name", "team_id", "name"),
+    )
+
 
 class Session(Base):
     """A monthly diagnostic session for a team."""
@@ -67,6 +77,7 @@ class Session(Base):
     synthesis_gap_type = Column(String(50), nullable=True)
     synthesis_gap_reasoning = Column(Text, nullable=True)
     suggested_recalibrations = Column(Text, nullable=True)  # JSON array of 3 suggestions
+    synthesis_partial = Column(Text, nullable=True)  # JSON object of sections streamed so far
     facilitator_notes = Column(Text, nullable=True)
     facilitator_notes_updated_at = Column(DateTime, nullable=True)
     recalibration_action = Column(Text, nullable=True)
@@ -74,9 +85,23 @@ class Session(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     closed_at = Column(DateTime, nullable=True)
     revealed_at = Column(DateTime, nullable=True)
+    # Bumped on every status-visible change (state, responses, members) - used as ETag
+    status_version = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped when queued synthesis runs are superseded - only the current generation may store
+    synthesis_generation = Column(Integer, default=0, server_default="0", nullable=False)
 
     team = relationship("Team", back_populates="sessions")
     responses = relationship("Response", back_populates="session", cascade="all, delete-orphan")
+    synthesis_jobs = relationship(
+        "SynthesisJob", back_populates="session", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Active session lookups: team + CAPTURING, newest month first
+        Index("ix_sessions_team_state_month", "team_id", "state", "month"),
+        # Dashboard session list (newest first; keyset pagination)
+        Index("ix_sessions_created_at", "created_at", "id"),
+    )
 
 
 class Response(Base):
@@ -94,6 +119,74 @@ class Response(Base):
     session = relationship("Session", back_populates="responses")
     member = relationship("Member", back_populates="responses")
 
+    __table_args__ = (
+        # One response per member per session; also serves session_id lookups
+        Index("uq_responses_session_member", "session_id", "member_id", unique=True),
+        Index("ix_responses_member_id", "member_id"),
+    )
+
+
+class JobStatus(enum.Enum):
+    """Synthesis job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    DONE = "done"
+    SUPERSEDED = "superseded"  # Replaced by a newer run (reopen, changed inputs, regenerate)
+
+
+class SynthesisJob(Base):
+    """A durable synthesis run for a session, claimed and executed by the synthesis worker."""
+    __tablename__ = "synthesis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
+    status = Column(
+        Enum(JobStatus, native_enum=False, values_callable=lambda x: [e.value for e in x]),
+        default=JobStatus.QUEUED, nullable=False
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)  # Retry backoff
+    locked_by = Column(String(100), nullable=True)  # "host:pid" of the worker running it
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    force_regenerate = Column(Boolean, default=False, nullable=False)  # Skip the synthesis cache
+    generation = Column(Integer, default=0, nullable=False)  # Session synthesis_generation it runs for
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    session = relationship("Session", back_populates="synthesis_jobs")
+
+    __table_args__ = (
+        # Worker claim query: next queued job that is due
+        Index("ix_synthesis_jobs_status_run_after", "status", "run_after"),
+        Index("ix_synthesis_jobs_session_id", "session_id"),
+        # At most one queued/running job per session, even across workers
+        Index(
+            "uq_synthesis_jobs_active_session", "session_id", unique=True,
+            sqlite_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+
+class SynthesisCacheEntry(Base):
+    """A stored synthesis result, keyed by a hash of the prompt inputs and model."""
+    __tablename__ = "synthesis_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256 hex
+    model = Column(String(100), nullable=False)
+    output = Column(Text, nullable=False)  # SynthesisOutput JSON
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # LRU eviction order
+        Index("ix_synthesis_cache_last_used_at", "last_used_at"),
+    )
+
 
 class EventType(enum.Enum):
     """Conversion event types for funnel tracking."""
@@ -8,10 +8,11 @@ from functools import lru_cache
 from typing import Annotated
 
 from fastapi import Depends, Request, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import Settings
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db, get_async_db, get_async_read_db
 
 
 @lru_cache
@@ -22,6 +23,9 @@ def get_settings() -> Settings:
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 DbDep = Annotated[Session, Depends(get_db)]
+ReadDbDep = Annotated[Session, Depends(get_read_db)]  # GET-only routes
+AsyncDbDep = Annotated[AsyncSession, Depends(get_async_db)]
+AsyncReadDbDep = Annotated[AsyncSession, Depends(get_async_read_db)]  # GET-only async routes
 
 
 async def require_auth(request: Request, settings: SettingsDep):
@@ -4,6 +4,7 @@ The 55 App - FastAPI entry point
 A real-time facilitation tool for leadership alignment diagnostics.
 """
 
+import asyncio
 import json
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -29,15 +30,46 @@ STATIC_DIR = BASE_DIR / "static"
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup/shutdown events."""
-    # Startup: create database tables
+    # Startup: create database tables and upgrade existing ones
     Base.metadata.create_all(bind=engine)
+    from app.db.migrations import apply_migrations
+    apply_migrations(engine)
 
-    # Process library images (resize for web if needed)
-    from app.services.image_processor import run_on_startup
-    run_on_startup()
+    # Update the image manifest and resize new library images in the background
+    from app.services.image_processor import run_on_startup, stop_background_processing
+    await asyncio.to_thread(run_on_startup)
+
+    # Load the library index now so no request has to build it
+    from app.services.images import get_image_library
+    get_image_library().refresh()
+
+    # Parse the PDF report fonts off the request path
+    from app.services.pdf_export import warm_report_fonts
+    warm_report_fonts()
+
+    # Start the synthesis queue consumer (recovers jobs lost by a previous worker)
+    from app.services.synthesis_jobs import get_synthesis_worker
+    await get_synthesis_worker().start()
 
     yield
-    # Shutdown: cleanup if needed
+
+    # Shutdown: stop taking synthesis jobs (in-flight ones are recovered on next start)
+    await get_synthesis_worker().stop()
+
+    # Shutdown: stop resizing images (unfinished ones are picked up on next start)
+    await asyncio.to_thread(stop_background_processing)
+
+    # Shutdown: drop queued report renders
+    from app.services.exports import get_export_pool
+    get_export_pool().shutdown()
+
+    # Shutdown: end open live status streams so workers can exit
+    from app.services.live import get_event_hub
+    await get_event_hub().close()
+
+    # Close pooled async database connections
+    from app.db.database import dispose_engines
+    await dispose_engines()
 
 
 # Create FastAPI app
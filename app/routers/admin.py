@@ -4,16 +4,30 @@ The 55 App - Admin Router
 Protected dashboard routes for facilitator.
 """
 
+import base64
+import json
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Request, Form, Query
+from fastapi import APIRouter, Request, Form, Query, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import and_, func, or_, tuple_
 from sqlalchemy.orm import joinedload
+from starlette.concurrency import run_in_threadpool
 
 from app.dependencies import AuthDep, DbDep, SettingsDep
-from app.db.models import Team, Session, SessionState
+from app.db.models import Team, Member, Session, SessionState
 from app.services.auth import verify_password, hash_password, update_password_hash
+from app.services.demo_synthesis import get_demo_synthesis_gate
+from app.services.exports import get_export_pool
+from app.services.images import get_image_library
+from app.services.pdf_export import get_pdf_report_cache
+from app.services.qr_codes import get_qr_code_cache
+from app.services.session_status import get_status_cache
+from app.services.synthesis_cache import get_synthesis_cache
+from app.services.synthesis_jobs import get_synthesis_worker
+from app.services.synthesis_output import get_synthesis_output_stats
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 templates = Jinja2Templates(directory="templates")
@@ -110,55 +124,149 @@ async def change_password(
     )
 
 
+@router.get("/api/metrics")
+async def api_metrics(auth: AuthDep):
+    """In-process cache counters for this worker (each Gunicorn worker reports its own)."""
+    return JSONResponse({
+        "status_cache": get_status_cache().stats(),
+        "synthesis_worker": get_synthesis_worker().stats(),
+        "synthesis_cache": await run_in_threadpool(get_synthesis_cache().stats),
+        "demo_synthesis": get_demo_synthesis_gate().stats(),
+        "synthesis_output": get_synthesis_output_stats().stats(),
+        "image_library": get_image_library().stats(),
+        "pdf_export": get_pdf_report_cache().stats(),
+        "report_export": get_export_pool().stats(),
+        "qr_codes": get_qr_code_cache().stats()
+    })
+
+
+# Dashboard list APIs: filtered and paginated in SQL with keyset cursors
+LIST_PAGE_SIZE = 50
+LIST_PAGE_SIZE_MAX = 200
+
+
+def _encode_cursor(values: list) -> str:
+    """Opaque cursor for the sort key of the last item on a page."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _search_filter(term: str, *columns):
+    """
+    Case-insensitive substring match on any of the columns.
+
+    Folds with Python's lower() (unicode_lower, registered per connection) -
+    SQLite's lower()/LIKE only fold ASCII, so "zü" would miss "ZÜRICH".
+    """
+    term = term.lower()
+    return or_(*(func.unicode_lower(column).contains(term, autoescape=True) for column in columns))
+
+
+def _decode_cursor(cursor: Optional[str], length: int) -> Optional[list]:
+    """Sort key from a cursor (None for the first page); 400 if malformed."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _member_counts(db):
+    """Members per team, as a GROUP BY subquery (team_id, member_count)."""
+    return db.query(
+        Member.team_id, func.count(Member.id).label("member_count")
+    ).group_by(Member.team_id).subquery()
+
+
+def _page(items: list, limit: int, cursor_for) -> dict:
+    """Trim the extra lookahead row and build the response envelope."""
+    next_cursor = _encode_cursor(cursor_for(items[limit - 1])) if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
+
+
 @router.get("/api/companies")
-async def api_companies(auth: AuthDep, db: DbDep):
-    """Get unique company names with their teams, alphabetically sorted."""
-    from sqlalchemy.orm import joinedload as jl
-    teams = db.query(Team).options(jl(Team.members)).order_by(Team.company_name, Team.team_name).all()
+async def api_companies(
+    auth: AuthDep,
+    db: DbDep,
+    search: str = Query(default="", description="Search term for filtering companies"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=LIST_PAGE_SIZE, ge=1, le=LIST_PAGE_SIZE_MAX)
+):
+    """Companies with their teams, alphabetically sorted, a page of companies at a time."""
+    search = search.strip()
+    after = _decode_cursor(cursor, 1)
+
+    company_query = db.query(Team.company_name).distinct()
+    if search:
+        company_query = company_query.filter(_search_filter(search, Team.company_name))
+    if after:
+        company_query = company_query.filter(Team.company_name > str(after[0]))
+    names = [row.company_name for row in company_query.order_by(Team.company_name).limit(limit + 1)]
+
+    counts = _member_counts(db)
+    teams = db.query(
+        Team.id, Team.company_name, Team.team_name, Team.code,
+        func.coalesce(counts.c.member_count, 0).label("member_count")
+    ).outerjoin(
+        counts, counts.c.team_id == Team.id
+    ).filter(
+        Team.company_name.in_(names[:limit])
+    ).order_by(Team.company_name, Team.team_name, Team.id).all()
 
     # Group teams by company
-    companies = {}
+    companies = {name: [] for name in names[:limit]}
     for team in teams:
-        company_name = team.company_name or "Unknown"
-        if company_name not in companies:
-            companies[company_name] = []
-        companies[company_name].append({
+        companies[team.company_name].append({
             "id": team.id,
             "team_name": team.team_name,
             "code": team.code,
-            "member_count": len(team.members) if team.members else 0
+            "member_count": team.member_count
         })
 
-    # Convert to sorted list
     result = [
-        {"name": name, "teams": teams}
-        for name, teams in sorted(companies.items())
+        {"name": name or "Unknown", "teams": company_teams}
+        for name, company_teams in companies.items()
     ]
+    next_cursor = _encode_cursor([names[limit - 1]]) if len(names) > limit else None
 
-    return JSONResponse(result)
+    return JSONResponse({"items": result, "next_cursor": next_cursor})
 
 
 @router.get("/api/teams")
 async def api_teams(
     auth: AuthDep,
     db: DbDep,
-    search: str = Query(default="", description="Search term for filtering teams")
+    search: str = Query(default="", description="Search term for filtering teams"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=LIST_PAGE_SIZE, ge=1, le=LIST_PAGE_SIZE_MAX)
 ):
-    """Get all teams, alphabetically sorted, with optional search."""
-    from sqlalchemy.orm import joinedload as jl
-    query = db.query(Team).options(jl(Team.members)).order_by(Team.company_name, Team.team_name)
+    """Teams alphabetically sorted, with optional search, a page at a time."""
+    search = search.strip()
+    after = _decode_cursor(cursor, 3)
 
-    teams = query.all()
+    counts = _member_counts(db)
+    query = db.query(
+        Team.id, Team.company_name, Team.team_name, Team.code,
+        func.coalesce(counts.c.member_count, 0).label("member_count")
+    ).outerjoin(counts, counts.c.team_id == Team.id)
 
-    # Filter by search term if provided
     if search:
-        search_lower = search.lower()
-        teams = [
-            t for t in teams
-            if search_lower in (t.company_name or '').lower()
-            or search_lower in (t.team_name or '').lower()
-            or search_lower in (t.code or '').lower()
-        ]
+        query = query.filter(_search_filter(search, Team.company_name, Team.team_name, Team.code))
+    if after:
+        company_name, team_name, team_id = after
+        try:
+            team_id = int(team_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(
+            tuple_(Team.company_name, Team.team_name, Team.id) > tuple_(str(company_name), str(team_name), team_id)
+        )
+
+    rows = query.order_by(Team.company_name, Team.team_name, Team.id).limit(limit + 1).all()
 
     result = [
         {
@@ -166,46 +274,63 @@ async def api_teams(
             "company_name": team.company_name or '',
             "team_name": team.team_name or '',
             "code": team.code or '',
-            "member_count": len(team.members) if team.members else 0
+            "member_count": team.member_count
         }
-        for team in teams
+        for team in rows
     ]
 
-    return JSONResponse(result)
+    return JSONResponse(_page(result, limit, lambda team: [team["company_name"], team["team_name"], team["id"]]))
 
 
 @router.get("/api/sessions")
 async def api_sessions(
     auth: AuthDep,
     db: DbDep,
-    search: str = Query(default="", description="Search term for filtering sessions")
+    search: str = Query(default="", description="Search term for filtering sessions"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=LIST_PAGE_SIZE, ge=1, le=LIST_PAGE_SIZE_MAX)
 ):
-    """Get all sessions, sorted by created_at DESC, with optional search."""
-    sessions = db.query(Session).options(
-        joinedload(Session.team)
-    ).order_by(Session.created_at.desc()).all()
+    """Sessions sorted by created_at DESC, with optional search, a page at a time."""
+    search = search.strip()
+    after = _decode_cursor(cursor, 2)
+
+    query = db.query(
+        Session.id, Session.month, Session.state, Session.created_at,
+        Team.id.label("team_id"), Team.company_name, Team.team_name
+    ).outerjoin(Team, Team.id == Session.team_id)
 
-    # Filter by search term if provided
     if search:
-        search_lower = search.lower()
-        sessions = [
-            s for s in sessions
-            if search_lower in (s.team.company_name or '').lower()
-            or search_lower in (s.team.team_name or '').lower()
-            or search_lower in (s.month or '')
-        ]
+        query = query.filter(_search_filter(search, Team.company_name, Team.team_name, Session.month))
+    if after:
+        # Sessions without created_at sort last (SQLite puts NULLs last in DESC order)
+        created_at, session_id = after
+        try:
+            session_id = int(session_id)
+            created_at = datetime.fromisoformat(created_at) if created_at else None
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if created_at is None:
+            query = query.filter(Session.created_at.is_(None), Session.id < session_id)
+        else:
+            query = query.filter(or_(
+                Session.created_at < created_at,
+                and_(Session.created_at == created_at, Session.id < session_id),
+                Session.created_at.is_(None)
+            ))
+
+    rows = query.order_by(Session.created_at.desc(), Session.id.desc()).limit(limit + 1).all()
 
     result = [
         {
             "id": session.id,
             "month": session.month or '',
             "state": session.state.value if session.state else 'draft',
-            "company_name": session.team.company_name if session.team else '',
-            "team_name": session.team.team_name if session.team else '',
-            "team_id": session.team.id if session.team else None,
+            "company_name": session.company_name or '',
+            "team_name": session.team_name or '',
+            "team_id": session.team_id,
             "created_at": session.created_at.isoformat() if session.created_at else None
         }
-        for session in sessions
+        for session in rows
     ]
 
-    return JSONResponse(result)
+    return JSONResponse(_page(result, limit, lambda session: [session["created_at"], session["id"]]))
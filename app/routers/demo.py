@@ -19,15 +19,21 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from anthropic import AsyncAnthropic
-from app.schemas import SynthesisOutput
+from app.config import get_settings
 from app.db.database import get_db
 from app.db.models import ConversionEvent, EventType
+from app.services.demo_synthesis import (
+    DemoSynthesisOverloaded, demo_cache_key, get_demo_synthesis_gate
+)
+from app.services.prompts import demo_synthesis_messages
+from app.services.synthesis_output import parse_or_repair
 
 router = APIRouter(prefix="/demo", tags=["demo"])
 templates = Jinja2Templates(directory="templates")
 
 # Anthropic client for real synthesis
 anthropic_client = AsyncAnthropic()
+DEMO_SYNTHESIS_MODEL = "claude-sonnet-4-5-20250929"
 
 
 class DemoSynthesisRequest(BaseModel):
@@ -493,68 +499,69 @@ async def demo_responses(request: Request):
     ))
 
 
-def build_demo_synthesis_prompt(responses: List[dict], strategy_statement: str) -> str:
-    """Build prompt for demo synthesis - same as live app."""
-    responses_text = "\n\n".join([
-        f"**{r['name']}** (Image: {r.get('image_id', 'unknown')}):\n" +
-        "\n".join(f"- {b}" for b in r['bullets'])
-        for r in responses
-    ])
-
-    json_schema = SynthesisOutput.model_json_schema()
-
-    return f"""You are analyzing responses from a leadership team's monthly alignment diagnostic.
-
-## CRITICAL REQUIREMENT - READ FIRST
-The participant named "You" is the CEO who just completed this exercise. Their comments MUST be included.
-In the attributed statements section, "You" MUST appear as a participant in at least 1 statement.
-If you fail to include "You" in the output, the synthesis is invalid.
-
-## Context
-The team's strategy statement (the "3AM test" - what someone should know at 3AM):
-"{strategy_statement}"
-
-## Team Responses
-Each team member selected an image representing their current state and provided bullet points explaining their choice:
-
-{responses_text}
-
-## Your Task
-Synthesize these responses into four parts:
-
-1. **Themes** (2-4 sentences): High-level summary of what the team is experiencing. Focus on patterns across responses.
-
-2. **Attributed Statements**: Specific insights with attribution. Each statement needs:
-   - A short 1-3 word **name** that captures the theme (e.g., "Timeline Mismatch", "Priority Disconnect", "Handoff Friction")
-   - The full statement describing the insight
-   - The names of team members whose responses support it
-   Every person must appear in at least one statement. Each participant should recognise their comments reflected in the themes.
+def _demo_fallback_synthesis(seed: int) -> dict:
+    """Pre-baked synthesis with this seed's team names (used on errors and overload)."""
+    team_members = get_shuffled_team(seed)
+    role_to_name = {member["role"]: member["first_name"] for member in team_members}
 
-3. **Gap Diagnosis**: Identify the primary gap type from exactly one of these three options:
-   - **Direction**: Team lacks shared understanding of goals or priorities
-   - **Alignment**: Team's work is disconnected or uncoordinated
-   - **Commitment**: Individual interests override collective success
+    fallback_statements = []
+    for stmt in DEMO_SYNTHESIS["statements"]:
+        participant_names = [role_to_name.get(role, role) for role in stmt["participants"]]
+        fallback_statements.append({
+            "name": stmt.get("name", ""),
+            "statement": stmt["statement"],
+            "participants": participant_names
+        })
 
-4. **Gap Reasoning** (2-3 sentences): Explain WHY you diagnosed this specific gap type. Reference specific evidence from the responses that led to this conclusion.
+    return {
+        "themes": DEMO_SYNTHESIS["themes"],
+        "gap_type": DEMO_SYNTHESIS["gap_type"],
+        "gap_reasoning": "Analysis based on team response patterns.",
+        "statements": fallback_statements,
+        "suggested_recalibrations": [
+            "Schedule weekly cross-functional sync between product and sales",
+            "Create shared definition of 'transparency' across all departments",
+            "Implement handoff checklist for dev-to-client transitions"
+        ],
+        "fallback": True
+    }
 
-5. **Suggested Recalibrations**: Provide exactly 3 specific, actionable recalibration actions the team could take to address the diagnosed gap.
 
-## Output Format
-Respond ONLY with valid JSON matching this schema:
-```json
-{json.dumps(json_schema, indent=2)}
-```
+async def _generate_demo_synthesis(all_responses: List[dict]) -> dict:
+    """Call Claude for a demo synthesis and return the JSON payload for the layers page."""
+    message = await anthropic_client.messages.create(
+        model=DEMO_SYNTHESIS_MODEL,
+        max_tokens=2048,
+        messages=demo_synthesis_messages(all_responses, DEMO_COMPANY["strategy"]),
+        timeout=get_settings().demo_synthesis_timeout
+    )
 
-IMPORTANT - VALIDATION RULES:
-- gap_type MUST be exactly one of: "Direction", "Alignment", or "Commitment"
-- gap_reasoning MUST explain WHY this gap type was chosen based on evidence
-- statements array should contain 3-6 attributed insights
-- Each statement MUST have a short 1-3 word "name" that captures the theme
-- "You" MUST appear in the participants array of at least 1 statement (this is the CEO - mandatory)
-- All other team members should appear in at least one statement
-- suggested_recalibrations MUST contain exactly 3 actionable items
+    # Extract and validate (one repair request if the output is invalid)
+    result = await parse_or_repair(
+        message.content[0].text, anthropic_client, DEMO_SYNTHESIS_MODEL,
+        timeout=get_settings().demo_synthesis_timeout,
+        stop_reason=message.stop_reason
+    )
 
-FAILURE TO INCLUDE "You" IN AT LEAST 1 STATEMENT WILL INVALIDATE THE RESPONSE."""
+    # Validate that "You" appears in statements - fix if missing
+    statements_data = [s.model_dump() for s in result.statements]
+    you_included = any("You" in s.get("participants", []) for s in statements_data)
+
+    if not you_included:
+        # Claude didn't include "You" - inject into first statement
+        print("WARNING: AI did not include 'You' in synthesis - injecting")
+        if statements_data:
+            statements_data[0]["participants"].append("You")
+    else:
+        print("OK: AI included 'You' in synthesis")
+
+    return {
+        "themes": result.themes,
+        "gap_type": result.gap_type,
+        "gap_reasoning": result.gap_reasoning,
+        "statements": statements_data,
+        "suggested_recalibrations": result.suggested_recalibrations
+    }
 
 
 @router.post("/api/synthesize")
@@ -563,6 +570,8 @@ async def demo_synthesize_api(request_body: DemoSynthesisRequest):
 
     This endpoint is called via AJAX from the layers page to generate
     real synthesis that includes the demo user's actual comments.
+    Calls are limited per worker and cached by normalized bullets; when the
+    limiter is full the pre-baked synthesis is returned immediately.
     """
     try:
         seed = request_body.seed
@@ -602,77 +611,21 @@ async def demo_synthesize_api(request_body: DemoSynthesisRequest):
                     "bullets": response_data["bullets"]
                 })
 
-        # Build prompt and call Claude
-        prompt = build_demo_synthesis_prompt(all_responses, DEMO_COMPANY["strategy"])
-
-        message = await anthropic_client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2048,
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
+        cache_key = demo_cache_key(
+            user_bullets, user_image_id, [member["first_name"] for member in team_members]
         )
+        result = await get_demo_synthesis_gate().run(
+            cache_key, lambda: _generate_demo_synthesis(all_responses)
+        )
+        return JSONResponse(content=result)
 
-        # Parse response
-        response_text = message.content[0].text
-
-        # Handle potential markdown code block wrapping
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:-1])
-
-        result_data = json.loads(response_text)
-        result = SynthesisOutput(**result_data)
-
-        # Validate that "You" appears in statements - fix if missing
-        statements_data = [s.model_dump() for s in result.statements]
-        you_included = any("You" in s.get("participants", []) for s in statements_data)
-
-        if not you_included:
-            # Claude didn't include "You" - inject into first statement
-            print("WARNING: AI did not include 'You' in synthesis - injecting")
-            if statements_data:
-                statements_data[0]["participants"].append("You")
-        else:
-            print("OK: AI included 'You' in synthesis")
-
-        # Return synthesis data
-        return JSONResponse(content={
-            "themes": result.themes,
-            "gap_type": result.gap_type,
-            "gap_reasoning": result.gap_reasoning,
-            "statements": statements_data,
-            "suggested_recalibrations": result.suggested_recalibrations
-        })
-
+    except DemoSynthesisOverloaded:
+        # Shed under load - no log line per request during a spike
+        return JSONResponse(content=_demo_fallback_synthesis(request_body.seed))
     except Exception as e:
         print(f"Demo synthesis error: {e}")
         # Return fallback pre-baked synthesis on error
-        team_members = get_shuffled_team(request_body.seed)
-        role_to_name = {member["role"]: member["first_name"] for member in team_members}
-
-        fallback_statements = []
-        for stmt in DEMO_SYNTHESIS["statements"]:
-            participant_names = [role_to_name.get(role, role) for role in stmt["participants"]]
-            fallback_statements.append({
-                "name": stmt.get("name", ""),
-                "statement": stmt["statement"],
-                "participants": participant_names
-            })
-
-        return JSONResponse(content={
-            "themes": DEMO_SYNTHESIS["themes"],
-            "gap_type": DEMO_SYNTHESIS["gap_type"],
-            "gap_reasoning": "Analysis based on team response patterns.",
-            "statements": fallback_statements,
-            "suggested_recalibrations": [
-                "Schedule weekly cross-functional sync between product and sales",
-                "Create shared definition of 'transparency' across all departments",
-                "Implement handoff checklist for dev-to-client transitions"
-            ],
-            "fallback": True
-        })
+        return JSONResponse(content=_demo_fallback_synthesis(request_body.seed))
 
 
 @router.get("/synthesis")
@@ -32,7 +32,7 @@ async def list_images(
 
     Returns:
         {
-            images: [{id, filename, url}, ...],
+            images: [{id, url, thumb_url, srcset, avif_srcset, placeholder}, ...],
             total: int,
             page: int,
             per_page: int,
@@ -10,6 +10,7 @@ from fastapi.templating import Jinja2Templates
 
 from app.dependencies import AuthDep, DbDep
 from app.db.models import Team, Member
+from app.services.live import commit_team_change
 
 router = APIRouter(prefix="/admin/teams", tags=["members"])
 templates = Jinja2Templates(directory="templates")
@@ -97,7 +98,7 @@ async def add_member(
     # Add member
     member = Member(team_id=team_id, name=name)
     db.add(member)
-    db.commit()
+    commit_team_change(db, team_id)
 
     return RedirectResponse(url=f"/admin/teams/{team_id}/members", status_code=303)
 
@@ -112,6 +113,6 @@ async def remove_member(team_id: int, member_id: int, auth: AuthDep, db: DbDep):
 
     if member:
         db.delete(member)
-        db.commit()
+        commit_team_change(db, team_id)
 
     return RedirectResponse(url=f"/admin/teams/{team_id}/members", status_code=303)
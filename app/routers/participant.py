@@ -9,13 +9,25 @@ import json
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse, Response as HttpResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db, get_async_db, get_async_read_db, async_write_lock
 from app.db.models import Team, Member, Session as SessionModel, SessionState, Response
 from app.services.images import get_image_library
+from app.services.responses import load_session_responses, upsert_response
+from app.services.live import commit_session_change_async, stream_session_events
+from app.services.session_status import (
+    get_status_snapshot,
+    get_status_snapshot_async,
+    get_status_version,
+    status_etag,
+    etag_matches,
+    participant_status_payload,
+)
 from app.config import get_settings
 
 router = APIRouter(prefix="/join", tags=["participant"])
@@ -23,6 +35,9 @@ templates = Jinja2Templates(directory="templates")
 
 # Database dependency without auth
 DbDep = Annotated[Session, Depends(get_db)]
+ReadDbDep = Annotated[Session, Depends(get_read_db)]  # GET-only polling routes
+# Async sessions for the hot join/submit/status paths (never block the event loop)
+AsyncDbDep = Annotated[AsyncSession, Depends(get_async_db)]
 
 
 @router.get("")
@@ -38,20 +53,22 @@ async def join_form(request: Request, code: str = None):
 async def auto_join(
     request: Request,
     code: str,
-    db: DbDep
+    db: AsyncDbDep
 ):
     """Auto-join from URL (e.g. QR code scan). Validates code and skips to appropriate step."""
     code = code.strip().upper()
 
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
     # Get CAPTURING sessions
-    sessions = db.query(SessionModel).filter(
-        SessionModel.team_id == team.id,
-        SessionModel.state == SessionState.CAPTURING
-    ).order_by(SessionModel.month.desc()).all()
+    sessions = (await db.scalars(
+        select(SessionModel).where(
+            SessionModel.team_id == team.id,
+            SessionModel.state == SessionState.CAPTURING
+        ).order_by(SessionModel.month.desc())
+    )).all()
 
     if not sessions:
         return RedirectResponse(url="/join", status_code=303)
@@ -73,14 +90,14 @@ async def auto_join(
 @router.post("")
 async def join_team(
     request: Request,
-    db: DbDep,
+    db: AsyncDbDep,
     code: str = Form(...)
 ):
     """Process team code and redirect to session selection."""
     # Normalize code (uppercase, strip whitespace)
     code = code.strip().upper()
 
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return templates.TemplateResponse(
             "participant/join.html",
@@ -88,10 +105,12 @@ async def join_team(
         )
 
     # Get sessions in CAPTURING state
-    active_sessions = db.query(SessionModel).filter(
-        SessionModel.team_id == team.id,
-        SessionModel.state == SessionState.CAPTURING
-    ).order_by(SessionModel.month.desc()).all()
+    active_sessions = (await db.scalars(
+        select(SessionModel).where(
+            SessionModel.team_id == team.id,
+            SessionModel.state == SessionState.CAPTURING
+        ).order_by(SessionModel.month.desc())
+    )).all()
 
     if not active_sessions:
         return templates.TemplateResponse(
@@ -117,19 +136,21 @@ async def join_team(
 async def select_session_form(
     request: Request,
     code: str,
-    db: DbDep
+    db: AsyncDbDep
 ):
     """Show session selection (month stepper)."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
     # Get CAPTURING sessions
-    sessions = db.query(SessionModel).filter(
-        SessionModel.team_id == team.id,
-        SessionModel.state == SessionState.CAPTURING
-    ).order_by(SessionModel.month.desc()).all()
+    sessions = (await db.scalars(
+        select(SessionModel).where(
+            SessionModel.team_id == team.id,
+            SessionModel.state == SessionState.CAPTURING
+        ).order_by(SessionModel.month.desc())
+    )).all()
 
     if not sessions:
         return RedirectResponse(url="/join", status_code=303)
@@ -156,20 +177,20 @@ async def select_session_form(
 async def select_session(
     request: Request,
     code: str,
-    db: DbDep,
+    db: AsyncDbDep,
     session_id: int = Form(...)
 ):
     """Process session selection and redirect to name selection."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
-    session = db.query(SessionModel).filter(
+    session = await db.scalar(select(SessionModel).where(
         SessionModel.id == session_id,
         SessionModel.team_id == team.id,
         SessionModel.state == SessionState.CAPTURING
-    ).first()
+    ))
 
     if not session:
         return RedirectResponse(url=f"/join/{code}/session", status_code=303)
@@ -185,33 +206,32 @@ async def select_name_form(
     request: Request,
     code: str,
     session_id: int,
-    db: DbDep
+    db: AsyncDbDep
 ):
     """Show name selection from team members."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
-    session = db.query(SessionModel).filter(
+    session = await db.scalar(select(SessionModel).where(
         SessionModel.id == session_id,
         SessionModel.team_id == team.id,
         SessionModel.state == SessionState.CAPTURING
-    ).first()
+    ))
 
     if not session:
         return RedirectResponse(url=f"/join/{code}/session", status_code=303)
 
     # Get team members sorted by name
-    members = db.query(Member).filter(
-        Member.team_id == team.id
-    ).order_by(Member.name).all()
+    members = (await db.scalars(
+        select(Member).where(Member.team_id == team.id).order_by(Member.name)
+    )).all()
 
     # Get members who already responded
-    responded_ids = {
-        r.member_id for r in
-        db.query(Response.member_id).filter(Response.session_id == session_id).all()
-    }
+    responded_ids = set((await db.scalars(
+        select(Response.member_id).where(Response.session_id == session_id)
+    )).all())
 
     return templates.TemplateResponse(
         "participant/select_name.html",
@@ -230,28 +250,28 @@ async def select_name(
     request: Request,
     code: str,
     session_id: int,
-    db: DbDep,
+    db: AsyncDbDep,
     member_id: int = Form(...)
 ):
     """Process name selection and redirect to strategy/response."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
-    session = db.query(SessionModel).filter(
+    session = await db.scalar(select(SessionModel).where(
         SessionModel.id == session_id,
         SessionModel.team_id == team.id,
         SessionModel.state == SessionState.CAPTURING
-    ).first()
+    ))
 
     if not session:
         return RedirectResponse(url=f"/join/{code}/session", status_code=303)
 
-    member = db.query(Member).filter(
+    member = await db.scalar(select(Member).where(
         Member.id == member_id,
         Member.team_id == team.id
-    ).first()
+    ))
 
     if not member:
         return RedirectResponse(
@@ -290,27 +310,27 @@ async def respond_form(
     code: str,
     session_id: int,
     member_id: int,
-    db: DbDep
+    db: AsyncDbDep
 ):
     """Show image browser for response selection."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
+    team = await db.scalar(select(Team).where(Team.code == code))
     if not team:
         return RedirectResponse(url="/join", status_code=303)
 
     # Get session (any state for now, check state separately)
-    session = db.query(SessionModel).filter(
+    session = await db.scalar(select(SessionModel).where(
         SessionModel.id == session_id,
         SessionModel.team_id == team.id
-    ).first()
+    ))
 
     if not session:
         return RedirectResponse(url=f"/join/{code}/session", status_code=303)
 
-    member = db.query(Member).filter(
+    member = await db.scalar(select(Member).where(
         Member.id == member_id,
         Member.team_id == team.id
-    ).first()
+    ))
 
     if not member:
         return RedirectResponse(
@@ -319,10 +339,10 @@ async def respond_form(
         )
 
     # Check for existing response
-    existing_response = db.query(Response).filter(
+    existing_response = await db.scalar(select(Response).where(
         Response.session_id == session_id,
         Response.member_id == member_id
-    ).first()
+    ))
 
     # State validation: handle non-CAPTURING states gracefully
     if session.state != SessionState.CAPTURING:
@@ -391,34 +411,36 @@ async def submit_response(
     code: str,
     session_id: int,
     member_id: int,
-    db: DbDep,
+    db: AsyncDbDep,
     image_id: str = Form(...),
     bullets: str = Form(...)
 ):
     """Process response submission."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
-    if not team:
-        return RedirectResponse(url="/join", status_code=303)
 
-    # Get session (any state for now, check state separately)
-    session = db.query(SessionModel).filter(
-        SessionModel.id == session_id,
-        SessionModel.team_id == team.id
-    ).first()
+    # Validate team code, session and member in one query (member checked against
+    # the team below - the closed page is shown for whichever member was given, as before)
+    row = (await db.execute(
+        select(SessionModel, Team, Member, Response.id).join(
+            Team, Team.id == SessionModel.team_id
+        ).outerjoin(
+            Member, Member.id == member_id
+        ).outerjoin(
+            Response, and_(Response.session_id == SessionModel.id, Response.member_id == member_id)
+        ).where(
+            SessionModel.id == session_id,
+            Team.code == code
+        )
+    )).first()
 
-    if not session:
+    if not row:
+        # Unknown session for this code (session picker redirects on to /join if the code is bad)
         return RedirectResponse(url=f"/join/{code}/session", status_code=303)
+    session, team, member, existing_response_id = row
 
     # Check if session is still accepting submissions
     if session.state != SessionState.CAPTURING:
-        # Check if member already has a response
-        existing_response = db.query(Response).filter(
-            Response.session_id == session_id,
-            Response.member_id == member_id
-        ).first()
-
-        if existing_response:
+        if existing_response_id is not None:
             # Response was saved before state changed
             return RedirectResponse(
                 url=f"/join/{code}/session/{session_id}/member/{member_id}/waiting",
@@ -432,17 +454,12 @@ async def submit_response(
                     "request": request,
                     "team": team,
                     "session": session,
-                    "member": db.query(Member).filter(Member.id == member_id).first(),
+                    "member": member,
                     "submission_error": "The session was closed before your response could be saved."
                 }
             )
 
-    member = db.query(Member).filter(
-        Member.id == member_id,
-        Member.team_id == team.id
-    ).first()
-
-    if not member:
+    if not member or member.team_id != team.id:
         return RedirectResponse(url="/join", status_code=303)
 
     # Validate image_id (non-empty string)
@@ -471,27 +488,10 @@ async def submit_response(
     # Store validated bullets back as JSON
     bullets_json = json.dumps(bullets_list)
 
-    # Check for existing response
-    existing = db.query(Response).filter(
-        Response.session_id == session_id,
-        Response.member_id == member_id
-    ).first()
-
-    if existing:
-        # Update existing response
-        existing.image_id = image_id
-        existing.bullets = bullets_json
-    else:
-        # Insert new response
-        response = Response(
-            session_id=session_id,
-            member_id=member_id,
-            image_id=image_id,
-            bullets=bullets_json
-        )
-        db.add(response)
-
-    db.commit()
+    # Single INSERT ... ON CONFLICT DO UPDATE - safe against double-tapped submits
+    async with async_write_lock():
+        await db.run_sync(upsert_response, session_id, member_id, image_id, bullets_json)
+        await commit_session_change_async(db, session_id)
 
     # Redirect to waiting page
     return RedirectResponse(
@@ -591,25 +591,13 @@ async def view_synthesis(
         except json.JSONDecodeError:
             synthesis_statements = []
 
-    # Fetch individual responses with member names and images
-    responses = db.query(Response).filter(Response.session_id == session_id).all()
-    image_library = get_image_library()
-    individual_responses = []
-    for resp in responses:
-        member = db.query(Member).filter(Member.id == resp.member_id).first()
-        if member:
-            try:
-                bullets = json.loads(resp.bullets) if resp.bullets else []
-            except json.JSONDecodeError:
-                bullets = []
-            # Get image URL from image_id
-            filename = image_library.get_filename_by_id(resp.image_id)
-            image_url = f"/static/images/library/reducedlive/{filename}" if filename else None
-            individual_responses.append({
-                "name": member.name,
-                "image_url": image_url,
-                "bullets": bullets
-            })
+    # Individual responses with member names and images (one joined query)
+    bundle = load_session_responses(db, session_id)
+    individual_responses = [{
+        "name": r.name,
+        "image_url": r.image_url,
+        "bullets": r.bullets
+    } for r in bundle.responses if r.name is not None]
 
     return templates.TemplateResponse(
         "participant/synthesis.html",
@@ -627,78 +615,38 @@ async def view_synthesis(
 
 @router.get("/{code}/session/{session_id}/status")
 async def get_participant_status(
+    request: Request,
     code: str,
     session_id: int,
     member_id: int = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get session status for participant polling (JSON endpoint)."""
+    """Get session status for participant polling (JSON endpoint, supports If-None-Match)."""
     code = code.strip().upper()
-    team = db.query(Team).filter(Team.code == code).first()
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
+    row = await db.run_sync(get_status_version, session_id)
+    if not row or row[1] != code:
+        raise HTTPException(status_code=404, detail="Session not found")
+    version = row[0]
 
-    session = db.query(SessionModel).filter(
-        SessionModel.id == session_id,
-        SessionModel.team_id == team.id
-    ).first()
+    etag = status_etag(session_id, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return HttpResponse(status_code=304, headers={"ETag": etag})
 
-    if not session:
+    snapshot = await get_status_snapshot_async(db, session_id, version)
+    if not snapshot:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Get member counts
-    members = db.query(Member).filter(Member.team_id == team.id).all()
-    responses = db.query(Response).filter(Response.session_id == session_id).all()
-
-    # Build synthesis progress for CLOSED state
-    synthesis_progress = None
-    if session.state == SessionState.CLOSED:
-        if session.synthesis_themes is None:
-            synthesis_progress = {
-                "status": "pending",
-                "message": "Preparing analysis..."
-            }
-        elif session.synthesis_themes.lower() == "generating...":
-            synthesis_progress = {
-                "status": "generating",
-                "message": "Analyzing team responses..."
-            }
-        elif "failed" in session.synthesis_themes.lower():
-            synthesis_progress = {
-                "status": "failed",
-                "message": "Analysis encountered an issue. Your facilitator will retry."
-            }
-        else:
-            synthesis_progress = {
-                "status": "complete",
-                "message": "Analysis complete!"
-            }
-
-    # Build submitted member names (privacy: names only, no IDs)
-    submitted_ids = {r.member_id for r in responses}
-    submitted_members = [
-        {"name": m.name}
-        for m in members
-        if m.id in submitted_ids
-    ]
-
-    # Build unsubmitted member names
-    unsubmitted_members = [
-        {"name": m.name}
-        for m in members
-        if m.id not in submitted_ids
-    ]
+    payload = participant_status_payload(snapshot)
 
     # Build member's own response data when closed (for display on waiting screen)
     my_response = None
-    if member_id and session.state == SessionState.CLOSED:
-        response = db.query(Response).filter(
+    if member_id and snapshot.state == SessionState.CLOSED:
+        response = await db.scalar(select(Response).where(
             Response.session_id == session_id,
             Response.member_id == member_id
-        ).first()
+        ))
         if response:
-            import json
-            from app.services.images import get_image_library
+            team = await db.get(Team, snapshot.team_id)
             bullets = json.loads(response.bullets) if response.bullets else []
             # Get actual filename from opaque ID
             image_library = get_image_library()
@@ -712,14 +660,35 @@ async def get_participant_status(
                 "bullet_prompt": "And you described why you chose this image"
             }
 
-    return JSONResponse({
-        "session_id": session_id,
-        "state": session.state.value,
-        "total_members": len(members),
-        "submitted_count": len(responses),
-        "submitted_members": submitted_members,
-        "unsubmitted_members": unsubmitted_members,
-        "can_edit": session.state == SessionState.CAPTURING,
-        "synthesis_progress": synthesis_progress,
-        "my_response": my_response
-    })
+    payload["my_response"] = my_response
+    return JSONResponse(
+        payload,
+        headers={"ETag": status_etag(session_id, snapshot.version), "Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/{code}/session/{session_id}/events")
+async def participant_events(
+    request: Request,
+    code: str,
+    session_id: int,
+    db: ReadDbDep
+):
+    """Live status stream (Server-Sent Events) for the participant waiting screen."""
+    code = code.strip().upper()
+    snapshot = get_status_snapshot(db, session_id)
+    if not snapshot or snapshot.team_code != code:
+        raise HTTPException(status_code=404, detail="Session not found")
+    db.close()  # Stream is long-lived; don't hold a pooled connection
+
+    def render(previous, current):
+        payload = participant_status_payload(current)
+        if previous is not None and payload == participant_status_payload(previous):
+            return None  # Change not visible to participants (e.g. member IDs)
+        return payload
+
+    return StreamingResponse(
+        stream_session_events(request, session_id, render),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
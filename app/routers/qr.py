@@ -1,17 +1,17 @@
 """
 The 55 App - QR Code Router
 
-Generates QR codes for team join URLs.
+Serves QR codes for team join URLs (rendered and cached by the QR code service).
 """
 
-import io
-import qrcode
-
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 
 from app.dependencies import AuthDep, DbDep
 from app.db.models import Team
+from app.services.qr_codes import QR_FORMATS, QrSpec, get_qr_code_cache
+from app.services.session_status import etag_matches
 
 router = APIRouter(prefix="/admin/qr", tags=["qr"])
 
@@ -24,49 +24,42 @@ def get_base_url(request: Request) -> str:
     return f"{proto}://{host}"
 
 
+def _team_spec(request: Request, team: Team, fmt: str, **options) -> QrSpec:
+    if fmt not in QR_FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be png or svg")
+    join_url = f"{get_base_url(request)}/join?code={team.code}"
+    return QrSpec(join_url=join_url, code=team.code, fmt=fmt, **options)
+
+
+async def _qr_response(request: Request, spec: QrSpec, disposition: str) -> Response:
+    """Cached QR code with a strong ETag (304 when the client already has it)."""
+    headers = {
+        "ETag": spec.etag,
+        "Cache-Control": "private, no-cache"  # Revalidate - the team code may change
+    }
+    if etag_matches(request.headers.get("if-none-match"), spec.etag):
+        return Response(status_code=304, headers=headers)
+
+    content = await run_in_threadpool(get_qr_code_cache().get, spec)
+    headers["Content-Disposition"] = disposition
+    return Response(content=content, media_type=spec.media_type, headers=headers)
+
+
 @router.get("/team/{team_id}")
 async def generate_qr(
     request: Request,
     team_id: int,
     auth: AuthDep,
-    db: DbDep
+    db: DbDep,
+    format: str = "png"
 ):
-    """Generate QR code PNG for team join URL (500x500 pixels)."""
+    """QR code for team join URL: 500x500 PNG, or SVG for projectors (format=svg)."""
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    # Build join URL
-    base_url = get_base_url(request)
-    join_url = f"{base_url}/join?code={team.code}"
-
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(join_url)
-    qr.make(fit=True)
-
-    # Create image and resize to exactly 500x500
-    img = qr.make_image(fill_color="black", back_color="white")
-    img = img.resize((500, 500))
-
-    # Return as PNG
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="image/png",
-        headers={
-            "Content-Disposition": f"inline; filename=qr-{team.code}.png",
-            "Cache-Control": "max-age=3600"  # Cache for 1 hour
-        }
-    )
+    spec = _team_spec(request, team, format, error_correction="M", box_size=10, size=500)
+    return await _qr_response(request, spec, f"inline; filename=qr-{team.code}.{spec.fmt}")
 
 
 @router.get("/team/{team_id}/download")
@@ -74,37 +67,14 @@ async def download_qr(
     request: Request,
     team_id: int,
     auth: AuthDep,
-    db: DbDep
+    db: DbDep,
+    format: str = "png"
 ):
-    """Download QR code PNG for team join URL."""
+    """Download QR code (PNG, or SVG with format=svg) for team join URL."""
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    # Build join URL
-    base_url = get_base_url(request)
-    join_url = f"{base_url}/join?code={team.code}"
-
-    # Generate QR code - larger for printing
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,  # High error correction for printing
-        box_size=15,  # Larger for print
-        border=4,
-    )
-    qr.add_data(join_url)
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type="image/png",
-        headers={
-            "Content-Disposition": f"attachment; filename=the55-qr-{team.code}.png"
-        }
-    )
+    # High error correction and larger modules for printing
+    spec = _team_spec(request, team, format, error_correction="H", box_size=15)
+    return await _qr_response(request, spec, f"attachment; filename=the55-qr-{team.code}.{spec.fmt}")
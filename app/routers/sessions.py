@@ -5,25 +5,48 @@ Session management and control endpoints for facilitator.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 import json
+import re
 
-from fastapi import APIRouter, Request, Form, HTTPException, BackgroundTasks
-from fastapi.responses import RedirectResponse, JSONResponse, Response
+from fastapi import APIRouter, Request, Form, HTTPException
+from fastapi.responses import RedirectResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from sqlalchemy.orm import joinedload
 
-from app.dependencies import AuthDep, DbDep
+from app.dependencies import AuthDep, DbDep, ReadDbDep, AsyncReadDbDep
+from app.db.database import begin_write
 from app.db.models import Team, Member, Session, Response as ResponseModel, SessionState
-from app.services.synthesis import run_synthesis_task
-from app.services.pdf_export import generate_session_pdf
+from app.services.synthesis_jobs import enqueue_synthesis, get_synthesis_worker, supersede_synthesis
+from app.services.live import commit_session_change, commit_team_change, stream_session_events
+from app.services.session_status import (
+    get_status_snapshot_async,
+    get_status_version,
+    status_etag,
+    etag_matches,
+    admin_status_payload,
+    admin_status_delta,
+)
+from app.services.exports import (
+    get_export_pool,
+    iter_responses_json,
+    iter_session_archive,
+    iter_session_json,
+    iter_session_markdown,
+    parse_archive_formats,
+)
+from app.services.pdf_export import get_pdf_report_cache
+from app.services.responses import load_session_responses
 
 router = APIRouter(prefix="/admin/sessions", tags=["sessions"])
 templates = Jinja2Templates(directory="templates")
 
 
+MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
 def get_current_month() -> str:
     """Get current month in YYYY-MM format."""
     return datetime.utcnow().strftime("%Y-%m")
@@ -135,19 +158,15 @@ async def session_history(request: Request, auth: AuthDep, db: DbDep):
 @router.get("/{session_id}")
 async def view_session(request: Request, session_id: int, auth: AuthDep, db: DbDep, error: str = None):
     """View session details and control panel."""
-    from app.services.images import get_image_library
-
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         return RedirectResponse(url="/admin/teams", status_code=303)
 
-    team = session.team
+    session, team = bundle.session, bundle.team
     members = db.query(Member).filter(Member.team_id == team.id).order_by(Member.name).all()
-    member_by_id = {m.id: m for m in members}
 
     # Get response status for each member
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-    responded_member_ids = {r.member_id for r in responses}
+    responded_member_ids = {r.member_id for r in bundle.responses}
 
     member_status = []
     for member in members:
@@ -177,29 +196,11 @@ async def view_session(request: Request, session_id: int, auth: AuthDep, db: DbD
     )
 
     # Build participant responses with images for display
-    image_library = get_image_library()
-    participant_responses = []
-    for r in responses:
-        member = member_by_id.get(r.member_id)
-        # Get actual filename from opaque ID
-        filename = image_library.get_filename_by_id(r.image_id)
-        if filename:
-            image_url = f"/static/images/library/reducedlive/{filename}"
-        else:
-            image_url = None
-
-        bullets = []
-        if r.bullets:
-            try:
-                bullets = json.loads(r.bullets)
-            except (json.JSONDecodeError, TypeError):
-                bullets = []
-
-        participant_responses.append({
-            "name": member.name if member else "Unknown",
-            "image_url": image_url,
-            "bullets": bullets
-        })
+    participant_responses = [{
+        "name": r.display_name,
+        "image_url": r.image_url,
+        "bullets": r.bullets
+    } for r in bundle.responses]
 
     # Don't pass "GENERATING..." as actual themes to display
     display_themes = None
@@ -238,8 +239,9 @@ async def view_session(request: Request, session_id: int, auth: AuthDep, db: DbD
 
 
 @router.post("/{session_id}/close")
-async def close_capture(session_id: int, background_tasks: BackgroundTasks, auth: AuthDep, db: DbDep):
+async def close_capture(session_id: int, auth: AuthDep, db: DbDep):
     """Transition session from capturing to closed, then auto-trigger synthesis."""
+    begin_write(db)  # Concurrent requests from other workers queue behind this one
     session = db.query(Session).filter(Session.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -253,11 +255,11 @@ async def close_capture(session_id: int, background_tasks: BackgroundTasks, auth
     session.state = SessionState.CLOSED
     session.closed_at = datetime.utcnow()
 
-    # Auto-trigger synthesis: set marker and queue background task
+    # Auto-trigger synthesis: set marker and queue a synthesis job
     session.synthesis_themes = "GENERATING..."
-    db.commit()
-
-    background_tasks.add_task(run_synthesis_task, session_id)
+    enqueue_synthesis(db, session_id)
+    commit_session_change(db, session_id)
+    get_synthesis_worker().wake()
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -265,6 +267,7 @@ async def close_capture(session_id: int, background_tasks: BackgroundTasks, auth
 @router.post("/{session_id}/reopen")
 async def reopen_capture(session_id: int, auth: AuthDep, db: DbDep):
     """Transition session from closed or revealed back to capturing (for latecomers)."""
+    begin_write(db)
     session = db.query(Session).filter(Session.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -275,14 +278,16 @@ async def reopen_capture(session_id: int, auth: AuthDep, db: DbDep):
             detail=f"Cannot reopen. Session is in '{session.state.value}' state."
         )
 
-    # Clear synthesis data (will need regeneration)
+    # Clear synthesis data (will need regeneration); a run still in flight must not store
+    supersede_synthesis(db, session)
     session.synthesis_themes = None
     session.synthesis_statements = None
     session.synthesis_gap_type = None
+    session.synthesis_partial = None
 
     session.state = SessionState.CAPTURING
     session.closed_at = None  # Reset close timestamp
-    db.commit()
+    commit_session_change(db, session_id)
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -316,7 +321,7 @@ async def clear_member_submission(
         raise HTTPException(status_code=404, detail="No submission found")
 
     db.delete(response)
-    db.commit()
+    commit_session_change(db, session_id)
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -367,7 +372,7 @@ async def add_member_from_session(
 
     member = Member(team_id=team.id, name=name)
     db.add(member)
-    db.commit()
+    commit_team_change(db, team.id)
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -399,7 +404,7 @@ async def remove_member_from_session(
     ).delete()
 
     db.delete(member)
-    db.commit()
+    commit_team_change(db, session.team_id)
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -419,7 +424,7 @@ async def reveal_synthesis(session_id: int, auth: AuthDep, db: DbDep):
 
     session.state = SessionState.REVEALED
     session.revealed_at = datetime.utcnow()
-    db.commit()
+    commit_session_change(db, session_id)
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -427,11 +432,11 @@ async def reveal_synthesis(session_id: int, auth: AuthDep, db: DbDep):
 @router.post("/{session_id}/synthesize")
 async def trigger_synthesis(
     session_id: int,
-    background_tasks: BackgroundTasks,
     auth: AuthDep,
     db: DbDep
 ):
     """Trigger synthesis generation for a closed session."""
+    begin_write(db)
     session = db.query(Session).filter(Session.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -455,10 +460,9 @@ async def trigger_synthesis(
 
     # Set marker to indicate synthesis is in progress (prevents double-click)
     session.synthesis_themes = "GENERATING..."
-    db.commit()
-
-    # Add background task to generate synthesis
-    background_tasks.add_task(run_synthesis_task, session_id)
+    enqueue_synthesis(db, session_id)
+    commit_session_change(db, session_id)
+    get_synthesis_worker().wake()
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
@@ -466,11 +470,17 @@ async def trigger_synthesis(
 @router.post("/{session_id}/synthesize/retry")
 async def retry_synthesis(
     session_id: int,
-    background_tasks: BackgroundTasks,
     auth: AuthDep,
-    db: DbDep
+    db: DbDep,
+    force: bool = Form(False)
 ):
-    """Force regeneration of synthesis, clearing existing data first."""
+    """
+    Regenerate synthesis, clearing existing data first.
+
+    A retry reuses a cached result for unchanged responses; force=true
+    (Regenerate Synthesis) always calls Claude again.
+    """
+    begin_write(db)
     session = db.query(Session).filter(Session.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -485,21 +495,25 @@ async def retry_synthesis(
     session.synthesis_themes = None
     session.synthesis_statements = None
     session.synthesis_gap_type = None
-    db.commit()
-
-    # Add background task to generate synthesis
-    background_tasks.add_task(run_synthesis_task, session_id)
+    session.synthesis_partial = None
+    enqueue_synthesis(db, session_id, force=force)
+    commit_session_change(db, session_id)
+    get_synthesis_worker().wake()
 
     return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
 
 
 @router.get("/{session_id}/synthesis-status")
-async def get_synthesis_status(session_id: int, auth: AuthDep, db: DbDep):
-    """Get synthesis progress status for polling."""
-    session = db.query(Session).filter(Session.id == session_id).first()
+async def get_synthesis_status(request: Request, session_id: int, auth: AuthDep, db: AsyncReadDbDep):
+    """Get synthesis progress status for polling (supports If-None-Match)."""
+    session = await db.get(Session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    etag = status_etag(session_id, session.status_version or 0)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     # Determine synthesis status
     if session.synthesis_themes is None:
         status = "pending"
@@ -518,49 +532,55 @@ async def get_synthesis_status(session_id: int, auth: AuthDep, db: DbDep):
         has_error = False
         error_message = None
 
-    return JSONResponse({
-        "status": status,
-        "has_error": has_error,
-        "error_message": error_message
-    })
+    return JSONResponse(
+        {
+            "status": status,
+            "has_error": has_error,
+            "error_message": error_message
+        },
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 @router.get("/{session_id}/status")
-async def get_session_status(session_id: int, auth: AuthDep, db: DbDep):
-    """Get session status for polling (JSON endpoint)."""
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+async def get_session_status(request: Request, session_id: int, auth: AuthDep, db: AsyncReadDbDep):
+    """Get session status for polling (JSON endpoint, supports If-None-Match).
+
+    Unchanged sessions are answered with a bodyless 304 after a single-row
+    version lookup; otherwise the payload is served from the status cache.
+    """
+    row = await db.run_sync(get_status_version, session_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Session not found")
+    version, _ = row
 
-    team = session.team
-    members = db.query(Member).filter(Member.team_id == team.id).all()
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-    responded_member_ids = {r.member_id for r in responses}
+    etag = status_etag(session_id, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    member_status = []
-    for member in members:
-        member_status.append({
-            "id": member.id,
-            "name": member.name,
-            "submitted": member.id in responded_member_ids
-        })
+    snapshot = await get_status_snapshot_async(db, session_id, version)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Session not found")
 
-    # Synthesis status for CLOSED state polling
-    has_synthesis = session.synthesis_themes is not None
-    synthesis_pending = (
-        session.state == SessionState.CLOSED and
-        session.synthesis_themes is None
+    return JSONResponse(
+        admin_status_payload(snapshot),
+        headers={"ETag": status_etag(session_id, snapshot.version), "Cache-Control": "no-cache"}
     )
 
-    return JSONResponse({
-        "session_id": session_id,
-        "state": session.state.value,
-        "total_members": len(members),
-        "submitted_count": len(responded_member_ids),
-        "members": member_status,
-        "has_synthesis": has_synthesis,
-        "synthesis_pending": synthesis_pending
-    })
+
+@router.get("/{session_id}/events")
+async def session_events(request: Request, session_id: int, auth: AuthDep, db: ReadDbDep):
+    """Live status stream (Server-Sent Events) - pushes a delta whenever the session changes."""
+    session = db.query(Session.id).filter(Session.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    db.close()  # Stream is long-lived; don't hold a pooled connection
+
+    return StreamingResponse(
+        stream_session_events(request, session_id, admin_status_delta),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/{session_id}/notes")
@@ -660,9 +680,10 @@ async def capture_session(request: Request, session_id: int, auth: AuthDep, db:
 @router.get("/{session_id}/present")
 async def present_session(request: Request, session_id: int, auth: AuthDep, db: DbDep):
     """Projector-friendly presentation view of synthesis."""
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
+    session = bundle.session
 
     if session.state != SessionState.REVEALED:
         return RedirectResponse(url=f"/admin/sessions/{session_id}", status_code=303)
@@ -675,20 +696,13 @@ async def present_session(request: Request, session_id: int, auth: AuthDep, db:
         except (json.JSONDecodeError, TypeError):
             synthesis_statements = []
 
-    # Query raw responses with image URLs
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-    raw_responses = []
-    for r in responses:
-        member = db.query(Member).filter(Member.id == r.member_id).first()
-        # Build image URL from image_id (filename stem)
-        # Try common extensions in order of preference
-        image_url = f"/static/images/library/{r.image_id}.jpg"
-        raw_responses.append({
-            "participant": member.name if member else "Unknown",
-            "image_id": r.image_id,
-            "image_url": image_url,
-            "bullets": json.loads(r.bullets) if r.bullets else []
-        })
+    # Raw responses with image URLs
+    raw_responses = [{
+        "participant": r.display_name,
+        "image_id": r.image_id,
+        "image_url": r.image_url,
+        "bullets": r.bullets
+    } for r in bundle.responses]
 
     # Check for synthesis failure (for retry UI)
     synthesis_failed = False
@@ -701,7 +715,7 @@ async def present_session(request: Request, session_id: int, auth: AuthDep, db:
         {
             "request": request,
             "session": session,
-            "team": session.team,
+            "team": bundle.team,
             "synthesis_themes": session.synthesis_themes,
             "synthesis_statements": synthesis_statements,
             "synthesis_gap_type": session.synthesis_gap_type,
@@ -715,61 +729,16 @@ async def present_session(request: Request, session_id: int, auth: AuthDep, db:
 @router.get("/{session_id}/export")
 async def export_session(session_id: int, auth: AuthDep, db: DbDep):
     """Export session data as JSON."""
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    team = session.team
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-
-    # Build response data
-    response_data = []
-    for r in responses:
-        member = db.query(Member).filter(Member.id == r.member_id).first()
-        response_data.append({
-            "participant": member.name if member else "Unknown",
-            "image_id": r.image_id,
-            "bullets": json.loads(r.bullets) if r.bullets else [],
-            "submitted_at": r.submitted_at.isoformat() if r.submitted_at else None
-        })
-
-    # Parse synthesis statements
-    synthesis_statements = None
-    if session.synthesis_statements:
-        try:
-            synthesis_statements = json.loads(session.synthesis_statements)
-        except (json.JSONDecodeError, TypeError):
-            synthesis_statements = []
-
-    export_data = {
-        "session": {
-            "id": session.id,
-            "month": session.month,
-            "state": session.state.value,
-            "created_at": session.created_at.isoformat() if session.created_at else None,
-            "closed_at": session.closed_at.isoformat() if session.closed_at else None,
-            "revealed_at": session.revealed_at.isoformat() if session.revealed_at else None
-        },
-        "team": {
-            "company_name": team.company_name,
-            "team_name": team.team_name,
-            "strategy_statement": team.strategy_statement
-        },
-        "responses": response_data,
-        "synthesis": {
-            "themes": session.synthesis_themes,
-            "statements": synthesis_statements,
-            "gap_type": session.synthesis_gap_type
-        },
-        "facilitator": {
-            "notes": session.facilitator_notes,
-            "recalibration_action": session.recalibration_action,
-            "recalibration_completed": session.recalibration_completed
-        }
-    }
+    session, team = bundle.session, bundle.team
 
-    return JSONResponse(
-        content=export_data,
+    # Streamed response by response, so large teams are never serialized in one piece
+    return StreamingResponse(
+        iter_session_json(bundle),
+        media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename=session-{session.month}-{team.team_name}.json"}
     )
 
@@ -823,30 +792,15 @@ async def export_level2(session_id: int, auth: AuthDep, db: DbDep):
 @router.get("/{session_id}/export/level3")
 async def export_level3(session_id: int, auth: AuthDep, db: DbDep):
     """Export Level 3 raw data (participant responses)."""
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    team = session.team
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
+    session, team = bundle.session, bundle.team
 
-    # Build response data
-    response_data = []
-    for r in responses:
-        member = db.query(Member).filter(Member.id == r.member_id).first()
-        response_data.append({
-            "participant": member.name if member else "Unknown",
-            "image_id": r.image_id,
-            "bullets": json.loads(r.bullets) if r.bullets else [],
-            "submitted_at": r.submitted_at.isoformat() if r.submitted_at else None
-        })
-
-    export_data = {
-        "responses": response_data
-    }
-
-    return JSONResponse(
-        content=export_data,
+    return StreamingResponse(
+        iter_responses_json(bundle),
+        media_type="application/json",
         headers={"Content-Disposition": f"attachment; filename=session-{session.month}-{team.team_name}-level3.json"}
     )
 
@@ -854,119 +808,21 @@ async def export_level3(session_id: int, auth: AuthDep, db: DbDep):
 @router.get("/{session_id}/export/markdown")
 async def export_markdown(session_id: int, auth: AuthDep, db: DbDep):
     """Export session data as Markdown for easy viewing/copying."""
-    from fastapi.responses import PlainTextResponse
-
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    team = session.team
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-
-    # Parse synthesis statements
-    synthesis_statements = []
-    if session.synthesis_statements:
-        try:
-            synthesis_statements = json.loads(session.synthesis_statements)
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-    # Build markdown content
-    lines = []
-    lines.append(f"# The 55 Session Report")
-    lines.append(f"")
-    lines.append(f"**Team:** {team.team_name}")
-    lines.append(f"**Company:** {team.company_name}")
-    lines.append(f"**Session:** {session.month}")
-    lines.append(f"")
-
-    if team.strategy_statement:
-        lines.append(f"## Strategy Statement")
-        lines.append(f"")
-        lines.append(f"{team.strategy_statement}")
-        lines.append(f"")
-
-    # Facilitator notes section (if any)
-    if session.facilitator_notes or session.recalibration_action:
-        lines.append(f"---")
-        lines.append(f"")
-        lines.append(f"## Facilitator Notes")
-        lines.append(f"")
-        if session.facilitator_notes:
-            lines.append(f"{session.facilitator_notes}")
-            lines.append(f"")
-        if session.recalibration_action:
-            status = "(Completed)" if session.recalibration_completed else "(Pending)"
-            lines.append(f"**Recalibration Action** {status}")
-            lines.append(f"")
-            lines.append(f"{session.recalibration_action}")
-            lines.append(f"")
-
-    # Synthesis section
-    if session.synthesis_themes:
-        lines.append(f"---")
-        lines.append(f"")
-        lines.append(f"## What We Heard")
-        lines.append(f"")
-        lines.append(f"{session.synthesis_themes}")
-        lines.append(f"")
-
-        if session.synthesis_gap_type:
-            lines.append(f"### Gap Analysis")
-            lines.append(f"")
-            lines.append(f"**Gap Type:** {session.synthesis_gap_type}")
-            if session.synthesis_gap_reasoning:
-                lines.append(f"")
-                lines.append(f"{session.synthesis_gap_reasoning}")
-            lines.append(f"")
-
-    # Key insights
-    if synthesis_statements:
-        lines.append(f"---")
-        lines.append(f"")
-        lines.append(f"## Key Insights")
-        lines.append(f"")
-        for stmt in synthesis_statements:
-            participants = ", ".join(stmt.get("participants", []))
-            lines.append(f"- {stmt.get('statement', '')} *({participants})*")
-        lines.append(f"")
-
-    # Participant responses
-    if responses:
-        lines.append(f"---")
-        lines.append(f"")
-        lines.append(f"## Participant Responses")
-        lines.append(f"")
-
-        for r in responses:
-            member = db.query(Member).filter(Member.id == r.member_id).first()
-            name = member.name if member else "Unknown"
-
-            bullets = []
-            if r.bullets:
-                try:
-                    bullets = json.loads(r.bullets)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            lines.append(f"### {name}")
-            lines.append(f"")
-            for i, bullet in enumerate(bullets, 1):
-                lines.append(f"{i}. {bullet}")
-            lines.append(f"")
-
-    markdown_content = "\n".join(lines)
+    session, team = bundle.session, bundle.team
+    content = iter_session_markdown(bundle)
 
     # Clean filename
     safe_team = team.team_name.replace(" ", "-").replace("/", "-")
     filename = f"session-{session.month}-{safe_team}.md"
 
-    return PlainTextResponse(
-        content=markdown_content,
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Type": "text/markdown; charset=utf-8"
-        }
+    return StreamingResponse(
+        content,
+        media_type="text/markdown; charset=utf-8",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
@@ -979,8 +835,11 @@ async def export_pdf(session_id: int, auth: AuthDep, db: DbDep):
 
     team = session.team
 
-    # Generate PDF bytes
-    pdf_bytes = generate_session_pdf(session, team)
+    # Cached per session until the report content changes; renders run off the event loop
+    cache = get_pdf_report_cache()
+    pdf_bytes = cache.get(session, team)
+    if pdf_bytes is None:
+        pdf_bytes = await get_export_pool().run(cache.render, session, team)
 
     # Clean filename: TeamName-YYYY-MM.pdf
     safe_team = team.team_name.replace(" ", "-").replace("/", "-")
@@ -993,6 +852,73 @@ async def export_pdf(session_id: int, auth: AuthDep, db: DbDep):
     )
 
 
+def _archive_response(
+    db,
+    team_id: Optional[int],
+    start: Optional[str],
+    end: Optional[str],
+    formats: Optional[str],
+    filename: str
+) -> StreamingResponse:
+    """Stream a ZIP export of the matching sessions (months start..end, inclusive)."""
+    for month in (start, end):
+        if month and not MONTH_PATTERN.match(month):
+            raise HTTPException(status_code=400, detail="Months must be in YYYY-MM format")
+    try:
+        archive_formats = parse_archive_formats(formats)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = db.query(Session).options(joinedload(Session.team))
+    if team_id is not None:
+        query = query.filter(Session.team_id == team_id)
+    if start:
+        query = query.filter(Session.month >= start)
+    if end:
+        query = query.filter(Session.month <= end)
+    sessions: List[Session] = query.order_by(Session.team_id, Session.month, Session.id).all()
+    if not sessions:
+        raise HTTPException(status_code=404, detail="No sessions to export")
+
+    return StreamingResponse(
+        iter_session_archive(sessions, archive_formats),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.get("/team/{team_id}/export/archive")
+async def export_team_archive(
+    team_id: int,
+    auth: AuthDep,
+    db: DbDep,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    formats: Optional[str] = None
+):
+    """Export every session of a team (optionally limited to months start..end) as a ZIP."""
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    safe_team = team.team_name.replace(" ", "-").replace("/", "-")
+    months = f"-{start or 'first'}-to-{end or 'latest'}" if start or end else ""
+    return _archive_response(db, team_id, start, end, formats, f"{safe_team}-sessions{months}.zip")
+
+
+@router.get("/export/archive")
+async def export_archive(
+    auth: AuthDep,
+    db: DbDep,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    formats: Optional[str] = None
+):
+    """Export the sessions of all teams (optionally limited to months start..end) as a ZIP."""
+    months = f"-{start or 'first'}-to-{end or 'latest'}" if start or end else ""
+    return _archive_response(db, None, start, end, formats, f"the55-sessions{months}.zip")
+
+
 @router.get("/{session_id}/meeting")
 async def meeting_session(request: Request, session_id: int, auth: AuthDep, db: DbDep):
     """Unified meeting screen - combines capture and presentation into single projectable view.
@@ -1002,16 +928,15 @@ async def meeting_session(request: Request, session_id: int, auth: AuthDep, db:
     - CLOSED: Shows "analyzing" waiting state
     - REVEALED: Shows synthesis with level navigation
     """
-    session = db.query(Session).filter(Session.id == session_id).first()
-    if not session:
+    bundle = load_session_responses(db, session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    team = session.team
+    session, team = bundle.session, bundle.team
     members = db.query(Member).filter(Member.team_id == team.id).order_by(Member.name).all()
 
     # Get response status for each member
-    responses = db.query(ResponseModel).filter(ResponseModel.session_id == session_id).all()
-    responded_member_ids = {r.member_id for r in responses}
+    responded_member_ids = {r.member_id for r in bundle.responses}
 
     member_status = []
     for member in members:
@@ -1030,13 +955,10 @@ async def meeting_session(request: Request, session_id: int, auth: AuthDep, db:
             synthesis_statements = []
 
     # Build raw responses with participant names for Level 3
-    raw_responses = []
-    for r in responses:
-        member = db.query(Member).filter(Member.id == r.member_id).first()
-        raw_responses.append({
-            "participant": member.name if member else "Unknown",
-            "bullets": json.loads(r.bullets) if r.bullets else []
-        })
+    raw_responses = [{
+        "participant": r.display_name,
+        "bullets": r.bullets
+    } for r in bundle.responses]
 
     # Check for synthesis failure
     synthesis_failed = False
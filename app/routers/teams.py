@@ -15,6 +15,8 @@ from sqlalchemy import func
 
 from app.dependencies import AuthDep, DbDep
 from app.db.models import Team
+from app.services.live import commit_team_change, notify_team_changed
+from app.services.qr_codes import get_qr_code_cache
 
 router = APIRouter(prefix="/admin/teams", tags=["teams"])
 templates = Jinja2Templates(directory="templates")
@@ -148,13 +150,18 @@ async def update_team(
         )
 
     # Update team
+    previous_code = team.code
     team.company_name = company_name.strip()
     team.team_name = team_name.strip()
     team.code = code
     team.strategy_statement = strategy_statement.strip() if strategy_statement else None
     team.image_prompt = image_prompt.strip() if image_prompt else None
     team.bullet_prompt = bullet_prompt.strip() if bullet_prompt else None
-    db.commit()
+    commit_team_change(db, team_id)
+
+    # The old join URL is gone - drop its cached QR codes
+    if previous_code != code:
+        get_qr_code_cache().invalidate_code(previous_code)
 
     return RedirectResponse(url="/admin/teams", status_code=303)
 
@@ -164,7 +171,10 @@ async def delete_team(team_id: int, auth: AuthDep, db: DbDep):
     """Delete a team."""
     team = db.query(Team).filter(Team.id == team_id).first()
     if team:
+        code = team.code
         db.delete(team)
         db.commit()
+        notify_team_changed(team_id)
+        get_qr_code_cache().invalidate_code(code)
 
     return RedirectResponse(url="/admin/teams", status_code=303)
@@ -0,0 +1,178 @@
+"""
+The 55 App - Demo Synthesis Gate
+
+Protects /demo/api/synthesize from anonymous traffic spikes. Each Gunicorn
+worker allows a bounded number of concurrent Claude calls plus a bounded
+wait queue; requests beyond that are shed immediately so the caller can
+serve the pre-baked synthesis. Results are kept in an in-process LRU keyed
+by the visitor's normalized bullets (the only per-visitor prompt input), and
+identical requests already in flight share one call.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import get_settings
+
+
+class DemoSynthesisOverloaded(Exception):
+    """All call slots and queue positions are taken - serve the fallback."""
+
+
+def normalize_bullets(bullets: List[str]) -> List[str]:
+    """Trim, collapse whitespace and casefold bullets; drop empty ones."""
+    normalized = (" ".join(b.split()).casefold() for b in bullets)
+    return [b for b in normalized if b]
+
+
+def demo_cache_key(bullets: List[str], image_id: str, team_names: List[str]) -> str:
+    """Cache key for a demo synthesis request."""
+    canonical = json.dumps(
+        [normalize_bullets(bullets), image_id, team_names],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DemoSynthesisGate:
+    """
+    Per-process concurrency limiter, request coalescer and LRU for demo synthesis.
+
+    Must be used from a single event loop (one per Gunicorn worker).
+    """
+
+    def __init__(self, concurrency: int = 4, max_waiting: int = 8, cache_size: int = 256):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()  # stats() is read from other threads
+        self._in_flight = 0
+        self._waiting = 0
+        self.peak_waiting = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.shed = 0
+        self.errors = 0
+
+    def _cache_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return result
+
+    def _cache_put(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    async def run(self, key: str, produce: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Return the cached result for key, or produce() it within the limits.
+
+        Raises DemoSynthesisOverloaded without waiting when the queue is full;
+        errors from produce() propagate to every caller sharing the call.
+        """
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        if self._in_flight >= self.concurrency and self._waiting >= self.max_waiting:
+            with self._lock:
+                self.shed += 1
+            raise DemoSynthesisOverloaded()
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            with self._lock:
+                self._waiting += 1
+                self.peak_waiting = max(self.peak_waiting, self._waiting)
+            try:
+                await self._slots.acquire()
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+
+            with self._lock:
+                self._in_flight += 1
+            try:
+                result = await produce()
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._slots.release()
+        except asyncio.CancelledError:
+            # Leader's client went away - callers sharing the call get the fallback
+            future.set_exception(DemoSynthesisOverloaded())
+            future.exception()
+            raise
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            future.set_exception(e)
+            future.exception()  # retrieved - no warning if nobody else was waiting
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        self._cache_put(key, result)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        """Queue depth, shed and cache counters for this worker."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "in_flight": self._in_flight,
+                "concurrency": self.concurrency,
+                "queue_depth": self._waiting,
+                "max_waiting": self.max_waiting,
+                "peak_queue_depth": self.peak_waiting,
+                "shed": self.shed,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "cache_entries": len(self._cache),
+                "cache_hits": self.hits,
+                "cache_misses": self.misses,
+                "cache_hit_rate": round(self.hits / lookups, 3) if lookups else None
+            }
+
+
+# Singleton instance (lazy initialization)
+_demo_synthesis_gate: Optional[DemoSynthesisGate] = None
+
+
+def get_demo_synthesis_gate() -> DemoSynthesisGate:
+    """Get or create the demo synthesis gate singleton."""
+    global _demo_synthesis_gate
+    if _demo_synthesis_gate is None:
+        settings = get_settings()
+        _demo_synthesis_gate = DemoSynthesisGate(
+            concurrency=settings.demo_synthesis_concurrency,
+            max_waiting=settings.demo_synthesis_max_waiting,
+            cache_size=settings.demo_synthesis_cache_size
+        )
+    return _demo_synthesis_gate
@@ -0,0 +1,471 @@
+"""
+The 55 App - Report Export Service
+
+Session exports for the facilitator: JSON, Markdown and PDF.
+
+PDF rendering is CPU-bound, so it runs on a small per-process thread pool
+rather than in the event loop; the pool size caps how many reports a worker
+lays out at once, and further exports wait their turn. Threads (not
+processes) keep the rendered reports in the worker's PDF cache and let the
+renderer read the loaded session directly.
+
+JSON and Markdown exports are written as a stream of chunks from the loaded
+responses, so a 1000-member session is never held as one dict or one string.
+
+Bulk exports stream a ZIP of many sessions: responses are loaded a batch of
+sessions per query, the batch's PDFs are rendered in parallel on the pool,
+and each entry is sent as soon as it is written, so memory is bounded by
+one batch rather than the whole archive.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.db.database import ReadSessionLocal
+from app.db.models import Session
+from app.services.pdf_export import get_pdf_report_cache
+from app.services.responses import ResponseView, SessionResponseBundle, load_sessions_responses
+
+
+# Streamed exports are sent in chunks of about this many bytes
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Entries written per session in a bulk export, in archive order
+ARCHIVE_FORMATS = ("pdf", "markdown", "json")
+
+
+class ExportPool:
+    """
+    Bounded thread pool for CPU-bound report rendering in this worker.
+
+    run() awaits the result without blocking the event loop.
+    """
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.errors = 0
+        self.render_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="report-export"
+                )
+            return self._executor
+
+    def _call(self, fn: Callable[..., Any], args: tuple, queued_at: float) -> Any:
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self.wait_seconds += started - queued_at
+        try:
+            result = fn(*args)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.render_seconds += time.monotonic() - started
+        with self._lock:
+            self.completed += 1
+        return result
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and return its result."""
+        executor = self._get_executor()
+        with self._lock:
+            self._queued += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._call, fn, args, time.monotonic())
+
+    def shutdown(self) -> None:
+        """Drop queued renders and let running ones finish in the background."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Queue depth and render timings for this worker."""
+        with self._lock:
+            finished = self.completed + self.errors
+            return {
+                "concurrency": self.concurrency,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self.peak_queued,
+                "completed": self.completed,
+                "errors": self.errors,
+                "avg_render_ms": round(self.render_seconds / finished * 1000, 1) if finished else None,
+                "avg_wait_ms": round(self.wait_seconds / finished * 1000, 1) if finished else None
+            }
+
+
+# Singleton instance (lazy initialization)
+_export_pool: Optional[ExportPool] = None
+
+
+def get_export_pool() -> ExportPool:
+    """Get or create the report export pool singleton."""
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = ExportPool(concurrency=get_settings().export_concurrency)
+    return _export_pool
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize like JSONResponse, so streamed exports match the old bytes."""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _chunked(parts: Iterable[str], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Join small text parts into chunks of roughly chunk_size bytes."""
+    buffer: List[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _response_item(r: ResponseView) -> dict:
+    return {
+        "participant": r.display_name,
+        "image_id": r.image_id,
+        "bullets": r.bullets,
+        "submitted_at": r.submitted_at.isoformat() if r.submitted_at else None
+    }
+
+
+def _parse_statements(raw: Optional[str], default: Optional[list]) -> Optional[list]:
+    if not raw:
+        return default
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+def _recalibration_completed(session) -> bool:
+    # Not a stored column - only set on the instance by the toggle route
+    return bool(getattr(session, "recalibration_completed", False))
+
+
+def _iter_json_object(before: dict, list_key: str, items: Iterable[dict], after: dict) -> Iterator[str]:
+    """
+    Stream a JSON object whose list_key holds a long list.
+
+    Keys in before are written first, then the list item by item, then the
+    keys in after.
+    """
+    yield "{"
+    for key, value in before.items():
+        yield f"{_json_dumps(key)}:{_json_dumps(value)},"
+    yield f"{_json_dumps(list_key)}:["
+    for i, item in enumerate(items):
+        yield ("," if i else "") + _json_dumps(item)
+    yield "]"
+    for key, value in after.items():
+        yield f",{_json_dumps(key)}:{_json_dumps(value)}"
+    yield "}"
+
+
+def iter_session_json(bundle: SessionResponseBundle) -> Iterator[bytes]:
+    """
+    Full session export as JSON chunks.
+
+    Everything but the responses is read from the session up front, so a
+    bad record fails the request before any bytes are sent.
+    """
+    session, team = bundle.session, bundle.team
+    before = {
+        "session": {
+            "id": session.id,
+            "month": session.month,
+            "state": session.state.value,
+            "created_at": session.created_at.isoformat() if session.created_at else None,
+            "closed_at": session.closed_at.isoformat() if session.closed_at else None,
+            "revealed_at": session.revealed_at.isoformat() if session.revealed_at else None
+        },
+        "team": {
+            "company_name": team.company_name,
+            "team_name": team.team_name,
+            "strategy_statement": team.strategy_statement
+        }
+    }
+    after = {
+        "synthesis": {
+            "themes": session.synthesis_themes,
+            "statements": _parse_statements(session.synthesis_statements, None),
+            "gap_type": session.synthesis_gap_type
+        },
+        "facilitator": {
+            "notes": session.facilitator_notes,
+            "recalibration_action": session.recalibration_action,
+            "recalibration_completed": _recalibration_completed(session)
+        }
+    }
+    items = (_response_item(r) for r in bundle.responses)
+    return _chunked(_iter_json_object(before, "responses", items, after))
+
+
+def iter_responses_json(bundle: SessionResponseBundle) -> Iterator[bytes]:
+    """Level 3 export (participant responses only) as JSON chunks."""
+    items = (_response_item(r) for r in bundle.responses)
+    return _chunked(_iter_json_object({}, "responses", items, {}))
+
+
+def _markdown_header(bundle: SessionResponseBundle) -> List[str]:
+    """Report lines before the participant responses."""
+    session, team = bundle.session, bundle.team
+    synthesis_statements = _parse_statements(session.synthesis_statements, [])
+
+    lines = []
+    lines.append(f"# The 55 Session Report")
+    lines.append(f"")
+    lines.append(f"**Team:** {team.team_name}")
+    lines.append(f"**Company:** {team.company_name}")
+    lines.append(f"**Session:** {session.month}")
+    lines.append(f"")
+
+    if team.strategy_statement:
+        lines.append(f"## Strategy Statement")
+        lines.append(f"")
+        lines.append(f"{team.strategy_statement}")
+        lines.append(f"")
+
+    # Facilitator notes section (if any)
+    if session.facilitator_notes or session.recalibration_action:
+        lines.append(f"---")
+        lines.append(f"")
+        lines.append(f"## Facilitator Notes")
+        lines.append(f"")
+        if session.facilitator_notes:
+            lines.append(f"{session.facilitator_notes}")
+            lines.append(f"")
+        if session.recalibration_action:
+            status = "(Completed)" if _recalibration_completed(session) else "(Pending)"
+            lines.append(f"**Recalibration Action** {status}")
+            lines.append(f"")
+            lines.append(f"{session.recalibration_action}")
+            lines.append(f"")
+
+    # Synthesis section
+    if session.synthesis_themes:
+        lines.append(f"---")
+        lines.append(f"")
+        lines.append(f"## What We Heard")
+        lines.append(f"")
+        lines.append(f"{session.synthesis_themes}")
+        lines.append(f"")
+
+        if session.synthesis_gap_type:
+            lines.append(f"### Gap Analysis")
+            lines.append(f"")
+            lines.append(f"**Gap Type:** {session.synthesis_gap_type}")
+            if session.synthesis_gap_reasoning:
+                lines.append(f"")
+                lines.append(f"{session.synthesis_gap_reasoning}")
+            lines.append(f"")
+
+    # Key insights
+    if synthesis_statements:
+        lines.append(f"---")
+        lines.append(f"")
+        lines.append(f"## Key Insights")
+        lines.append(f"")
+        for stmt in synthesis_statements:
+            participants = ", ".join(stmt.get("participants", []))
+            lines.append(f"- {stmt.get('statement', '')} *({participants})*")
+        lines.append(f"")
+
+    return lines
+
+
+def _markdown_response_lines(responses: List[ResponseView]) -> Iterator[str]:
+    """Participant responses section, one line at a time."""
+    if not responses:
+        return
+    yield f"---"
+    yield f""
+    yield f"## Participant Responses"
+    yield f""
+    for r in responses:
+        yield f"### {r.display_name}"
+        yield f""
+        for i, bullet in enumerate(r.bullets, 1):
+            yield f"{i}. {bullet}"
+        yield f""
+
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Newline-join lines like str.join, one part at a time."""
+    for i, line in enumerate(lines):
+        yield ("\n" if i else "") + line
+
+
+def iter_session_markdown(bundle: SessionResponseBundle) -> Iterator[bytes]:
+    """
+    Session report as Markdown chunks.
+
+    The header is built up front (it is small and may fail); the responses
+    are streamed.
+    """
+    header = _markdown_header(bundle)
+
+    def lines() -> Iterator[str]:
+        yield from header
+        yield from _markdown_response_lines(bundle.responses)
+
+    return _chunked(_join_lines(lines()))
+
+
+def parse_archive_formats(raw: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated formats list (default: all formats).
+
+    Raises ValueError for unknown formats.
+    """
+    if not raw:
+        return list(ARCHIVE_FORMATS)
+    requested = {f.strip().lower() for f in raw.split(",") if f.strip()}
+    unknown = requested - set(ARCHIVE_FORMATS)
+    if unknown or not requested:
+        raise ValueError(f"Formats must be a comma-separated list of: {', '.join(ARCHIVE_FORMATS)}")
+    return [f for f in ARCHIVE_FORMATS if f in requested]
+
+
+class _ZipStream:
+    """Write-only file for ZipFile; written bytes are collected until drained."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _load_archive_batch(sessions: List[Session]) -> List[SessionResponseBundle]:
+    db = ReadSessionLocal()
+    try:
+        return load_sessions_responses(db, sessions)
+    finally:
+        db.close()
+
+
+async def _archive_pdf(bundle: SessionResponseBundle) -> bytes:
+    cache = get_pdf_report_cache()
+    pdf_bytes = cache.get(bundle.session, bundle.team)
+    if pdf_bytes is None:
+        pdf_bytes = await get_export_pool().run(cache.render, bundle.session, bundle.team)
+    return pdf_bytes
+
+
+def _archive_folder(bundle: SessionResponseBundle, used: Set[str]) -> str:
+    """Folder for a session's entries: Team-Name/YYYY-MM (plus the ID if taken)."""
+    safe_team = bundle.team.team_name.replace(" ", "-").replace("/", "-")
+    folder = f"{safe_team}/{bundle.session.month}"
+    if folder in used:
+        folder = f"{folder}-{bundle.session.id}"
+    used.add(folder)
+    return folder
+
+
+def _write_session_entries(
+    archive: zipfile.ZipFile,
+    folder: str,
+    bundle: SessionResponseBundle,
+    formats: List[str],
+    pdf_bytes: Optional[bytes]
+) -> None:
+    session = bundle.session
+    modified = session.revealed_at or session.closed_at or session.created_at or datetime.utcnow()
+    date_time = modified.timetuple()[:6]
+
+    if pdf_bytes is not None:
+        # Already compressed - stored as is
+        archive.writestr(zipfile.ZipInfo(f"{folder}/report.pdf", date_time), pdf_bytes)
+
+    streamed = []
+    if "markdown" in formats:
+        streamed.append(("report.md", iter_session_markdown(bundle)))
+    if "json" in formats:
+        streamed.append(("session.json", iter_session_json(bundle)))
+    for filename, chunks in streamed:
+        info = zipfile.ZipInfo(f"{folder}/{filename}", date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with archive.open(info, "w") as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+
+
+async def iter_session_archive(sessions: List[Session], formats: List[str]) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP with the requested exports of every session.
+
+    sessions must have their teams loaded. A session whose PDF fails to
+    render is listed in export-errors.txt instead of failing the archive.
+    """
+    batch_size = max(1, get_settings().export_archive_batch_size)
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, "w")
+    used_folders: Set[str] = set()
+    errors: List[str] = []
+
+    for start in range(0, len(sessions), batch_size):
+        bundles = await run_in_threadpool(_load_archive_batch, sessions[start:start + batch_size])
+
+        if "pdf" in formats:
+            pdfs = await asyncio.gather(*(_archive_pdf(b) for b in bundles), return_exceptions=True)
+        else:
+            pdfs = [None] * len(bundles)
+
+        for bundle, pdf_bytes in zip(bundles, pdfs):
+            folder = _archive_folder(bundle, used_folders)
+            if isinstance(pdf_bytes, BaseException):
+                print(f"Bulk export: PDF for session {bundle.session.id} failed: {pdf_bytes}")
+                errors.append(f"{folder}/report.pdf: {pdf_bytes}")
+                pdf_bytes = None
+            await run_in_threadpool(_write_session_entries, archive, folder, bundle, formats, pdf_bytes)
+            data = stream.drain()
+            if data:
+                yield data
+
+    if errors:
+        archive.writestr("export-errors.txt", "\n".join(errors) + "\n")
+    archive.close()
+    yield stream.drain()
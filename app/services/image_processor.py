@@ -5,23 +5,56 @@ Reduces original library images for web/mobile display.
 - Resizes to max 800x800 while maintaining aspect ratio
 - Corrects EXIF orientation (rotates images right-way-up)
 - Compresses to web-friendly size (~100-200KB)
-- Skips images already processed
+- Adds small WebP (and optionally AVIF) variants of each image for
+  browsing grids (reducedlive/variants/)
+- Records a ~200-byte blurred placeholder (inline WebP data URI) per image
+  so grids paint before the thumbnails arrive
+- Skips images whose source content hash is unchanged since the last run
+- Processes new images in parallel in a process pool, in the background
+  after startup (or from the command line), and reports throughput
+- Writes the library manifest (id, filename, dimensions, size, content hash)
+  that ImageLibrary serves from. After startup it is written in the background
+  by one Gunicorn worker; until then the library serves the existing manifest
+  (or a directory scan)
 
 Source: /static/images/library/
 Output: /static/images/library/reducedlive/
+
+Usage (from the site root):
+    python -m app.services.image_processor [--workers N]
 """
 
+import argparse
+import base64
+import fcntl
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from PIL import Image, ExifTags
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ExifTags, features
+
+from app.config import get_settings
+from app.services.images import IMAGE_EXTENSIONS, MANIFEST_VERSION, opaque_image_id, read_manifest
 
 # Configuration
 MAX_SIZE = (800, 800)  # Max dimensions
 JPEG_QUALITY = 85  # Balance of quality vs file size
 SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-
-# Paths relative to app
-BASE_DIR = Path(__file__).resolve().parent.parent
+VARIANT_WIDTHS = (240, 480)  # Grid thumbnails (1x/2x); the full JPEG is loaded on selection
+VARIANT_QUALITY = {"webp": 80, "avif": 60}
+VARIANT_DIR_NAME = "variants"
+PLACEHOLDER_SIZE = 16  # Longest side (px) of the inline placeholder; the browser upscales it
+PLACEHOLDER_QUALITY = 40
+
+# Paths relative to the site root (parent of app/, where StaticFiles serves from)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 LIBRARY_DIR = BASE_DIR / "static" / "images" / "library"
 OUTPUT_DIR = LIBRARY_DIR / "reducedlive"
 
@@ -99,70 +132,467 @@ def get_output_path(source_path: Path) -> Path:
     return OUTPUT_DIR / source_path.with_suffix('.jpg').name
 
 
-def needs_processing(source_path: Path) -> bool:
-    """Check if image needs to be processed."""
+def file_sha256(path: Path) -> str:
+    """Content hash of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_entry(path: Path, previous: Optional[dict]) -> dict:
+    """Describe a source image; the hash is reused only if size and mtime are unchanged."""
+    stat = path.stat()
+    if (
+        previous
+        and previous.get("bytes") == stat.st_size
+        and previous.get("mtime_ns") == stat.st_mtime_ns
+    ):
+        return previous
+    return {
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_sha256(path),
+    }
+
+
+def needs_processing(source_path: Path, entry: dict, previous: Optional[dict]) -> bool:
+    """
+    Check if image needs to be processed.
+
+    Skipped when the output exists and the source content hash matches the one
+    recorded when it was processed (touching or re-copying a file is not a change).
+    Outputs from before hashes were recorded are kept if they are newer than the source.
+    """
     output_path = get_output_path(source_path)
 
     if not output_path.exists():
         return True
 
-    # Re-process if source is newer than output
+    if previous is not None:
+        return previous.get("sha256") != entry["sha256"]
+
     return source_path.stat().st_mtime > output_path.stat().st_mtime
 
 
-def process_library() -> dict:
+def read_source_state(state_path: Path) -> Dict[str, dict]:
+    """Source hashes recorded by the last run, keyed by source filename."""
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Image processor: ignoring unreadable state {state_path}: {e}")
+        return {}
+    return data.get("sources", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)  # Atomic - readers never see a partial file
+
+
+def _run_jobs(
+    func: Callable[..., bool],
+    jobs: List[Tuple[tuple, object]],
+    workers: Optional[int],
+    stop: Optional[threading.Event],
+    finish: Callable[[object, bool], None]
+) -> int:
     """
-    Process all images in the library directory.
+    Run func(*args) for each (args, context) job and call finish(context, ok).
 
-    Returns dict with counts: processed, skipped, errors
+    Uses a process pool of `workers` processes (default: CPU count; 1 runs
+    inline). Setting `stop` cancels jobs not yet started. Returns the number
+    of workers used.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for args, context in jobs:
+            if stop is not None and stop.is_set():
+                break
+            finish(context, func(*args))
+        return workers
+
+    # spawn: forking a threaded, event-loop-running server process is unsafe
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        futures = {pool.submit(func, *args): context for args, context in jobs}
+        for future in as_completed(futures):
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"Image processor: job failed: {e}")
+                ok = False
+            finish(futures[future], ok)
+            if stop is not None and stop.is_set():
+                pool.shutdown(wait=True, cancel_futures=True)
+                break
+    return workers
+
+
+def process_library(
+    workers: Optional[int] = None,
+    state_path: Optional[Path] = None,
+    stop: Optional[threading.Event] = None
+) -> dict:
+    """
+    Process all new or changed images in the library directory.
+
+    Images are resized in a process pool of `workers` processes (default: CPU
+    count; 1 processes inline). Source hashes are recorded in state_path so
+    unchanged files are skipped on the next run. Setting `stop` cancels images
+    not yet started.
+
+    Returns dict with counts (processed, skipped, errors) and throughput
+    (seconds, images_per_second, megabytes_in).
     """
     results = {'processed': 0, 'skipped': 0, 'errors': 0}
+    started = time.perf_counter()
+    previous_state = read_source_state(state_path) if state_path else {}
+    state: Dict[str, dict] = {}
 
     # Ensure output directory exists
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Find all image files in library (excluding reducedlive subdirectory)
-    for item in LIBRARY_DIR.iterdir():
-        # Skip directories (including reducedlive)
-        if item.is_dir():
+    jobs: List[Tuple[Path, dict]] = []
+    for item in sorted(LIBRARY_DIR.iterdir()):
+        # Skip directories (including reducedlive) and non-image files
+        if item.is_dir() or item.suffix.lower() not in SUPPORTED_EXTENSIONS:
             continue
 
-        # Skip non-image files
-        if item.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            continue
-
-        # Check if processing needed
-        if not needs_processing(item):
+        previous = previous_state.get(item.name)
+        entry = _source_entry(item, previous)
+        if needs_processing(item, entry, previous):
+            jobs.append((item, entry))
+        else:
+            state[item.name] = entry
             results['skipped'] += 1
-            continue
 
-        # Process the image
-        output_path = get_output_path(item)
-        if process_image(item, output_path):
+    bytes_in = 0
+
+    def finish(item: Path, entry: dict, ok: bool) -> None:
+        nonlocal bytes_in
+        if ok:
+            state[item.name] = entry
+            bytes_in += entry["bytes"]
             results['processed'] += 1
             print(f"Processed: {item.name}")
         else:
-            results['errors'] += 1
+            results['errors'] += 1  # not recorded - retried next run
+
+    workers = _run_jobs(
+        process_image,
+        [((item, get_output_path(item)), (item, entry)) for item, entry in jobs],
+        workers, stop, lambda context, ok: finish(*context, ok)
+    )
+
+    if state_path and (state != previous_state or not state_path.exists()):
+        _write_json_atomic(state_path, {"version": MANIFEST_VERSION, "sources": state})
+
+    seconds = time.perf_counter() - started
+    results['seconds'] = round(seconds, 2)
+    results['images_per_second'] = round(results['processed'] / seconds, 1) if seconds else None
+    results['megabytes_in'] = round(bytes_in / 1e6, 1)
+    results['workers'] = workers
+    return results
+
+
+def variant_formats(avif: bool = False) -> List[str]:
+    """Variant formats to generate: WebP, plus AVIF if requested and supported by Pillow."""
+    formats = ["webp"]
+    if avif:
+        try:
+            if features.check("avif"):
+                formats.append("avif")
+        except ValueError:  # Pillow without the avif feature at all
+            pass
+    return formats
+
+
+def get_variant_path(image_path: Path, width: int, fmt: str) -> Path:
+    """Path of one variant of a library image (reducedlive/variants/<stem>-<width>.<fmt>)."""
+    return image_path.parent / VARIANT_DIR_NAME / f"{image_path.stem}-{width}.{fmt}"
+
+
+def needs_variants(image_path: Path, formats: List[str]) -> bool:
+    """Check if any variant is missing or older than the image."""
+    mtime = image_path.stat().st_mtime_ns
+    for width in VARIANT_WIDTHS:
+        for fmt in formats:
+            path = get_variant_path(image_path, width, fmt)
+            if not path.exists() or path.stat().st_mtime_ns < mtime:
+                return True
+    return False
+
+
+def make_variants(image_path: Path, formats: List[str]) -> bool:
+    """
+    Write the downscaled variants of a library image.
 
+    Returns True if written, False on error.
+    """
+    try:
+        with Image.open(image_path) as img:
+            img.load()
+            for width in VARIANT_WIDTHS:
+                variant = img.copy()
+                variant.thumbnail((width, width), Image.LANCZOS)
+                for fmt in formats:
+                    path = get_variant_path(image_path, width, fmt)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                    variant.save(tmp_path, fmt.upper(), quality=VARIANT_QUALITY[fmt])
+                    os.replace(tmp_path, path)
+        return True
+
+    except Exception as e:
+        print(f"Error making variants of {image_path.name}: {e}")
+        return False
+
+
+def process_variants(
+    image_dir: Path,
+    formats: List[str],
+    workers: Optional[int] = None,
+    stop: Optional[threading.Event] = None
+) -> dict:
+    """
+    Make missing or outdated variants for every image in image_dir.
+
+    Returns dict with counts: processed, skipped, errors
+    """
+    results = {'processed': 0, 'skipped': 0, 'errors': 0}
+    jobs = []
+    if image_dir.exists():
+        for path in sorted(image_dir.iterdir()):
+            if path.suffix.lower() not in IMAGE_EXTENSIONS or not path.is_file():
+                continue
+            if needs_variants(path, formats):
+                jobs.append(((path, formats), path))
+            else:
+                results['skipped'] += 1
+
+    def finish(path: Path, ok: bool) -> None:
+        results['processed' if ok else 'errors'] += 1
+
+    _run_jobs(make_variants, jobs, workers, stop, finish)
     return results
 
 
+def _variant_entries(path: Path, previous: Optional[dict]) -> List[dict]:
+    """Describe the up-to-date variants of one image, reusing unchanged previous entries."""
+    known = {v["filename"]: v for v in (previous or {}).get("variants", [])}
+    image_mtime = path.stat().st_mtime_ns
+    entries = []
+    for width in VARIANT_WIDTHS:
+        for fmt in ("webp", "avif"):
+            variant_path = get_variant_path(path, width, fmt)
+            try:
+                stat = variant_path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime_ns < image_mtime:
+                continue  # outdated - not advertised until regenerated
+            filename = f"{VARIANT_DIR_NAME}/{variant_path.name}"
+            entry = known.get(filename)
+            if not entry or entry.get("bytes") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+                try:
+                    with Image.open(variant_path) as img:
+                        size = img.size  # header only
+                except Exception as e:
+                    print(f"Manifest: skipping {filename}: {e}")
+                    continue
+                entry = {
+                    "filename": filename,
+                    "format": fmt,
+                    "width": size[0],
+                    "height": size[1],
+                    "bytes": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            entries.append(entry)
+    return entries
+
+
+def make_placeholder(img: Image.Image) -> str:
+    """Tiny WebP data URI of an image, shown (upscaled, so blurred) while it loads."""
+    img.draft("RGB", (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))  # JPEG: decode at reduced scale
+    small = img.convert("RGB")
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BILINEAR)
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _manifest_entry(path: Path, previous: Optional[dict]) -> Optional[dict]:
+    """Describe one output image, reusing the previous entry if the file is unchanged."""
+    stat = path.stat()
+    variants = _variant_entries(path, previous)
+    if (
+        previous
+        and previous.get("bytes") == stat.st_size
+        and previous.get("mtime_ns") == stat.st_mtime_ns
+        and "placeholder" in previous
+    ):
+        return {**previous, "variants": variants}
+
+    try:
+        with Image.open(path) as img:
+            width, height = img.size  # before draft() changes it
+            placeholder = make_placeholder(img)
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    except Exception as e:
+        print(f"Manifest: skipping {path.name}: {e}")
+        return None
+
+    return {
+        "id": opaque_image_id(path.stem),
+        "filename": path.name,
+        "width": width,
+        "height": height,
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "placeholder": placeholder,
+        "variants": variants,
+    }
+
+
+def write_manifest(image_dir: Path, manifest_path: Path, stop: Optional[threading.Event] = None) -> int:
+    """
+    Write the manifest for image_dir; only new or changed files are re-read.
+
+    The file is replaced atomically and left untouched when nothing changed,
+    so workers reload it only on real changes. Returns the number of images
+    (0 without writing if stop is set part-way).
+    """
+    previous: Dict[str, dict] = {
+        entry["filename"]: entry for entry in (read_manifest(manifest_path) or [])
+    }
+
+    entries: List[dict] = []
+    if image_dir.exists():
+        for path in sorted(image_dir.iterdir()):
+            if path.suffix.lower() not in IMAGE_EXTENSIONS or not path.is_file():
+                continue
+            if stop is not None and stop.is_set():
+                return 0
+            entry = _manifest_entry(path, previous.get(path.name))
+            if entry:
+                entries.append(entry)
+
+    if manifest_path.exists() and entries == list(previous.values()):
+        return len(entries)
+
+    _write_json_atomic(manifest_path, {"version": MANIFEST_VERSION, "images": entries})
+    print(f"Image processor: manifest written ({len(entries)} images)")
+    return len(entries)
+
+
+def run_processing(
+    workers: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    process_images: bool = True
+) -> Optional[dict]:
+    """
+    Update the manifest, process new library images, make their variants and
+    rewrite the manifest. With process_images off, only the manifest is updated.
+
+    Holds an exclusive lock file, so only one Gunicorn worker (or CLI run) does
+    the work; returns None if another process already holds it. Web workers
+    pick up the new manifest through ImageLibrary's background refresh.
+    """
+    settings = get_settings()
+    state_path = Path(settings.image_processing_state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    image_dir = Path(settings.image_library_path)
+    manifest_path = Path(settings.image_manifest_path)
+
+    with open(state_path.with_suffix(".lock"), "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("Image processor: already running in another process")
+            return None
+
+        # Images processed earlier are listed first (unchanged files are not re-read)
+        manifest_images = write_manifest(image_dir, manifest_path, stop=stop)
+        if not process_images:
+            return {"manifest_images": manifest_images}
+
+        print("Image processor: Checking library images...")
+        results = process_library(workers=workers, state_path=state_path, stop=stop)
+
+        total = results['processed'] + results['skipped'] + results['errors']
+        print(f"Image processor: {total} images checked in {results['seconds']}s")
+        print(f"  - Processed: {results['processed']}"
+              f" ({results['images_per_second']} images/s, {results['megabytes_in']} MB in,"
+              f" {results['workers']} workers)")
+        print(f"  - Skipped (unchanged): {results['skipped']}")
+        if results['errors']:
+            print(f"  - Errors: {results['errors']}")
+
+        formats = variant_formats(avif=settings.image_avif_variants)
+        started = time.perf_counter()
+        variants = process_variants(image_dir, formats, workers=workers, stop=stop)
+        print(f"Image processor: variants ({'/'.join(formats)}) made for {variants['processed']} images"
+              f" in {time.perf_counter() - started:.2f}s, {variants['skipped']} up to date"
+              + (f", {variants['errors']} errors" if variants['errors'] else ""))
+        results['variants'] = variants
+
+        results['manifest_images'] = write_manifest(image_dir, manifest_path, stop=stop)
+        return results
+
+
+_processing_thread: Optional[threading.Thread] = None
+_processing_stop = threading.Event()
+
+
+def _run_in_background(workers: Optional[int], process_images: bool) -> None:
+    try:
+        run_processing(workers=workers, stop=_processing_stop, process_images=process_images)
+    except Exception as e:
+        print(f"Image processor: background run failed: {e}")
+
+
 def run_on_startup():
     """
     Entry point for app startup.
-    Processes library images if needed.
+
+    Starts a background thread that brings the manifest up to date and
+    (with image_processing_on_startup) processes new images. Startup and
+    requests never wait for it: the library serves the existing manifest
+    until the new one is written. A manifest version bump re-reads every
+    image, so only the worker holding the processing lock does it.
     """
-    print("Image processor: Checking library images...")
-    results = process_library()
+    global _processing_thread
+    settings = get_settings()
+    _processing_stop.clear()
+    _processing_thread = threading.Thread(
+        target=_run_in_background,
+        args=(settings.image_processing_workers or None, settings.image_processing_on_startup),
+        name="image-processor",
+        daemon=True
+    )
+    _processing_thread.start()
+
 
-    total = results['processed'] + results['skipped'] + results['errors']
-    print(f"Image processor: {total} images checked")
-    print(f"  - Processed: {results['processed']}")
-    print(f"  - Skipped (already done): {results['skipped']}")
-    if results['errors']:
-        print(f"  - Errors: {results['errors']}")
+def stop_background_processing(timeout: float = 10.0) -> None:
+    """Cancel images not yet started and wait briefly for running ones (app shutdown)."""
+    _processing_stop.set()
+    if _processing_thread is not None:
+        _processing_thread.join(timeout)
 
 
 if __name__ == "__main__":
-    # Can be run directly for testing
-    run_on_startup()
+    parser = argparse.ArgumentParser(description="Process new library images and rewrite the manifest.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    run_processing(workers=args.workers or get_settings().image_processing_workers or None)
@@ -1,108 +1,330 @@
 """
 The 55 App - Image Library Service
 
-Auto-discovery of images from filesystem with caching and session-seeded randomization.
+Serves the image library from a persisted manifest (written by the image
+processor at startup) with session-seeded randomization. The manifest is
+loaded once and reloaded only when its mtime changes, so lookups never scan
+the directory. Without a manifest the library falls back to a TTL-cached
+directory scan. Shuffled orders are memoized per seed, so a page turn is a
+slice rather than a full shuffle.
+
+Each image has the full-size JPEG (shown once selected) plus small WebP, and
+optionally AVIF, variants listed as srcsets so browsing grids download
+thumbnails only, painting an inline blurred placeholder until they arrive.
+
+Reloads build a complete new index off to the side and swap it in with one
+assignment, on a background thread (stale-while-revalidate): readers keep
+using the current index and never wait for, or see part of, a refresh.
 Images are served via opaque IDs - filenames are never exposed to users.
 """
 
 import hashlib
+import json
+import os
 import random
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
 from pathlib import Path
-from typing import List, Optional, Dict
-from functools import lru_cache
+from typing import List, Optional, Dict, Sequence, Tuple
 
 from pydantic import BaseModel
 
 from app.config import get_settings
 
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+MANIFEST_VERSION = 1
+
 
 class ImageInfo(BaseModel):
-    """Image metadata - ID and URL only, no filename exposed to users."""
-    id: str           # opaque identifier (hash of filename)
-    url: str          # URL path for serving
+    """Image metadata - ID and URLs only, no filename exposed to users."""
+    id: str                            # opaque identifier (hash of filename)
+    url: str                           # full-size JPEG (selection, fallback)
+    thumb_url: Optional[str] = None    # smallest WebP variant
+    srcset: Optional[str] = None       # WebP variants, e.g. "... 240w, ... 480w"
+    avif_srcset: Optional[str] = None  # AVIF variants, when generated
+    placeholder: Optional[str] = None  # ~200-byte data URI shown while loading
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """A downscaled copy of a library image, in a modern format."""
+    filename: str  # relative to the library directory, e.g. variants/x-240.webp
+    format: str    # "webp" or "avif"
+    width: int
+    height: int
+    bytes: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ImageRecord:
+    """Manifest entry for one served image (server-side only)."""
+    id: str
+    filename: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bytes: Optional[int] = None
+    sha256: Optional[str] = None  # content hash
+    placeholder: Optional[str] = None  # inline data URI (blurred preview)
+    variants: Tuple[ImageVariant, ...] = ()
+
+
+def opaque_image_id(stem: str) -> str:
+    """Generate short opaque ID from a filename stem (first 12 chars of MD5)."""
+    return hashlib.md5(stem.encode()).hexdigest()[:12]
+
+
+def image_url(filename: str) -> str:
+    """URL path for a library image."""
+    return f"/static/images/library/reducedlive/{filename}"
+
+
+def _srcset(variants: Sequence[ImageVariant], fmt: str) -> Optional[str]:
+    matching = sorted((v for v in variants if v.format == fmt), key=lambda v: v.width)
+    if not matching:
+        return None
+    return ", ".join(f"{image_url(v.filename)} {v.width}w" for v in matching)
+
+
+def image_info(record: ImageRecord) -> ImageInfo:
+    """Public view of a record: opaque ID, full URL and variant srcsets."""
+    webp = sorted((v for v in record.variants if v.format == "webp"), key=lambda v: v.width)
+    return ImageInfo(
+        id=record.id,
+        url=image_url(record.filename),
+        thumb_url=image_url(webp[0].filename) if webp else None,
+        srcset=_srcset(record.variants, "webp"),
+        avif_srcset=_srcset(record.variants, "avif"),
+        placeholder=record.placeholder
+    )
+
+
+def read_manifest(manifest_path: Path) -> Optional[List[dict]]:
+    """Return the manifest's image entries, or None if missing or unreadable."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Image library: ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data.get("images", [])
+
+
+@dataclass(frozen=True)
+class _LibraryIndex:
+    """Everything a lookup needs, swapped in as one object on reload."""
+    images: List[ImageInfo]
+    records: Dict[str, ImageRecord]
+    manifest_mtime: Optional[int] = None  # None when built by a directory scan
+    built_at: float = field(default_factory=time.monotonic)
+    # Shuffled orders by seed (LRU) - dropped with the index when the manifest changes
+    shuffles: "OrderedDict[int, Tuple[ImageInfo, ...]]" = field(default_factory=OrderedDict)
 
 
 class ImageLibrary:
     """
-    Discover and serve images from configurable directory.
+    Serve images from the library manifest.
 
     Features:
-    - Auto-discovery of .jpg files from reducedlive/ directory
+    - Manifest of reducedlive/ (opaque ID, filename, dimensions, size, content hash, variants)
+    - Reloaded only when the manifest file changes (one stat per lookup)
+    - Stale-while-revalidate: one background refresh at a time, atomic swap
     - Opaque IDs (hashed) - filenames never exposed to users
-    - Caching with configurable TTL (default 5 minutes)
-    - Session-seeded randomization for consistent ordering
+    - Directory scan with TTL cache when no manifest exists
+    - Session-seeded randomization, memoized per seed in a bounded LRU
     """
 
-    def __init__(self, image_dir: Path, cache_ttl_seconds: int = 300):
+    def __init__(
+        self,
+        image_dir: Path,
+        cache_ttl_seconds: int = 300,
+        manifest_path: Optional[Path] = None,
+        shuffle_cache_size: int = 128
+    ):
         self._image_dir = image_dir
         self._cache_ttl = cache_ttl_seconds
-        self._cache: List[ImageInfo] = []
-        self._id_to_filename: Dict[str, str] = {}  # Maps opaque ID to filename
-        self._cache_time: Optional[datetime] = None
+        self._manifest_path = manifest_path
+        self._shuffle_cache_size = shuffle_cache_size
+        self._shuffle_lock = threading.Lock()  # lookups also run in the threadpool
+        self._refresh_lock = threading.Lock()  # held while an index is being built
+        self.shuffle_hits = 0
+        self.shuffle_misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._index: Optional[_LibraryIndex] = None
+
+    def _manifest_mtime_ns(self) -> Optional[int]:
+        if self._manifest_path is None:
+            return None
+        try:
+            return os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _is_stale(self, index: _LibraryIndex) -> bool:
+        """True if the manifest changed (or appeared/vanished) or the scan TTL expired."""
+        mtime = self._manifest_mtime_ns()
+        if index.manifest_mtime is not None or mtime is not None:
+            return mtime != index.manifest_mtime
+        return time.monotonic() - index.built_at >= self._cache_ttl
+
+    def _index_from_records(self, records: List[ImageRecord], manifest_mtime: Optional[int]) -> _LibraryIndex:
+        return _LibraryIndex(
+            images=[image_info(r) for r in records],
+            records={r.id: r for r in records},
+            manifest_mtime=manifest_mtime
+        )
 
-    def _generate_opaque_id(self, filename: str) -> str:
-        """Generate short opaque ID from filename (first 12 chars of MD5)."""
-        return hashlib.md5(filename.encode()).hexdigest()[:12]
+    def _load_manifest(self) -> Optional[_LibraryIndex]:
+        mtime = self._manifest_mtime_ns()  # before reading - a later rewrite shows as stale
+        if mtime is None:
+            return None
+        entries = read_manifest(self._manifest_path)
+        if entries is None:
+            return None
+        fields = ImageRecord.__dataclass_fields__
+        variant_fields = ImageVariant.__dataclass_fields__
+        records = []
+        for entry in entries:
+            values = {k: v for k, v in entry.items() if k in fields}
+            values["variants"] = tuple(
+                ImageVariant(**{k: v for k, v in variant.items() if k in variant_fields})
+                for variant in entry.get("variants", ())
+            )
+            records.append(ImageRecord(**values))
+        return self._index_from_records(records, mtime)
+
+    def _scan_directory(self) -> _LibraryIndex:
+        """Fallback: list image files directly (no dimensions or hashes)."""
+        records = []
+        if self._image_dir.exists():
+            for path in sorted(self._image_dir.iterdir()):
+                if path.suffix.lower() in IMAGE_EXTENSIONS:
+                    records.append(ImageRecord(id=opaque_image_id(path.stem), filename=path.name))
+        return self._index_from_records(records, None)
 
-    def _is_cache_valid(self) -> bool:
-        """Check if cache is still valid."""
-        if not self._cache_time:
-            return False
-        return datetime.now() - self._cache_time < timedelta(seconds=self._cache_ttl)
+    def _build_index(self) -> _LibraryIndex:
+        """Build a complete index without touching the one readers are using."""
+        return self._load_manifest() or self._scan_directory()
 
-    def discover_images(self) -> List[ImageInfo]:
+    def refresh(self) -> int:
         """
-        Scan directory for image files, cache results.
+        Rebuild the index now and swap it in (e.g. after writing the manifest).
 
-        Returns sorted list of ImageInfo objects with opaque IDs.
+        Waits for a background refresh already in progress. Returns the image count.
         """
-        if self._is_cache_valid():
-            return self._cache
+        with self._refresh_lock:
+            self._index = self._build_index()
+            self.refreshes += 1
+            return len(self._index.images)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            current = self._index
+            if current is not None and not self._is_stale(current):
+                return  # a reader saw the previous index; already refreshed
+            self._index = self._build_index()
+            self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"Image library: refresh failed, keeping current index: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _schedule_refresh(self) -> None:
+        """Start a background refresh unless one is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            threading.Thread(
+                target=self._refresh_in_background,
+                name="image-library-refresh",
+                daemon=True
+            ).start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+
+    def _current_index(self) -> _LibraryIndex:
+        """
+        Return the current index, scheduling a background refresh if it is stale.
 
-        images = []
-        self._id_to_filename = {}
-        extensions = {'.jpg', '.jpeg', '.png', '.webp'}
+        Only the very first lookup (before startup warmed the library) builds inline.
+        """
+        index = self._index
+        if index is None:
+            with self._refresh_lock:
+                if self._index is None:
+                    self._index = self._build_index()
+                    self.refreshes += 1
+                return self._index
+        if self._is_stale(index):
+            self._schedule_refresh()
+        return index
 
-        if self._image_dir.exists():
-            for path in sorted(self._image_dir.iterdir()):
-                if path.suffix.lower() in extensions:
-                    opaque_id = self._generate_opaque_id(path.stem)
-                    self._id_to_filename[opaque_id] = path.name
-                    images.append(ImageInfo(
-                        id=opaque_id,
-                        url=f"/static/images/library/reducedlive/{path.name}"
-                    ))
-
-        self._cache = images
-        self._cache_time = datetime.now()
-        return images
+    def discover_images(self) -> List[ImageInfo]:
+        """
+        Return all images (sorted by filename) with opaque IDs.
+
+        Served from the manifest; the list is shared - copy before mutating.
+        """
+        return self._current_index().images
+
+    def get_record(self, opaque_id: str) -> Optional[ImageRecord]:
+        """Look up an image's manifest entry (filename, dimensions, hash) by opaque ID."""
+        return self._current_index().records.get(opaque_id)
 
     def get_filename_by_id(self, opaque_id: str) -> Optional[str]:
         """Look up actual filename from opaque ID."""
-        self.discover_images()  # Ensure cache is populated
-        return self._id_to_filename.get(opaque_id)
+        record = self.get_record(opaque_id)
+        return record.filename if record else None
+
+    def _shuffled_order(self, seed: int) -> Tuple[ImageInfo, ...]:
+        """Deterministic order for a seed, shuffled once and then served from the LRU."""
+        index = self._current_index()
+        with self._shuffle_lock:
+            order = index.shuffles.get(seed)
+            if order is not None:
+                index.shuffles.move_to_end(seed)
+                self.shuffle_hits += 1
+                return order
+            self.shuffle_misses += 1
+
+        images = list(index.images)
+        rng = random.Random(seed)
+        rng.shuffle(images)
+        order = tuple(images)
 
-    def get_shuffled_images(self, seed: int, limit: int = None) -> List[ImageInfo]:
+        with self._shuffle_lock:
+            index.shuffles[seed] = order
+            while len(index.shuffles) > self._shuffle_cache_size:
+                index.shuffles.popitem(last=False)
+        return order
+
+    def get_shuffled_images(self, seed: int, limit: int = None) -> Sequence[ImageInfo]:
         """
         Return images in deterministic random order for given seed.
 
         Uses Fisher-Yates shuffle with seeded random for reproducibility.
-        Same seed always produces same order.
+        Same seed always produces same order. The order is computed once per
+        seed (until the manifest changes); the result is read-only.
 
         Args:
             seed: Integer seed (typically session_id)
             limit: Maximum number of images to return (None for all)
 
         Returns:
-            List of ImageInfo in shuffled order, truncated to limit if specified
+            Sequence of ImageInfo in shuffled order, truncated to limit if specified
         """
-        images = self.discover_images().copy()
-        rng = random.Random(seed)
-        rng.shuffle(images)
+        order = self._shuffled_order(seed)
         if limit is not None:
-            images = images[:limit]
-        return images
+            return order[:limit]
+        return order
 
     def get_paginated_images(
         self,
@@ -114,6 +336,8 @@ class ImageLibrary:
         """
         Return paginated images with metadata.
 
+        Slices the memoized order for the seed - no reshuffle or full copy per page.
+
         Args:
             seed: Integer seed for randomization
             page: Page number (1-indexed)
@@ -123,24 +347,42 @@ class ImageLibrary:
         Returns:
             Dict with images, total, page, per_page, total_pages
         """
-        all_images = self.get_shuffled_images(seed, limit=limit)
-        total = len(all_images)
+        order = self._shuffled_order(seed)
+        total = len(order) if limit is None else min(limit, len(order))
         total_pages = (total + per_page - 1) // per_page  # ceiling division
 
         # Clamp page to valid range
         page = max(1, min(page, total_pages)) if total_pages > 0 else 1
 
         start = (page - 1) * per_page
-        end = start + per_page
+        end = min(start + per_page, total)
 
         return {
-            "images": all_images[start:end],
+            "images": list(order[start:end]),
             "total": total,
             "page": page,
             "per_page": per_page,
             "total_pages": total_pages
         }
 
+    def stats(self) -> dict:
+        """Library size and shuffle cache counters for this worker."""
+        index = self._index or _LibraryIndex(images=[], records={})
+        with self._shuffle_lock:
+            lookups = self.shuffle_hits + self.shuffle_misses
+            return {
+                "images": len(index.images),
+                "from_manifest": index.manifest_mtime is not None,
+                "index_age_seconds": round(time.monotonic() - index.built_at, 1),
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "refresh_in_progress": self._refresh_lock.locked(),
+                "shuffle_cache_entries": len(index.shuffles),
+                "shuffle_hits": self.shuffle_hits,
+                "shuffle_misses": self.shuffle_misses,
+                "shuffle_hit_rate": round(self.shuffle_hits / lookups, 3) if lookups else None
+            }
+
     @property
     def count(self) -> int:
         """Get total number of images."""
@@ -155,7 +397,7 @@ def get_image_library() -> ImageLibrary:
     """
     Get or create the image library singleton.
 
-    Uses settings from config for path and TTL.
+    Uses settings from config for paths and the fallback scan TTL.
     """
     global _image_library
     if _image_library is None:
@@ -163,6 +405,8 @@ def get_image_library() -> ImageLibrary:
         image_dir = Path(settings.image_library_path)
         _image_library = ImageLibrary(
             image_dir=image_dir,
-            cache_ttl_seconds=settings.image_cache_ttl
+            cache_ttl_seconds=settings.image_cache_ttl,
+            manifest_path=Path(settings.image_manifest_path),
+            shuffle_cache_size=settings.image_shuffle_cache_size
         )
     return _image_library
@@ -0,0 +1,269 @@
+"""
+The 55 App - Live Session Events
+
+Server-Sent Events fan-out for session status. Replaces per-client polling:
+each worker keeps one channel per watched session, reloads the status snapshot
+only when a write path publishes a change, and pushes the result to every
+connected facilitator screen, projector and participant waiting screen.
+
+Writes made by another Gunicorn worker are picked up by a slow per-channel
+reconcile that compares sessions.status_version (one single-row query per
+session per worker, not per client).
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as DbSession
+from starlette.concurrency import run_in_threadpool
+
+from app.db.database import ReadSessionLocal
+from app.services.session_status import (
+    SessionStatusSnapshot,
+    bump_status_version,
+    get_status_cache,
+    get_status_version,
+    load_status_snapshot,
+)
+
+# How often a channel re-reads the database to catch writes from other workers
+RECONCILE_INTERVAL = 5.0
+# Comment line sent on idle streams so proxies don't drop the connection
+KEEPALIVE_INTERVAL = 15.0
+
+# Queue item pushed to subscribers on shutdown
+_CLOSE = object()
+
+
+def _load_snapshot(session_id: int) -> Optional[SessionStatusSnapshot]:
+    """Load a fresh snapshot with a short-lived database session (runs in threadpool)."""
+    db = ReadSessionLocal()
+    try:
+        snapshot = load_status_snapshot(db, session_id)
+    finally:
+        db.close()
+    if snapshot is not None:
+        # Channel reloads double as cache refreshes for the polling endpoints
+        get_status_cache().put(snapshot)
+    return snapshot
+
+
+def _load_version(session_id: int) -> Optional[int]:
+    """Read only the session's status_version (runs in threadpool)."""
+    db = ReadSessionLocal()
+    try:
+        row = get_status_version(db, session_id)
+    finally:
+        db.close()
+    return row[0] if row else None
+
+
+class _SessionChannel:
+    """Subscribers and latest snapshot for one session within this worker."""
+
+    def __init__(self, session_id: int):
+        self.session_id = session_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.snapshot: Optional[SessionStatusSnapshot] = None
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SessionEventHub:
+    """
+    Per-process publish/subscribe hub for session status changes.
+
+    publish() is safe to call from any thread (request handlers, threadpool
+    routes and the synthesis background task's own event loop).
+    """
+
+    def __init__(self, reconcile_interval: float = RECONCILE_INTERVAL):
+        self._reconcile_interval = reconcile_interval
+        self._channels: Dict[int, _SessionChannel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def subscribe(self, session_id: int) -> asyncio.Queue:
+        """Register a subscriber; the queue receives (previous, current) snapshot pairs."""
+        self._loop = asyncio.get_running_loop()
+        channel = self._channels.get(session_id)
+        if channel is None:
+            channel = _SessionChannel(session_id)
+            self._channels[session_id] = channel
+        if channel.snapshot is None:
+            channel.snapshot = await run_in_threadpool(_load_snapshot, session_id)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        channel.subscribers.add(queue)
+        queue.put_nowait((None, channel.snapshot))
+
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._run_channel(channel))
+        return queue
+
+    def unsubscribe(self, session_id: int, queue: asyncio.Queue) -> None:
+        """Remove a subscriber. The channel task exits once nobody is listening."""
+        channel = self._channels.get(session_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            channel.changed.set()  # wake the task so it can shut down
+
+    def publish(self, session_id: int) -> None:
+        """Signal that a session's status changed (thread-safe, no-op without subscribers)."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or session_id not in self._channels:
+            return
+        loop.call_soon_threadsafe(self._mark_changed, session_id)
+
+    def sessions_for_team(self, team_id: int) -> Set[int]:
+        """IDs of watched sessions belonging to a team."""
+        return {
+            session_id for session_id, channel in list(self._channels.items())
+            if channel.snapshot is not None and channel.snapshot.team_id == team_id
+        }
+
+    def _mark_changed(self, session_id: int) -> None:
+        channel = self._channels.get(session_id)
+        if channel is not None:
+            channel.changed.set()
+
+    async def _run_channel(self, channel: _SessionChannel) -> None:
+        """Reload and fan out the snapshot whenever the channel is signalled."""
+        try:
+            while channel.subscribers:
+                signalled = True
+                try:
+                    await asyncio.wait_for(channel.changed.wait(), timeout=self._reconcile_interval)
+                except asyncio.TimeoutError:
+                    signalled = False
+                channel.changed.clear()
+                if not channel.subscribers:
+                    break
+
+                try:
+                    if not signalled and channel.snapshot is not None:
+                        # Reconcile: only reload if another worker bumped the version
+                        version = await run_in_threadpool(_load_version, channel.session_id)
+                        if version == channel.snapshot.version:
+                            continue
+                    snapshot = await run_in_threadpool(_load_snapshot, channel.session_id)
+                except Exception as e:
+                    print(f"Live status reload failed for session {channel.session_id}: {e}")
+                    continue
+
+                previous = channel.snapshot
+                if snapshot == previous:
+                    continue
+                channel.snapshot = snapshot
+                for queue in list(channel.subscribers):
+                    queue.put_nowait((previous, snapshot))
+        finally:
+            if not channel.subscribers and self._channels.get(channel.session_id) is channel:
+                del self._channels[channel.session_id]
+
+    async def close(self) -> None:
+        """End all open streams (application shutdown)."""
+        for channel in list(self._channels.values()):
+            for queue in list(channel.subscribers):
+                queue.put_nowait(_CLOSE)
+            if channel.task is not None:
+                channel.task.cancel()
+        self._channels.clear()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(c.subscribers) for c in self._channels.values())
+
+
+# Singleton instance (one hub per worker process)
+_event_hub: Optional[SessionEventHub] = None
+
+
+def get_event_hub() -> SessionEventHub:
+    """Get or create the event hub singleton."""
+    global _event_hub
+    if _event_hub is None:
+        _event_hub = SessionEventHub()
+    return _event_hub
+
+
+def notify_session_changed(session_id: int) -> None:
+    """Invalidate and publish a session's status. Call after the write is committed."""
+    get_status_cache().invalidate(session_id)
+    get_event_hub().publish(session_id)
+
+
+def notify_team_changed(team_id: int) -> None:
+    """Invalidate and publish every session of a team (member list or team code changed)."""
+    hub = get_event_hub()
+    session_ids = get_status_cache().invalidate_team(team_id) | hub.sessions_for_team(team_id)
+    for session_id in session_ids:
+        hub.publish(session_id)
+
+
+def commit_session_change(db: DbSession, session_id: int) -> None:
+    """Commit a status-visible write: bump the version, commit, then invalidate and publish."""
+    bump_status_version(db, session_id=session_id)
+    db.commit()
+    notify_session_changed(session_id)
+
+
+async def commit_session_change_async(db: AsyncSession, session_id: int) -> None:
+    """commit_session_change() for async routes using an AsyncSession."""
+    await db.run_sync(bump_status_version, session_id=session_id)
+    await db.commit()
+    notify_session_changed(session_id)
+
+
+def commit_team_change(db: DbSession, team_id: int) -> None:
+    """Commit a write affecting every session of a team (members, team code)."""
+    bump_status_version(db, team_id=team_id)
+    db.commit()
+    notify_team_changed(team_id)
+
+
+def format_sse(data: dict, event: str = "status") -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream_session_events(
+    request: Request,
+    session_id: int,
+    render: Callable[[Optional[SessionStatusSnapshot], SessionStatusSnapshot], Optional[dict]],
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a session until the client disconnects.
+
+    render(previous, current) builds the payload for this client; previous is
+    None for the initial message. Returning None skips the update.
+    """
+    hub = get_event_hub()
+    queue = await hub.subscribe(session_id)
+    try:
+        yield f"retry: {int(RECONCILE_INTERVAL * 1000)}\n\n"
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+
+            if item is _CLOSE:
+                break
+            previous, current = item
+            if current is None:
+                # Session deleted while being watched
+                yield format_sse({"session_id": session_id}, event="gone")
+                break
+            payload = render(previous, current)
+            if payload is not None:
+                yield format_sse(payload)
+    finally:
+        hub.unsubscribe(session_id, queue)
@@ -2,13 +2,34 @@
 PDF Export Service for The 55 App.
 
 Generates presentation-ready session reports using fpdf2.
+
+The Inter fonts are parsed once per process, together with a copy of each
+pre-subset to Latin text. Reports share the parsed fonts and keep their own
+glyph subsets; when the PDF is written, the embedded subset is cut from the
+small Latin font if it covers every glyph used, else from the full font.
+Finished reports are cached per session, keyed by a hash of everything the
+report shows, so repeat exports of unchanged sessions skip rendering.
+
+Sharing fonts relies on fpdf2 internals (pinned in requirements.txt). If a
+report fails on that path it is rendered again with plain add_font
+registration, and the process stops sharing fonts.
 """
 
+import copy
+import hashlib
+import io
 import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+from fontTools import subset as ftsubset, ttLib
 from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+
+from app.config import get_settings
 
 
 # Design system colors (RGB tuples)
@@ -19,23 +40,146 @@ DIVIDER = (210, 210, 215)         # #d2d2d7
 
 # Font directory path
 FONT_DIR = Path(__file__).parent.parent.parent / "static" / "fonts"
+FONT_FAMILY = "Inter"
+FONT_FILES = {"": "Inter-Regular.ttf", "b": "Inter-Bold.ttf", "i": "Inter-Italic.ttf"}
+
+# Latin, Latin-1, Latin Extended-A/B, punctuation and currency: ~690 of Inter's ~2900 glyphs
+LATIN_UNICODES = frozenset(
+    list(range(0x20, 0x7F)) + list(range(0xA0, 0x250))
+    + list(range(0x2000, 0x2070)) + list(range(0x20A0, 0x20C0)) + [0x2122]
+)
+# Tables fpdf2 drops when embedding - not worth keeping in the pre-subset either
+UNUSED_FONT_TABLES = [
+    "FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx", "meta", "sbix",
+    "CBDT", "CBLC", "EBDT", "EBLC", "EBSC", "SVG ", "CPAL", "COLR",
+]
+
+# Bump when the report layout changes so cached reports are regenerated
+PDF_LAYOUT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class _ReportFont:
+    """One Inter style, parsed once per process."""
+    template: TTFFont            # metrics, cmap and widths shared by every report
+    data: bytes                  # full font file
+    latin_data: bytes            # pre-subset to LATIN_UNICODES
+    latin_glyphs: FrozenSet[str]
+
+
+def _latin_subset(data: bytes) -> Tuple[bytes, FrozenSet[str]]:
+    font = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False)
+    options = ftsubset.Options(
+        notdef_outline=True, recommended_glyphs=True, glyph_names=True,
+        name_IDs=["*"], name_languages=["*"]
+    )
+    options.drop_tables += UNUSED_FONT_TABLES
+    subsetter = ftsubset.Subsetter(options)
+    subsetter.populate(unicodes=LATIN_UNICODES)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue(), frozenset(font.getGlyphOrder())
+
+
+_report_fonts_cache: Optional[Dict[str, _ReportFont]] = None
+_report_fonts_lock = threading.Lock()
+_shared_fonts_failed = False  # Set after a shared-font report fails; add_font from then on
+
+
+def _report_fonts() -> Dict[str, _ReportFont]:
+    """Parse (and pre-subset) the Inter fonts once per process, keyed by fontkey."""
+    global _report_fonts_cache
+    if _report_fonts_cache is not None:
+        return _report_fonts_cache
+    with _report_fonts_lock:
+        if _report_fonts_cache is None:
+            parser = FPDF()
+            fonts = {}
+            for style, filename in FONT_FILES.items():
+                path = FONT_DIR / filename
+                parser.add_font(FONT_FAMILY, style=style, fname=str(path))
+                template = parser.fonts[f"{FONT_FAMILY.lower()}{style.upper()}"]
+                data = path.read_bytes()
+                latin_data, latin_glyphs = _latin_subset(data)
+                fonts[template.fontkey] = _ReportFont(template, data, latin_data, latin_glyphs)
+            _report_fonts_cache = fonts
+        return _report_fonts_cache
+
+
+def warm_report_fonts() -> None:
+    """Load the report fonts in a background thread (app startup) so the first export doesn't."""
+    def load():
+        try:
+            _report_fonts()
+        except Exception as e:
+            print(f"PDF export: could not preload fonts: {e}")
+
+    threading.Thread(target=load, name="pdf-fonts", daemon=True).start()
+
+
+def _font_for_document(template: TTFFont, index: int) -> TTFFont:
+    """
+    Copy of a parsed font for one document.
+
+    Metrics, cmap, widths and (until output) the fontTools object are shared;
+    the glyph subset is per document.
+    """
+    font = copy.copy(template)
+    font.i = index
+    font.subset = SubsetMap(font)
+    font.missing_glyphs = []
+    font.biggest_size_pt = 0
+    return font
 
 
 class SessionReportPDF(FPDF):
     """PDF generator for The 55 session reports."""
 
-    def __init__(self, team_name: str, session_date: str):
+    def __init__(self, team_name: str, session_date: str, share_fonts: bool = True):
         super().__init__()
         self.team_name = team_name
         self.session_date = session_date
-        self._setup_fonts()
+        self._shared_fonts: Dict[str, _ReportFont] = {}
+        self._setup_fonts(share_fonts)
         self.set_auto_page_break(auto=True, margin=20)
 
-    def _setup_fonts(self):
-        """Register Inter font family."""
-        self.add_font("Inter", style="", fname=str(FONT_DIR / "Inter-Regular.ttf"))
-        self.add_font("Inter", style="b", fname=str(FONT_DIR / "Inter-Bold.ttf"))
-        self.add_font("Inter", style="i", fname=str(FONT_DIR / "Inter-Italic.ttf"))
+    def _setup_fonts(self, share_fonts: bool = True):
+        """Register Inter font family (parsed once per process unless share_fonts is off)."""
+        if not share_fonts:
+            self._add_fonts()
+            return
+        try:
+            shared = _report_fonts()
+            fonts = {
+                fontkey: _font_for_document(font.template, len(self.fonts) + i + 1)
+                for i, (fontkey, font) in enumerate(shared.items())
+            }
+        except (AttributeError, TypeError) as e:
+            # fpdf2 internals changed - parse the files for this document instead
+            print(f"PDF export: font cache unavailable, parsing fonts: {e}")
+            self._add_fonts()
+            return
+        self.fonts.update(fonts)
+        self._shared_fonts = shared
+
+    def _add_fonts(self):
+        """Parse the font files for this document only."""
+        for style, filename in FONT_FILES.items():
+            self.add_font(FONT_FAMILY, style=style, fname=str(FONT_DIR / filename))
+
+    def _load_font_data(self):
+        """Fonts are subset in place at output, so each gets its own fontTools object."""
+        for fontkey, shared in self._shared_fonts.items():
+            font = self.fonts[fontkey]
+            used = font.subset.get_all_glyph_names()
+            data = shared.latin_data if shared.latin_glyphs.issuperset(used) else shared.data
+            font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, lazy=True)
+
+    def output(self, *args, **kwargs):
+        """Write the PDF."""
+        self._load_font_data()
+        return super().output(*args, **kwargs)
 
     def header(self):
         """Page header with branding."""
@@ -96,6 +240,38 @@ class SessionReportPDF(FPDF):
         self.ln(8)
 
 
+def _report_synthesis(session) -> Tuple[Optional[str], List[dict]]:
+    """Themes (None if unfinished or failed) and statements as shown in the report."""
+    themes = None
+    if session.synthesis_themes and session.synthesis_themes.lower() != "generating...":
+        # Skip error messages
+        themes_lower = session.synthesis_themes.lower()
+        if "failed" not in themes_lower and "insufficient" not in themes_lower:
+            themes = session.synthesis_themes
+
+    statements = []
+    if session.synthesis_statements:
+        try:
+            statements = json.loads(session.synthesis_statements) or []
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return themes, statements
+
+
+def report_version(session, team) -> str:
+    """Hash of everything the report shows; changes whenever the PDF would."""
+    themes, statements = _report_synthesis(session)
+    canonical = json.dumps([
+        PDF_LAYOUT_VERSION,
+        team.team_name,
+        session.month,
+        team.strategy_statement,
+        themes,
+        statements,
+    ], ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def generate_session_pdf(session, team) -> bytes:
     """
     Generate a PDF report for a session.
@@ -107,10 +283,23 @@ def generate_session_pdf(session, team) -> bytes:
     Returns:
         PDF content as bytes
     """
+    global _shared_fonts_failed
+    if not _shared_fonts_failed:
+        try:
+            return _render_session_pdf(session, team, share_fonts=True)
+        except Exception as e:
+            # Most likely fpdf2 internals the shared fonts rely on - don't fail the export
+            print(f"PDF export: shared fonts failed, parsing fonts from now on: {e!r}")
+            _shared_fonts_failed = True
+    return _render_session_pdf(session, team, share_fonts=False)
+
+
+def _render_session_pdf(session, team, share_fonts: bool) -> bytes:
     # Create fresh PDF instance (instances are not reusable)
     pdf = SessionReportPDF(
         team_name=team.team_name,
-        session_date=session.month
+        session_date=session.month,
+        share_fonts=share_fonts
     )
     pdf.add_page()
 
@@ -123,28 +312,94 @@ def generate_session_pdf(session, team) -> bytes:
         pdf.add_body_text(team.strategy_statement)
         pdf.ln(5)
 
+    themes, statements = _report_synthesis(session)
+
     # Synthesis themes (What We Heard)
-    if session.synthesis_themes and session.synthesis_themes.lower() != "generating...":
-        # Skip error messages
-        themes_lower = session.synthesis_themes.lower()
-        if "failed" not in themes_lower and "insufficient" not in themes_lower:
-            pdf.add_section_header("What We Heard")
-            pdf.add_body_text(session.synthesis_themes)
-            pdf.ln(5)
+    if themes:
+        pdf.add_section_header("What We Heard")
+        pdf.add_body_text(themes)
+        pdf.ln(5)
 
     # Key Insights with attribution
-    if session.synthesis_statements:
-        try:
-            statements = json.loads(session.synthesis_statements)
-            if statements:
-                pdf.add_section_header("Key Insights")
-                for stmt in statements:
-                    pdf.add_attributed_insight(
-                        stmt.get("statement", ""),
-                        stmt.get("participants", [])
-                    )
-        except (json.JSONDecodeError, TypeError):
-            pass
+    if statements:
+        pdf.add_section_header("Key Insights")
+        for stmt in statements:
+            pdf.add_attributed_insight(
+                stmt.get("statement", ""),
+                stmt.get("participants", [])
+            )
 
     # Return PDF bytes
     return bytes(pdf.output())
+
+
+class PdfReportCache:
+    """
+    Per-process LRU of finished reports: one entry per session, replaced
+    when the session's report version changes.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()  # exports may run in the threadpool
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session, team) -> Optional[bytes]:
+        """Return the cached report for the session's current version, if any."""
+        version = report_version(session, team)
+        with self._lock:
+            entry = self._entries.get(session.id)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(session.id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def render(self, session, team) -> bytes:
+        """Render the report and cache it under the session's current version."""
+        version = report_version(session, team)
+        pdf_bytes = generate_session_pdf(session, team)
+
+        with self._lock:
+            self._entries[session.id] = (version, pdf_bytes)
+            self._entries.move_to_end(session.id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return pdf_bytes
+
+    def get_or_render(self, session, team) -> bytes:
+        """Return the cached report for the session's current version, rendering it if needed."""
+        pdf_bytes = self.get(session, team)
+        if pdf_bytes is None:
+            pdf_bytes = self.render(session, team)
+        return pdf_bytes
+
+    def stats(self) -> dict:
+        """Hit/miss counters and cache size for this worker."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "bytes": sum(len(pdf) for _, pdf in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "fonts_loaded": _report_fonts_cache is not None,
+                "shared_fonts": not _shared_fonts_failed
+            }
+
+
+# Singleton instance (lazy initialization)
+_pdf_report_cache: Optional[PdfReportCache] = None
+
+
+def get_pdf_report_cache() -> PdfReportCache:
+    """Get or create the PDF report cache singleton."""
+    global _pdf_report_cache
+    if _pdf_report_cache is None:
+        _pdf_report_cache = PdfReportCache(max_entries=get_settings().pdf_cache_size)
+    return _pdf_report_cache
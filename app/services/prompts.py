@@ -0,0 +1,179 @@
+"""
+The 55 App - Synthesis Prompt Templates
+
+Prompt text for team synthesis, shared by live sessions (synthesis.py) and the
+landing-page demo (routers/demo.py). The instructions and the SynthesisOutput
+JSON schema are rendered once at import; each call only formats the strategy
+statement and the response block.
+
+The static instructions are sent as the first content block with a prompt
+caching marker, so repeated calls reuse the processed prefix on the API side.
+Invalid output is fixed with a short repair prompt rather than a full rerun.
+"""
+
+import json
+from typing import List
+
+from app.schemas import SynthesisOutput
+
+
+# Rendered once - the schema only changes with the code
+SYNTHESIS_SCHEMA_JSON = json.dumps(SynthesisOutput.model_json_schema(), indent=2)
+
+_PREAMBLE = "You are analyzing responses from a leadership team's monthly alignment diagnostic."
+
+_GAP_DIAGNOSIS = """3. **Gap Diagnosis**: Identify the primary gap type from exactly one of these three options:
+   - **Direction**: Team lacks shared understanding of goals or priorities
+   - **Alignment**: Team's work is disconnected or uncoordinated
+   - **Commitment**: Individual interests override collective success"""
+
+_OUTPUT_FORMAT = f"""## Output Format
+Respond ONLY with valid JSON matching this schema:
+```json
+{SYNTHESIS_SCHEMA_JSON}
+```"""
+
+SYNTHESIS_INSTRUCTIONS = f"""{_PREAMBLE}
+
+## Your Task
+The team's strategy statement and their responses follow these instructions.
+Synthesize the responses into four parts:
+
+1. **Themes** (2-4 sentences): High-level summary of what the team is experiencing. Focus on patterns across responses.
+
+2. **Attributed Statements**: Specific insights with attribution. Each statement needs:
+   - A short 1-3 word **name** that captures the theme (e.g., "Timeline Mismatch", "Priority Disconnect", "Handoff Friction")
+   - The full statement describing the insight
+   - The names of team members whose responses support it
+
+{_GAP_DIAGNOSIS}
+
+4. **Gap Reasoning** (2-3 sentences): Explain WHY you diagnosed this specific gap type. Reference specific evidence from the responses that led to this conclusion. This should clearly justify the diagnosis.
+
+5. **Suggested Recalibrations**: Provide exactly 3 specific, actionable recalibration actions the team could take to address the diagnosed gap. Each should be concrete and achievable within 30 days. Format as action items the team can commit to.
+
+{_OUTPUT_FORMAT}
+
+IMPORTANT:
+- gap_type MUST be exactly one of: "Direction", "Alignment", or "Commitment"
+- gap_reasoning MUST explain WHY this gap type was chosen based on evidence
+- statements array should contain 3-6 attributed insights
+- Each statement MUST have a short 1-3 word "name" that captures the theme
+- Each statement.participants array should contain 1-3 team member names
+- suggested_recalibrations MUST contain exactly 3 actionable items"""
+
+DEMO_SYNTHESIS_INSTRUCTIONS = f"""{_PREAMBLE}
+
+## CRITICAL REQUIREMENT - READ FIRST
+The participant named "You" is the CEO who just completed this exercise. Their comments MUST be included.
+In the attributed statements section, "You" MUST appear as a participant in at least 1 statement.
+If you fail to include "You" in the output, the synthesis is invalid.
+
+## Your Task
+The team's strategy statement and their responses follow these instructions.
+Synthesize the responses into four parts:
+
+1. **Themes** (2-4 sentences): High-level summary of what the team is experiencing. Focus on patterns across responses.
+
+2. **Attributed Statements**: Specific insights with attribution. Each statement needs:
+   - A short 1-3 word **name** that captures the theme (e.g., "Timeline Mismatch", "Priority Disconnect", "Handoff Friction")
+   - The full statement describing the insight
+   - The names of team members whose responses support it
+   Every person must appear in at least one statement. Each participant should recognise their comments reflected in the themes.
+
+{_GAP_DIAGNOSIS}
+
+4. **Gap Reasoning** (2-3 sentences): Explain WHY you diagnosed this specific gap type. Reference specific evidence from the responses that led to this conclusion.
+
+5. **Suggested Recalibrations**: Provide exactly 3 specific, actionable recalibration actions the team could take to address the diagnosed gap.
+
+{_OUTPUT_FORMAT}
+
+IMPORTANT - VALIDATION RULES:
+- gap_type MUST be exactly one of: "Direction", "Alignment", or "Commitment"
+- gap_reasoning MUST explain WHY this gap type was chosen based on evidence
+- statements array should contain 3-6 attributed insights
+- Each statement MUST have a short 1-3 word "name" that captures the theme
+- "You" MUST appear in the participants array of at least 1 statement (this is the CEO - mandatory)
+- All other team members should appear in at least one statement
+- suggested_recalibrations MUST contain exactly 3 actionable items
+
+FAILURE TO INCLUDE "You" IN AT LEAST 1 STATEMENT WILL INVALIDATE THE RESPONSE."""
+
+
+def format_team_input(responses: List[dict], strategy_statement: str) -> str:
+    """
+    Render the per-call part of the prompt: strategy statement and responses.
+
+    Args:
+        responses: List of dicts with keys: name, image_id (optional), bullets
+        strategy_statement: The team's 3AM test strategy statement
+    """
+    responses_text = "\n\n".join([
+        f"**{r['name']}** (Image: {r.get('image_id', 'unknown')}):\n" +
+        "\n".join(f"- {b}" for b in r['bullets'])
+        for r in responses
+    ])
+
+    return f"""## Context
+The team's strategy statement (the "3AM test" - what someone should know at 3AM):
+"{strategy_statement}"
+
+## Team Responses
+Each team member selected an image representing their current state and provided bullet points explaining their choice:
+
+{responses_text}"""
+
+
+def build_messages(instructions: str, responses: List[dict], strategy_statement: str) -> List[dict]:
+    """Messages for a synthesis call: cached static instructions, then the team input."""
+    return [{
+        "role": "user",
+        "content": [
+            {
+                "type": "text",
+                "text": instructions,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": format_team_input(responses, strategy_statement)
+            }
+        ]
+    }]
+
+
+def synthesis_messages(responses: List[dict], strategy_statement: str) -> List[dict]:
+    """Messages for a live session synthesis."""
+    return build_messages(SYNTHESIS_INSTRUCTIONS, responses, strategy_statement)
+
+
+def demo_synthesis_messages(responses: List[dict], strategy_statement: str) -> List[dict]:
+    """Messages for a demo synthesis (the visitor appears as "You")."""
+    return build_messages(DEMO_SYNTHESIS_INSTRUCTIONS, responses, strategy_statement)
+
+
+REPAIR_INSTRUCTIONS = f"""The text below was meant to be a single JSON object matching this schema, but it could not be used:
+```json
+{SYNTHESIS_SCHEMA_JSON}
+```
+
+Fix it with as few changes as possible - keep all of its content and wording. Respond ONLY with the corrected JSON object."""
+
+
+def repair_messages(invalid_output: str, error: str) -> List[dict]:
+    """Messages asking the model to fix output that failed to parse or validate."""
+    return [{
+        "role": "user",
+        "content": [
+            {
+                "type": "text",
+                "text": REPAIR_INSTRUCTIONS,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": f"## Error\n{error}\n\n## Output to fix\n{invalid_output}"
+            }
+        ]
+    }]
@@ -0,0 +1,287 @@
+"""
+The 55 App - QR Code Service
+
+Renders team join QR codes as PNG (exact pixel size or native module size)
+or SVG (one path, scales to any projector without blurring).
+
+Rendered codes are cached in-process and on disk, keyed by join URL, error
+correction level, size and format, so each variant is drawn once per host
+and team code rather than on every page load. The key hash doubles as a
+strong ETag, so revalidation can answer 304 without rendering anything.
+Entries are filed under the team code and removed when the code changes.
+
+The join URL comes from the request's (forwarded) host, so every distinct
+host header adds files. The directory is therefore capped: after each write,
+the least recently used files beyond qr_cache_max_files are removed.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import qrcode
+import qrcode.constants
+
+from app.config import get_settings
+
+
+# Bump when rendering changes, so cached files and client ETags are replaced
+QR_RENDER_VERSION = 1
+
+QR_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+QR_BORDER = 4  # Quiet zone, in modules
+
+STALE_TMP_SECONDS = 60  # Temp files older than this were left by a crashed writer
+
+
+@dataclass(frozen=True)
+class QrSpec:
+    """
+    One rendering of a join URL.
+
+    size is the output width in pixels; None keeps box_size pixels per module.
+    """
+    join_url: str
+    code: str
+    error_correction: str = "M"
+    box_size: int = 10
+    size: Optional[int] = None
+    fmt: str = "png"
+
+    @property
+    def key(self) -> Tuple:
+        return (self.join_url, self.error_correction, self.box_size, self.size, self.fmt)
+
+    @property
+    def digest(self) -> str:
+        canonical = json.dumps([QR_RENDER_VERSION, *self.key], separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag - the same spec always renders the same bytes."""
+        return f'"qr-{self.digest}"'
+
+    @property
+    def media_type(self) -> str:
+        return QR_FORMATS[self.fmt]
+
+
+def _matrix(spec: QrSpec) -> qrcode.QRCode:
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=ERROR_CORRECTION[spec.error_correction],
+        box_size=spec.box_size,
+        border=QR_BORDER,
+    )
+    qr.add_data(spec.join_url)
+    qr.make(fit=True)
+    return qr
+
+
+def _render_svg(qr: qrcode.QRCode, size: int) -> bytes:
+    """One path of horizontal module runs in a viewBox of module units."""
+    matrix = qr.get_matrix()  # Includes the border
+    count = len(matrix)
+    runs = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < count:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < count and row[x]:
+                x += 1
+            runs.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {count} {count}" shape-rendering="crispEdges">'
+        f'<rect width="{count}" height="{count}" fill="#fff"/>'
+        f'<path d="{"".join(runs)}" fill="#000"/></svg>'
+    ).encode("utf-8")
+
+
+def render_qr(spec: QrSpec) -> bytes:
+    """Render a QR code (no caching)."""
+    qr = _matrix(spec)
+    if spec.fmt == "svg":
+        native = (qr.modules_count + 2 * QR_BORDER) * spec.box_size
+        return _render_svg(qr, spec.size or native)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+    if spec.size:
+        img = img.resize((spec.size, spec.size))
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class QrCodeCache:
+    """
+    Per-process LRU of rendered QR codes backed by a shared cache directory.
+
+    Thread-safe; renders happen outside the lock.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 64, max_files: int = 512):
+        self.cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._max_files = max_files
+        self._entries: "OrderedDict[Tuple, Tuple[str, bytes]]" = OrderedDict()  # key -> (code, bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.renders = 0
+        self.invalidations = 0
+        self.disk_evictions = 0
+
+    @staticmethod
+    def _code_prefix(code: str) -> str:
+        return re.sub(r"[^A-Za-z0-9]", "_", code)
+
+    def _path(self, spec: QrSpec) -> Path:
+        return self.cache_dir / f"{self._code_prefix(spec.code)}-{spec.digest}.{spec.fmt}"
+
+    def _remember(self, spec: QrSpec, content: bytes) -> None:
+        with self._lock:
+            self._entries[spec.key] = (spec.code, content)
+            self._entries.move_to_end(spec.key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, spec: QrSpec) -> bytes:
+        """Return the rendered code from memory, disk, or a fresh render."""
+        with self._lock:
+            entry = self._entries.get(spec.key)
+            if entry is not None:
+                self._entries.move_to_end(spec.key)
+                self.hits += 1
+                return entry[1]
+
+        path = self._path(spec)
+        try:
+            content = path.read_bytes()
+        except OSError:
+            content = None
+        if content:
+            with self._lock:
+                self.disk_hits += 1
+            try:
+                os.utime(path)  # Recently used - kept when the directory is pruned
+            except OSError:
+                pass
+            self._remember(spec, content)
+            return content
+
+        content = render_qr(spec)
+        with self._lock:
+            self.renders += 1
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)  # Atomic - other workers never read a partial file
+        except OSError as e:
+            print(f"QR cache: could not write {path}: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        else:
+            self._prune_disk()
+        self._remember(spec, content)
+        return content
+
+    def _prune_disk(self) -> None:
+        """Remove the least recently used files beyond max_files, and stale temp files."""
+        files = []
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for path in self.cache_dir.iterdir():
+            try:
+                mtime = path.stat().st_mtime
+                if path.suffix == ".tmp":
+                    if mtime < stale_before:
+                        path.unlink()
+                    continue
+            except OSError:
+                continue  # Removed by another worker
+            files.append((mtime, path))
+
+        excess = len(files) - self._max_files
+        if excess <= 0:
+            return
+        files.sort()
+        removed = 0
+        for _, path in files[:excess]:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass  # Already removed by another worker
+        with self._lock:
+            self.disk_evictions += removed
+
+    def invalidate_code(self, code: str) -> int:
+        """Drop every cached rendering for a team code. Returns files removed."""
+        with self._lock:
+            for key in [k for k, (c, _) in self._entries.items() if c == code]:
+                del self._entries[key]
+            self.invalidations += 1
+
+        removed = 0
+        for path in self.cache_dir.glob(f"{self._code_prefix(code)}-*"):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass  # Already removed by another worker
+        return removed
+
+    def stats(self) -> dict:
+        """Hit/render counters for this worker."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.renders
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "renders": self.renders,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+                "disk_evictions": self.disk_evictions
+            }
+
+
+# Singleton instance (lazy initialization)
+_qr_code_cache: Optional[QrCodeCache] = None
+
+
+def get_qr_code_cache() -> QrCodeCache:
+    """Get or create the QR code cache singleton."""
+    global _qr_code_cache
+    if _qr_code_cache is None:
+        settings = get_settings()
+        _qr_code_cache = QrCodeCache(
+            cache_dir=Path(settings.qr_cache_dir),
+            max_entries=settings.qr_cache_size,
+            max_files=settings.qr_cache_max_files
+        )
+    return _qr_code_cache
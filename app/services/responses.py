@@ -0,0 +1,157 @@
+"""
+The 55 App - Session Responses Service
+
+Loads a session, its team and every response with the responding member's name
+in a single joined query, so rendering and export paths never look up members
+one response at a time; bulk exports load many sessions' responses per query.
+Also owns the atomic response upsert used by submit.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session as DbSession
+
+from app.db.models import Team, Member, Session, Response
+from app.services.images import get_image_library
+
+
+@dataclass(frozen=True)
+class ResponseView:
+    """One participant response with bullets decoded and image URL resolved."""
+    member_id: int
+    name: Optional[str]  # None if the member has since been removed
+    image_id: str
+    image_url: Optional[str]
+    bullets: List[str]
+    submitted_at: Optional[datetime]
+
+    @property
+    def display_name(self) -> str:
+        return self.name or "Unknown"
+
+
+@dataclass
+class SessionResponseBundle:
+    """A session with its team and parsed responses (in submission order)."""
+    session: Session
+    team: Team
+    responses: List[ResponseView] = field(default_factory=list)
+
+
+def parse_bullets(raw: Optional[str]) -> List[str]:
+    """Decode a stored bullets JSON array, tolerating empty or corrupt values."""
+    if not raw:
+        return []
+    try:
+        bullets = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return bullets if isinstance(bullets, list) else []
+
+
+def get_image_url(image_id: str) -> Optional[str]:
+    """Resolve an opaque image ID to its library URL (None if no longer in the library)."""
+    filename = get_image_library().get_filename_by_id(image_id)
+    return f"/static/images/library/reducedlive/{filename}" if filename else None
+
+
+def load_session_responses(db: DbSession, session_id: int) -> Optional[SessionResponseBundle]:
+    """
+    Load session, team, responses and member names in one query.
+
+    Returns None if the session does not exist.
+    """
+    rows = db.query(Session, Team, Response, Member.name).join(
+        Team, Team.id == Session.team_id
+    ).outerjoin(
+        Response, Response.session_id == Session.id
+    ).outerjoin(
+        Member, Member.id == Response.member_id
+    ).filter(
+        Session.id == session_id
+    ).order_by(Response.id).all()
+
+    if not rows:
+        return None
+
+    session, team = rows[0][0], rows[0][1]
+    bundle = SessionResponseBundle(session=session, team=team)
+    for _, _, response, member_name in rows:
+        if response is None:
+            continue  # Outer join row for a session with no responses
+        bundle.responses.append(_response_view(response, member_name))
+    return bundle
+
+
+def load_sessions_responses(db: DbSession, sessions: List[Session]) -> List[SessionResponseBundle]:
+    """
+    Bundle many sessions with their responses using one responses query.
+
+    The sessions' teams must already be loaded (e.g. with joinedload); db may
+    be a different session from the one the sessions were loaded with.
+    Bundles are returned in the order of sessions.
+    """
+    bundles: Dict[int, SessionResponseBundle] = {
+        session.id: SessionResponseBundle(session=session, team=session.team)
+        for session in sessions
+    }
+    if not bundles:
+        return []
+
+    rows = db.query(Response, Member.name).outerjoin(
+        Member, Member.id == Response.member_id
+    ).filter(
+        Response.session_id.in_(list(bundles))
+    ).order_by(Response.id).all()
+
+    for response, member_name in rows:
+        bundles[response.session_id].responses.append(_response_view(response, member_name))
+    return list(bundles.values())
+
+
+def _response_view(response: Response, member_name: Optional[str]) -> ResponseView:
+    return ResponseView(
+        member_id=response.member_id,
+        name=member_name,
+        image_id=response.image_id,
+        image_url=get_image_url(response.image_id),
+        bullets=parse_bullets(response.bullets),
+        submitted_at=response.submitted_at,
+    )
+
+
+def upsert_response(
+    db: DbSession,
+    session_id: int,
+    member_id: int,
+    image_id: str,
+    bullets_json: str
+) -> None:
+    """
+    Insert or replace a member's response in one statement (not committed).
+
+    Relies on the unique (session_id, member_id) index, so concurrent or
+    double-tapped submits always leave exactly one row.
+    """
+    now = datetime.utcnow()
+    statement = sqlite_insert(Response).values(
+        session_id=session_id,
+        member_id=member_id,
+        image_id=image_id,
+        bullets=bullets_json,
+        submitted_at=now,
+        updated_at=now,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Response.session_id, Response.member_id],
+        set_={
+            "image_id": statement.excluded.image_id,
+            "bullets": statement.excluded.bullets,
+            "updated_at": statement.excluded.updated_at,
+        }
+    )
+    db.execute(statement)
@@ -0,0 +1,372 @@
+"""
+The 55 App - Session Status Service
+
+Builds the live status snapshot (state, members, submissions, synthesis progress)
+shared by the facilitator and participant polling endpoints and the live event stream.
+Snapshots are cached in-process and invalidated by every write path, so meeting-time
+polling is served without touching SQLite. Every status-visible write also bumps
+sessions.status_version, which the polling endpoints expose as an ETag.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as DbSession
+
+from app.config import get_settings
+from app.db.models import Team, Member, Session, Response, SessionState
+
+
+@dataclass(frozen=True)
+class SessionStatusSnapshot:
+    """Immutable point-in-time view of a session's live status."""
+    session_id: int
+    team_id: int
+    team_code: str
+    state: SessionState
+    members: Tuple[Tuple[int, str], ...]  # (id, name) ordered by name
+    submitted_ids: FrozenSet[int]
+    synthesis_status: str  # pending, generating, failed, complete
+    version: int = 0  # sessions.status_version when loaded
+    synthesis_partial: Optional[Dict[str, object]] = None  # sections streamed so far
+
+    @property
+    def total_members(self) -> int:
+        return len(self.members)
+
+    @property
+    def submitted_count(self) -> int:
+        return len(self.submitted_ids)
+
+    @property
+    def synthesis_sections(self) -> List[str]:
+        """Labels of the synthesis sections already available, in arrival order."""
+        if self.synthesis_status != "generating" or not self.synthesis_partial:
+            return []
+        return [label for key, label in SYNTHESIS_SECTIONS if key in self.synthesis_partial]
+
+
+# Streamed synthesis sections reported as progress (key, label), in arrival order
+SYNTHESIS_SECTIONS = (
+    ("themes", "Themes"),
+    ("statements", "Key insights"),
+    ("gap_type", "Gap diagnosis"),
+    ("suggested_recalibrations", "Recalibrations"),
+)
+
+
+def get_synthesis_status(synthesis_themes: Optional[str]) -> str:
+    """Derive synthesis progress from the synthesis_themes marker column."""
+    if synthesis_themes is None:
+        return "pending"
+    themes_lower = synthesis_themes.lower()
+    if themes_lower == "generating...":
+        return "generating"
+    if "failed" in themes_lower or "insufficient" in themes_lower:
+        return "failed"
+    return "complete"
+
+
+def _parse_partial(raw: Optional[str]) -> Optional[Dict[str, object]]:
+    """Decode sessions.synthesis_partial (None if empty or unreadable)."""
+    if not raw:
+        return None
+    try:
+        partial = json.loads(raw)
+    except ValueError:
+        return None
+    return partial if isinstance(partial, dict) else None
+
+
+def load_status_snapshot(db: DbSession, session_id: int) -> Optional[SessionStatusSnapshot]:
+    """Load a fresh status snapshot from the database (None if session missing)."""
+    row = db.query(Session, Team.code).join(Team, Team.id == Session.team_id).filter(
+        Session.id == session_id
+    ).first()
+    if not row:
+        return None
+    session, team_code = row
+
+    members = db.query(Member.id, Member.name).filter(
+        Member.team_id == session.team_id
+    ).order_by(Member.name).all()
+    submitted_ids = {
+        member_id for (member_id,) in
+        db.query(Response.member_id).filter(Response.session_id == session_id).all()
+    }
+
+    return SessionStatusSnapshot(
+        session_id=session.id,
+        team_id=session.team_id,
+        team_code=team_code,
+        state=session.state,
+        members=tuple((m.id, m.name) for m in members),
+        submitted_ids=frozenset(submitted_ids),
+        synthesis_status=get_synthesis_status(session.synthesis_themes),
+        version=session.status_version or 0,
+        synthesis_partial=_parse_partial(session.synthesis_partial),
+    )
+
+
+def get_status_version(db: DbSession, session_id: int) -> Optional[Tuple[int, str]]:
+    """Single-row lookup of (status_version, team code) - enough to answer a conditional GET."""
+    row = db.query(Session.status_version, Team.code).join(Team, Team.id == Session.team_id).filter(
+        Session.id == session_id
+    ).first()
+    if not row:
+        return None
+    return row[0] or 0, row[1]
+
+
+def bump_status_version(db: DbSession, session_id: int = None, team_id: int = None) -> None:
+    """Increment status_version for a session, or every session of a team, in the current transaction."""
+    query = db.query(Session)
+    if session_id is not None:
+        query = query.filter(Session.id == session_id)
+    else:
+        query = query.filter(Session.team_id == team_id)
+    query.update(
+        {Session.status_version: Session.status_version + 1},
+        synchronize_session=False
+    )
+
+
+def status_etag(session_id: int, version: int) -> str:
+    """Weak ETag for a session's status payloads."""
+    return f'W/"s{session_id}-v{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" match each other
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+class SessionStatusCache:
+    """
+    Per-process cache of status snapshots keyed by session ID.
+
+    Write paths in this worker invalidate entries immediately. When the caller
+    has already read the session's status_version the entry is validated
+    against it exactly; otherwise the TTL bounds how long a write made by
+    another Gunicorn worker can go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float = 3.0, max_entries: int = 256):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: Dict[int, Tuple[SessionStatusSnapshot, float]] = {}
+        self._lock = threading.Lock()  # invalidations also arrive from the synthesis thread
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, session_id: int, version: Optional[int] = None) -> Optional[SessionStatusSnapshot]:
+        """Return a fresh cached snapshot, or None on a miss (counted either way)."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry:
+                snapshot, stored_at = entry
+                if version is not None:
+                    fresh = snapshot.version == version
+                else:
+                    fresh = time.monotonic() - stored_at < self._ttl
+                if fresh:
+                    self.hits += 1
+                    return snapshot
+            self.misses += 1
+        return None
+
+    def get(
+        self,
+        db: DbSession,
+        session_id: int,
+        version: Optional[int] = None
+    ) -> Optional[SessionStatusSnapshot]:
+        """Return the cached snapshot, loading it from the database on a miss."""
+        snapshot = self.lookup(session_id, version)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = load_status_snapshot(db, session_id)
+        if snapshot is not None:
+            self.put(snapshot)
+        return snapshot
+
+    def put(self, snapshot: SessionStatusSnapshot) -> None:
+        """Store a freshly loaded snapshot."""
+        with self._lock:
+            self._entries.pop(snapshot.session_id, None)
+            self._entries[snapshot.session_id] = (snapshot, time.monotonic())
+            while len(self._entries) > self._max_entries:
+                # Dicts keep insertion order - drop the least recently stored
+                del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, session_id: int) -> None:
+        """Drop one session's snapshot after a write."""
+        with self._lock:
+            if self._entries.pop(session_id, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_team(self, team_id: int) -> Set[int]:
+        """Drop snapshots for every cached session of a team. Returns their IDs."""
+        with self._lock:
+            session_ids = {
+                session_id for session_id, (snapshot, _) in self._entries.items()
+                if snapshot.team_id == team_id
+            }
+            for session_id in session_ids:
+                del self._entries[session_id]
+            self.invalidations += len(session_ids)
+        return session_ids
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this worker."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self._ttl
+            }
+
+
+# Singleton instance (lazy initialization)
+_status_cache: Optional[SessionStatusCache] = None
+
+
+def get_status_cache() -> SessionStatusCache:
+    """Get or create the status cache singleton."""
+    global _status_cache
+    if _status_cache is None:
+        _status_cache = SessionStatusCache(ttl_seconds=get_settings().status_cache_ttl)
+    return _status_cache
+
+
+def get_status_snapshot(
+    db: DbSession,
+    session_id: int,
+    version: Optional[int] = None
+) -> Optional[SessionStatusSnapshot]:
+    """Cached status snapshot for the polling endpoints (validated against version if given)."""
+    return get_status_cache().get(db, session_id, version)
+
+
+async def get_status_snapshot_async(
+    db: AsyncSession,
+    session_id: int,
+    version: Optional[int] = None
+) -> Optional[SessionStatusSnapshot]:
+    """get_status_snapshot() for async routes - cache misses load without blocking the event loop."""
+    cache = get_status_cache()
+    snapshot = cache.lookup(session_id, version)
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = await db.run_sync(load_status_snapshot, session_id)
+    if snapshot is not None:
+        cache.put(snapshot)
+    return snapshot
+
+
+def admin_status_payload(snapshot: SessionStatusSnapshot) -> dict:
+    """Facilitator status JSON (capture, session and meeting views)."""
+    return {
+        "session_id": snapshot.session_id,
+        "state": snapshot.state.value,
+        "total_members": snapshot.total_members,
+        "submitted_count": snapshot.submitted_count,
+        "members": [
+            {"id": member_id, "name": name, "submitted": member_id in snapshot.submitted_ids}
+            for member_id, name in snapshot.members
+        ],
+        "has_synthesis": snapshot.synthesis_status != "pending",
+        "synthesis_status": snapshot.synthesis_status,
+        "synthesis_pending": (
+            snapshot.state == SessionState.CLOSED and
+            snapshot.synthesis_status == "pending"
+        ),
+        # Sections streamed so far (themes, statements, gap_type, ...) while generating
+        "synthesis_partial": (
+            snapshot.synthesis_partial if snapshot.synthesis_status == "generating" else None
+        )
+    }
+
+
+def admin_status_delta(
+    previous: Optional[SessionStatusSnapshot],
+    current: SessionStatusSnapshot
+) -> dict:
+    """Compact facilitator status update: counts plus only the members that changed."""
+    if previous is None:
+        return admin_status_payload(current)
+
+    previous_members = dict(previous.members)
+    current_members = dict(current.members)
+    changed: List[dict] = []
+    for member_id, name in current.members:
+        submitted = member_id in current.submitted_ids
+        if (
+            previous_members.get(member_id) != name or
+            submitted != (member_id in previous.submitted_ids)
+        ):
+            changed.append({"id": member_id, "name": name, "submitted": submitted})
+
+    payload = admin_status_payload(current)
+    payload["members"] = changed
+    payload["removed_member_ids"] = [
+        member_id for member_id in previous_members if member_id not in current_members
+    ]
+    payload["delta"] = True
+    return payload
+
+
+_PARTICIPANT_SYNTHESIS_MESSAGES = {
+    "pending": "Preparing analysis...",
+    "generating": "Analyzing team responses...",
+    "failed": "Analysis encountered an issue. Your facilitator will retry.",
+    "complete": "Analysis complete!",
+}
+
+
+def participant_status_payload(snapshot: SessionStatusSnapshot) -> dict:
+    """Participant status JSON (waiting screen). Names only - no member IDs."""
+    # Build synthesis progress for CLOSED state
+    synthesis_progress = None
+    if snapshot.state == SessionState.CLOSED:
+        sections = snapshot.synthesis_sections
+        message = _PARTICIPANT_SYNTHESIS_MESSAGES[snapshot.synthesis_status]
+        if sections:
+            message = f"Analyzing team responses... {len(sections)} of {len(SYNTHESIS_SECTIONS)} sections ready"
+        synthesis_progress = {
+            "status": snapshot.synthesis_status,
+            "message": message,
+            "sections": sections
+        }
+
+    return {
+        "session_id": snapshot.session_id,
+        "state": snapshot.state.value,
+        "total_members": snapshot.total_members,
+        "submitted_count": snapshot.submitted_count,
+        "submitted_members": [
+            {"name": name} for member_id, name in snapshot.members
+            if member_id in snapshot.submitted_ids
+        ],
+        "unsubmitted_members": [
+            {"name": name} for member_id, name in snapshot.members
+            if member_id not in snapshot.submitted_ids
+        ],
+        "can_edit": snapshot.state == SessionState.CAPTURING,
+        "synthesis_progress": synthesis_progress,
+    }
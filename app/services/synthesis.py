@@ -2,154 +2,116 @@
 The 55 App - Synthesis Service
 
 Claude API integration for generating insights from team responses.
-Uses AsyncAnthropic client with sync wrapper for BackgroundTasks compatibility.
+Runs on the application event loop via the synthesis worker (see synthesis_jobs).
+
+The response is streamed: each top-level section (themes, statements, gap type,
+recalibrations) is stored in sessions.synthesis_partial and published as soon as
+its JSON value is complete, so screens can render it before the rest arrives.
+Results are cached by prompt inputs (see synthesis_cache).
 """
 
 import json
-import asyncio
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from anthropic import AsyncAnthropic
+from starlette.concurrency import run_in_threadpool
 
 from datetime import datetime
 
 from app.db.database import SessionLocal
-from app.db.models import Session, Response, SessionState
+from app.db.models import Session, SessionState
 from app.schemas import SynthesisOutput
+from app.services.live import commit_session_change
+from app.services.prompts import synthesis_messages
+from app.services.responses import load_session_responses
+from app.services.synthesis_cache import get_synthesis_cache, synthesis_cache_key
+from app.services.synthesis_output import PartialJsonObject, parse_or_repair, validate_section
 
 
-# Module-level client (uses ANTHROPIC_API_KEY env var)
+# Module-level client (uses ANTHROPIC_API_KEY env var), used on the long-lived app event loop
 client = AsyncAnthropic()
 
+SYNTHESIS_MODEL = "claude-sonnet-4-5-20250929"
+# Part of the cache key - bump when the prompt templates (services/prompts.py) change
+SYNTHESIS_PROMPT_VERSION = 2
 
-def build_synthesis_prompt(
-    responses: List[dict],
-    strategy_statement: str
-) -> str:
-    """
-    Build prompt for team response synthesis.
-
-    Args:
-        responses: List of dicts with keys: name, image_id, bullets
-        strategy_statement: The team's 3AM test strategy statement
-
-    Returns:
-        Complete prompt for Claude synthesis
-    """
-    responses_text = "\n\n".join([
-        f"**{r['name']}** (Image: {r['image_id']}):\n" +
-        "\n".join(f"- {b}" for b in r['bullets'])
-        for r in responses
-    ])
-
-    # JSON schema for structured output instruction
-    json_schema = SynthesisOutput.model_json_schema()
-
-    return f"""You are analyzing responses from a leadership team's monthly alignment diagnostic.
-
-## Context
-The team's strategy statement (the "3AM test" - what someone should know at 3AM):
-"{strategy_statement}"
-
-## Team Responses
-Each team member selected an image representing their current state and provided bullet points explaining their choice:
-
-{responses_text}
-
-## Your Task
-Synthesize these responses into four parts:
-
-1. **Themes** (2-4 sentences): High-level summary of what the team is experiencing. Focus on patterns across responses.
-
-2. **Attributed Statements**: Specific insights with attribution. Each statement needs:
-   - A short 1-3 word **name** that captures the theme (e.g., "Timeline Mismatch", "Priority Disconnect", "Handoff Friction")
-   - The full statement describing the insight
-   - The names of team members whose responses support it
-
-3. **Gap Diagnosis**: Identify the primary gap type from exactly one of these three options:
-   - **Direction**: Team lacks shared understanding of goals or priorities
-   - **Alignment**: Team's work is disconnected or uncoordinated
-   - **Commitment**: Individual interests override collective success
+GENERATING_MARKER = "GENERATING..."
 
-4. **Gap Reasoning** (2-3 sentences): Explain WHY you diagnosed this specific gap type. Reference specific evidence from the responses that led to this conclusion. This should clearly justify the diagnosis.
 
-5. **Suggested Recalibrations**: Provide exactly 3 specific, actionable recalibration actions the team could take to address the diagnosed gap. Each should be concrete and achievable within 30 days. Format as action items the team can commit to.
+class InsufficientResponses(Exception):
+    """Fewer than the minimum responses - recorded on the session, not retried."""
 
-## Output Format
-Respond ONLY with valid JSON matching this schema:
-```json
-{json.dumps(json_schema, indent=2)}
-```
 
-IMPORTANT:
-- gap_type MUST be exactly one of: "Direction", "Alignment", or "Commitment"
-- gap_reasoning MUST explain WHY this gap type was chosen based on evidence
-- statements array should contain 3-6 attributed insights
-- Each statement MUST have a short 1-3 word "name" that captures the theme
-- Each statement.participants array should contain 1-3 team member names
-- suggested_recalibrations MUST contain exactly 3 actionable items"""
-
-
-async def _generate_and_store_synthesis(session_id: int) -> None:
+def _is_current_run(session: Optional[Session], generation: Optional[int]) -> bool:
     """
-    Generate synthesis from Claude and store results in database.
+    True if a run for this generation may still write to the session.
 
-    This is the async implementation called by the sync wrapper.
-    Creates its own database session to avoid lifecycle issues.
+    A retry, reopen or regenerate resets the marker or moves the session to a
+    new generation; the superseded run's output must then be dropped.
     """
+    if not session or session.synthesis_themes != GENERATING_MARKER:
+        return False
+    return generation is None or session.synthesis_generation == generation
+
+
+def _load_synthesis_input(session_id: int, generation: Optional[int] = None) -> Optional[Tuple[List[dict], str]]:
+    """Load (response data, strategy statement) for the prompt. None if session is gone or superseded."""
     db = SessionLocal()
     try:
-        session = db.query(Session).filter(Session.id == session_id).first()
-        if not session:
-            return
-
-        responses = db.query(Response).filter(
-            Response.session_id == session_id
-        ).all()
+        bundle = load_session_responses(db, session_id)
+        if not bundle or not _is_current_run(bundle.session, generation):
+            return None
 
         # Minimum 3 responses required for meaningful synthesis
-        if len(responses) < 3:
+        if len(bundle.responses) < 3:
+            session = bundle.session
             session.synthesis_themes = "Insufficient responses for synthesis (minimum 3 required)."
             session.synthesis_statements = "[]"
             session.synthesis_gap_type = None
-            db.commit()
-            return
+            session.synthesis_partial = None
+            commit_session_change(db, session_id)
+            raise InsufficientResponses()
 
         # Build response data for prompt
         response_data = [{
-            "name": r.member.name,
+            "name": r.display_name,
             "image_id": r.image_id,
-            "bullets": json.loads(r.bullets)
-        } for r in responses]
+            "bullets": r.bullets
+        } for r in bundle.responses]
 
         # Get strategy statement (may be None)
-        strategy_statement = session.team.strategy_statement or ""
-
-        # Build prompt and call Claude
-        prompt = build_synthesis_prompt(response_data, strategy_statement)
-
-        message = await client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2048,
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
+        return response_data, bundle.team.strategy_statement or ""
+    finally:
+        db.close()
 
-        # Parse response and validate with Pydantic
-        response_text = message.content[0].text
 
-        # Handle potential markdown code block wrapping
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            # Remove first line (```json) and last line (```)
-            response_text = "\n".join(lines[1:-1])
+def _store_partial(session_id: int, sections: Dict[str, object], generation: Optional[int] = None) -> None:
+    """Store the sections streamed so far while the session is still generating."""
+    db = SessionLocal()
+    try:
+        session = db.query(Session).filter(Session.id == session_id).first()
+        # A retry or reopen may have reset the session mid-stream
+        if not _is_current_run(session, generation):
+            return
+        session.synthesis_partial = json.dumps(sections)
+        commit_session_change(db, session_id)
+    finally:
+        db.close()
+
+
+def _store_synthesis(session_id: int, result: SynthesisOutput, generation: Optional[int] = None) -> bool:
+    """
+    Store validated results and auto-reveal the session.
 
-        result_data = json.loads(response_text)
-        result = SynthesisOutput(**result_data)
+    Returns False (storing nothing) if the run was superseded meanwhile.
+    """
+    db = SessionLocal()
+    try:
+        session = db.query(Session).filter(Session.id == session_id).first()
+        if not _is_current_run(session, generation):
+            print(f"Synthesis for session {session_id} superseded - result not stored")
+            return False
 
-        # Store validated results
         session.synthesis_themes = result.themes
         session.synthesis_statements = json.dumps(
             [s.model_dump() for s in result.statements]
@@ -157,42 +119,104 @@ async def _generate_and_store_synthesis(session_id: int) -> None:
         session.synthesis_gap_type = result.gap_type
         session.synthesis_gap_reasoning = result.gap_reasoning
         session.suggested_recalibrations = json.dumps(result.suggested_recalibrations)
+        session.synthesis_partial = None
 
         # Auto-reveal: transition CLOSED -> REVEALED after successful synthesis
         if session.state == SessionState.CLOSED:
             session.state = SessionState.REVEALED
             session.revealed_at = datetime.utcnow()
 
-        db.commit()
+        commit_session_change(db, session_id)
+        return True
+    finally:
+        db.close()
 
-    except Exception as e:
-        # Log error but don't crash - store fallback message
-        print(f"Synthesis error for session {session_id}: {e}")
-        try:
-            session.synthesis_themes = "Synthesis generation failed. Please try again."
-            session.synthesis_statements = "[]"
-            session.synthesis_gap_type = None
-            db.commit()
-        except Exception:
-            # If we can't even save the error state, just log
-            print(f"Failed to save error state for session {session_id}")
+
+def store_synthesis_failure(session_id: int, generation: Optional[int] = None) -> None:
+    """Record a final synthesis failure so the facilitator can retry."""
+    db = SessionLocal()
+    try:
+        session = db.query(Session).filter(Session.id == session_id).first()
+        if not _is_current_run(session, generation):
+            return
+        session.synthesis_themes = "Synthesis generation failed. Please try again."
+        session.synthesis_statements = "[]"
+        session.synthesis_gap_type = None
+        session.synthesis_partial = None
+        commit_session_change(db, session_id)
     finally:
         db.close()
 
 
-def run_synthesis_task(session_id: int) -> None:
+async def generate_synthesis(
+    session_id: int,
+    anthropic_client: Optional[AsyncAnthropic] = None,
+    force: bool = False,
+    generation: Optional[int] = None
+) -> None:
     """
-    Background task entry point for synthesis generation.
+    Generate synthesis from Claude and store results in database.
 
-    This is a sync function that creates its own event loop,
-    avoiding worker timeout issues with Gunicorn/Uvicorn.
+    Database work runs in the threadpool; the Claude response is streamed on
+    the caller's event loop and each section is stored as it completes. Raises
+    on API or parsing errors so the synthesis worker can retry - the session
+    keeps its "GENERATING..." marker meanwhile.
+    Insufficient responses are recorded on the session and end the job.
 
-    Args:
-        session_id: Database ID of the session to synthesize
+    A cached result for identical inputs is stored without calling Claude,
+    unless force is set (facilitator asked to regenerate). With generation
+    (the job's), nothing is stored once the session has moved past it.
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     try:
-        loop.run_until_complete(_generate_and_store_synthesis(session_id))
-    finally:
-        loop.close()
+        loaded = await run_in_threadpool(_load_synthesis_input, session_id, generation)
+    except InsufficientResponses:
+        return
+    if loaded is None:
+        return
+    response_data, strategy_statement = loaded
+
+    cache = get_synthesis_cache()
+    cache_key = synthesis_cache_key(
+        response_data, strategy_statement, SYNTHESIS_MODEL, SYNTHESIS_PROMPT_VERSION
+    )
+    if force:
+        cache.bypass()
+    else:
+        cached = await run_in_threadpool(cache.get, cache_key)
+        if cached is not None:
+            await run_in_threadpool(_store_synthesis, session_id, cached, generation)
+            return
+
+    # Stream Claude's response
+    parser = PartialJsonObject()
+    sections: Dict[str, object] = {}
+    async with (anthropic_client or client).messages.stream(
+        model=SYNTHESIS_MODEL,
+        max_tokens=2048,
+        messages=synthesis_messages(response_data, strategy_statement)
+    ) as stream:
+        async for text in stream.text_stream:
+            added = False
+            for name, value in parser.feed(text).items():
+                section = validate_section(name, value)
+                if section is not None:
+                    sections[name] = section
+                    added = True
+            if added:
+                await run_in_threadpool(_store_partial, session_id, dict(sections), generation)
+        message = await stream.get_final_message()
+
+    # Extract and validate the full response (one repair request if it is invalid;
+    # truncated output raises so the job retries)
+    result = await parse_or_repair(
+        message.content[0].text, anthropic_client or client, SYNTHESIS_MODEL,
+        stop_reason=message.stop_reason
+    )
+
+    # Cached even if superseded - the result is still valid for the inputs it was made from
+    await run_in_threadpool(_store_synthesis, session_id, result, generation)
+    try:
+        await run_in_threadpool(cache.put, cache_key, SYNTHESIS_MODEL, result)
+    except Exception as e:
+        # The session already has its result - a cache write failure must not retry the job
+        print(f"Synthesis cache store failed for session {session_id}: {e}")
@@ -0,0 +1,175 @@
+"""
+The 55 App - Synthesis Cache Service
+
+Content-addressed cache of synthesis results. The key is a sha256 of the
+prompt inputs (strategy statement, ordered name/image/bullets per response)
+plus the model and prompt version, so retries, reopen/re-close cycles and
+double-triggered syntheses with identical inputs reuse the stored
+SynthesisOutput instead of calling Claude again.
+
+Entries live in the synthesis_cache table (shared by all Gunicorn workers),
+expire after synthesis_cache_ttl_days and are evicted least-recently-used
+beyond synthesis_cache_max_entries.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import SynthesisCacheEntry
+from app.schemas import SynthesisOutput
+
+
+def synthesis_cache_key(
+    responses: List[dict],
+    strategy_statement: str,
+    model: str,
+    prompt_version: int
+) -> str:
+    """Stable hash of the synthesis prompt inputs (responses in prompt order)."""
+    canonical = json.dumps({
+        "model": model,
+        "prompt_version": prompt_version,
+        "strategy": strategy_statement,
+        "responses": [[r["name"], r["image_id"], r["bullets"]] for r in responses],
+    }, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SynthesisCache:
+    """
+    Database-backed synthesis result cache with per-process hit/miss counters.
+
+    Methods do blocking database work - call them from the threadpool.
+    """
+
+    def __init__(self, enabled: bool = True, max_entries: int = 500, ttl_days: int = 90):
+        self.enabled = enabled
+        self._max_entries = max_entries
+        self._ttl = timedelta(days=ttl_days)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key: str) -> Optional[SynthesisOutput]:
+        """Return the cached result for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        db = SessionLocal()
+        try:
+            entry = db.query(SynthesisCacheEntry).filter(
+                SynthesisCacheEntry.cache_key == key,
+                SynthesisCacheEntry.created_at >= datetime.utcnow() - self._ttl
+            ).first()
+            if not entry:
+                self._count("misses")
+                return None
+            try:
+                result = SynthesisOutput.model_validate_json(entry.output)
+            except ValueError:
+                # Stored under an older schema - regenerate and overwrite
+                self._count("misses")
+                return None
+
+            entry.hit_count += 1
+            entry.last_used_at = datetime.utcnow()
+            db.commit()
+            self._count("hits")
+            return result
+        finally:
+            db.close()
+
+    def bypass(self) -> None:
+        """Record a lookup skipped by a forced regeneration."""
+        self._count("bypasses")
+
+    def put(self, key: str, model: str, result: SynthesisOutput) -> None:
+        """Store (or replace) a result, then evict expired and least recently used entries."""
+        if not self.enabled:
+            return
+        now = datetime.utcnow()
+        output = result.model_dump_json()
+        db = SessionLocal()
+        try:
+            stmt = sqlite_insert(SynthesisCacheEntry).values(
+                cache_key=key, model=model, output=output,
+                hit_count=0, created_at=now, last_used_at=now
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[SynthesisCacheEntry.cache_key],
+                set_={
+                    "model": stmt.excluded.model,
+                    "output": stmt.excluded.output,
+                    "hit_count": 0,
+                    "created_at": stmt.excluded.created_at,
+                    "last_used_at": stmt.excluded.last_used_at,
+                }
+            ))
+
+            evicted = db.query(SynthesisCacheEntry).filter(
+                SynthesisCacheEntry.created_at < now - self._ttl
+            ).delete(synchronize_session=False)
+            keep = db.query(SynthesisCacheEntry.id).order_by(
+                SynthesisCacheEntry.last_used_at.desc(), SynthesisCacheEntry.id.desc()
+            ).limit(self._max_entries)
+            evicted += db.query(SynthesisCacheEntry).filter(
+                SynthesisCacheEntry.id.notin_(keep)
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+        self._count("stores")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this worker plus the shared entry count."""
+        db = SessionLocal()
+        try:
+            entries = db.query(SynthesisCacheEntry).count()
+        finally:
+            db.close()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "bypasses": self.bypasses,
+                "stores": self.stores,
+                "evictions": self.evictions
+            }
+
+
+# Singleton instance (lazy initialization)
+_synthesis_cache: Optional[SynthesisCache] = None
+
+
+def get_synthesis_cache() -> SynthesisCache:
+    """Get or create the synthesis cache singleton."""
+    global _synthesis_cache
+    if _synthesis_cache is None:
+        settings = get_settings()
+        _synthesis_cache = SynthesisCache(
+            enabled=settings.synthesis_cache_enabled,
+            max_entries=settings.synthesis_cache_max_entries,
+            ttl_days=settings.synthesis_cache_ttl_days
+        )
+    return _synthesis_cache
@@ -0,0 +1,405 @@
+"""
+The 55 App - Synthesis Job Queue
+
+Durable synthesis jobs (synthesis_jobs table) executed by a long-lived worker
+on each Gunicorn worker's event loop. Jobs are claimed atomically, so several
+workers can share the queue; failures are retried with exponential backoff,
+and jobs left running by a crashed or recycled worker are recovered.
+
+The session's synthesis_themes marker ("GENERATING...", failure text, results)
+is still what the facilitator and participant screens read.
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+
+from anthropic import AsyncAnthropic
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as DbSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import Session, SessionState, SynthesisJob, JobStatus
+from app.services.live import commit_session_change
+from app.services.synthesis import GENERATING_MARKER, generate_synthesis, store_synthesis_failure
+
+# How often the worker looks for jobs whose worker died (besides startup)
+RECOVERY_INTERVAL = 60.0
+
+ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def worker_id() -> str:
+    """Identify this process as "host:pid" (computed per call - Gunicorn forks after import)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _supersede(db: DbSession, session: Session, job: SynthesisJob) -> None:
+    """Retire an active job and move the session to a new generation (not committed)."""
+    job.status = JobStatus.SUPERSEDED
+    job.finished_at = datetime.utcnow()
+    job.locked_by = None
+    session.synthesis_generation = (session.synthesis_generation or 0) + 1
+    db.flush()  # Free the one-active-job slot before a new job is added
+
+
+def supersede_synthesis(db: DbSession, session: Session) -> None:
+    """
+    Stop any queued or running synthesis for a session (added to the caller's transaction).
+
+    Used when the session goes back to capturing: a run still in flight was
+    started from the old responses and must not store or reveal its result.
+    """
+    existing = db.query(SynthesisJob).filter(
+        SynthesisJob.session_id == session.id,
+        SynthesisJob.status.in_(ACTIVE_STATUSES)
+    ).first()
+    if existing:
+        _supersede(db, session, existing)
+    else:
+        session.synthesis_generation = (session.synthesis_generation or 0) + 1
+
+
+def enqueue_synthesis(db: DbSession, session_id: int, force: bool = False) -> Optional[SynthesisJob]:
+    """
+    Queue a synthesis run for a session (added to the caller's transaction).
+
+    force skips the synthesis cache (explicit regenerate). A queued job is
+    reused. A running job is reused only if it was started for the session's
+    current generation and force is not set; otherwise it is superseded (its
+    result will not be stored) and a fresh job is queued.
+    Routes call begin_write() first, so a concurrent request from another
+    worker sees this job instead of inserting a second active one.
+    Call get_synthesis_worker().wake() after committing.
+    """
+    session = db.query(Session).filter(Session.id == session_id).first()
+    if not session:
+        return None
+
+    existing = db.query(SynthesisJob).filter(
+        SynthesisJob.session_id == session_id,
+        SynthesisJob.status.in_(ACTIVE_STATUSES)
+    ).first()
+    if existing and existing.status == JobStatus.QUEUED:
+        # Not started yet - it reads the current responses when it runs
+        existing.generation = session.synthesis_generation
+        if force:
+            existing.force_regenerate = True
+        return existing
+    if existing:
+        if not force and existing.generation == session.synthesis_generation:
+            # Same inputs: let the run finish (and show it as generating again)
+            session.synthesis_themes = GENERATING_MARKER
+            return existing
+        _supersede(db, session, existing)
+
+    job = SynthesisJob(
+        session_id=session_id,
+        max_attempts=get_settings().synthesis_max_attempts,
+        force_regenerate=force,
+        generation=session.synthesis_generation
+    )
+    db.add(job)
+    return job
+
+
+def claim_next_job(owner: str) -> Optional[Tuple[int, int, bool, int]]:
+    """
+    Atomically claim the next due job.
+
+    Returns (job_id, session_id, force_regenerate, generation) or None.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        candidate = db.query(
+            SynthesisJob.id, SynthesisJob.session_id, SynthesisJob.force_regenerate, SynthesisJob.generation
+        ).filter(
+            SynthesisJob.status == JobStatus.QUEUED,
+            SynthesisJob.run_after <= now
+        ).order_by(SynthesisJob.run_after, SynthesisJob.id).first()
+        if not candidate:
+            return None
+
+        # Conditional update - only one worker can move it out of QUEUED
+        claimed = db.query(SynthesisJob).filter(
+            SynthesisJob.id == candidate.id,
+            SynthesisJob.status == JobStatus.QUEUED
+        ).update({
+            SynthesisJob.status: JobStatus.RUNNING,
+            SynthesisJob.attempts: SynthesisJob.attempts + 1,
+            SynthesisJob.locked_by: owner,
+            SynthesisJob.locked_at: now
+        }, synchronize_session=False)
+        if not claimed:
+            db.rollback()
+            return None
+
+        # Retry requests clear the marker - show "generating" once work starts
+        session = db.query(Session).filter(Session.id == candidate.session_id).first()
+        if session and session.synthesis_themes is None and session.synthesis_generation == candidate.generation:
+            session.synthesis_themes = GENERATING_MARKER
+            commit_session_change(db, session.id)
+        else:
+            db.commit()
+        return candidate.id, candidate.session_id, bool(candidate.force_regenerate), candidate.generation
+    finally:
+        db.close()
+
+
+def complete_job(job_id: int) -> None:
+    """Mark a job done (unless it was superseded meanwhile)."""
+    db = SessionLocal()
+    try:
+        db.query(SynthesisJob).filter(
+            SynthesisJob.id == job_id,
+            SynthesisJob.status == JobStatus.RUNNING
+        ).update({
+            SynthesisJob.status: JobStatus.DONE,
+            SynthesisJob.finished_at: datetime.utcnow(),
+            SynthesisJob.locked_by: None
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def fail_job(job_id: int, error: str) -> bool:
+    """
+    Record a failed attempt: requeue with backoff, or give up after max_attempts.
+
+    Returns True if the job will be retried. Superseded jobs are left alone.
+    """
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        job = db.query(SynthesisJob).filter(SynthesisJob.id == job_id).first()
+        if not job or job.status != JobStatus.RUNNING:
+            return False
+        job.last_error = error[:2000]
+        job.locked_by = None
+
+        if job.attempts < job.max_attempts:
+            delay = settings.synthesis_retry_base_seconds * 2 ** max(job.attempts - 1, 0)
+            job.status = JobStatus.QUEUED
+            job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+            # Sections streamed by the failed attempt are discarded; the retry starts afresh
+            cleared = db.query(Session).filter(
+                Session.id == job.session_id,
+                Session.synthesis_generation == job.generation,
+                Session.synthesis_partial.isnot(None)
+            ).update({Session.synthesis_partial: None}, synchronize_session=False)
+            if cleared:
+                commit_session_change(db, job.session_id)
+            else:
+                db.commit()
+            return True
+
+        job.status = JobStatus.FAILED
+        job.finished_at = datetime.utcnow()
+        session_id, generation = job.session_id, job.generation
+        db.commit()
+    finally:
+        db.close()
+
+    store_synthesis_failure(session_id, generation)
+    return False
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_lost(job: SynthesisJob, now: datetime, timeout: int, own_id: str) -> bool:
+    """True if a RUNNING job's worker is gone (dead local process or timed out)."""
+    if job.locked_at is None or job.locked_at < now - timedelta(seconds=timeout):
+        return True
+    if not job.locked_by or job.locked_by == own_id:
+        return False
+    host, _, pid = job.locked_by.rpartition(":")
+    return host == socket.gethostname() and pid.isdigit() and not _pid_alive(int(pid))
+
+
+def recover_stale_jobs(requeue_orphaned_sessions: bool = False) -> int:
+    """
+    Requeue jobs whose worker died mid-run (counts as a failed attempt).
+
+    With requeue_orphaned_sessions, also queue jobs for sessions left showing
+    "GENERATING..." with no active job (e.g. runs lost before the job table).
+    Returns the number of jobs recovered or queued.
+    """
+    settings = get_settings()
+    own_id = worker_id()
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        running = db.query(SynthesisJob).filter(SynthesisJob.status == JobStatus.RUNNING).all()
+        lost_ids = [
+            job.id for job in running
+            if _is_lost(job, now, settings.synthesis_job_timeout, own_id)
+        ]
+
+        queued = 0
+        if requeue_orphaned_sessions:
+            active_session_ids = db.query(SynthesisJob.session_id).filter(
+                SynthesisJob.status.in_(ACTIVE_STATUSES)
+            )
+            orphaned = db.query(Session.id).filter(
+                Session.state == SessionState.CLOSED,
+                Session.synthesis_themes == GENERATING_MARKER,
+                Session.id.notin_(active_session_ids)
+            ).all()
+            for (session_id,) in orphaned:
+                enqueue_synthesis(db, session_id)
+            try:
+                db.commit()
+                queued = len(orphaned)
+            except IntegrityError:
+                # Another worker queued them first (one active job per session)
+                db.rollback()
+    finally:
+        db.close()
+
+    for job_id in lost_ids:
+        fail_job(job_id, "Worker stopped while the job was running")
+    if lost_ids or queued:
+        print(f"Synthesis recovery: {len(lost_ids)} stale jobs requeued, {queued} orphaned sessions queued")
+    return len(lost_ids) + queued
+
+
+class SynthesisWorker:
+    """
+    Long-lived queue consumer with bounded concurrency (one per Gunicorn worker).
+
+    Pass a stub client to run it without calling the Anthropic API.
+    """
+
+    def __init__(
+        self,
+        anthropic_client: Optional[AsyncAnthropic] = None,
+        concurrency: int = 2,
+        poll_interval: float = 2.0
+    ):
+        self.anthropic_client = anthropic_client
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Recover lost jobs, then start consuming the queue."""
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        await run_in_threadpool(recover_stale_jobs, True)
+        self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        """Check the queue now (thread-safe). Call after committing a new job."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and self._wakeup is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        owner = worker_id()
+        last_recovery = self._loop.time()
+        while True:
+            await self._slots.acquire()
+            try:
+                claimed = await run_in_threadpool(claim_next_job, owner)
+            except Exception as e:
+                print(f"Synthesis worker: claim failed: {e}")
+                claimed = None
+
+            if claimed is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+                loop_time = self._loop.time()
+                if loop_time - last_recovery >= RECOVERY_INTERVAL:
+                    last_recovery = loop_time
+                    try:
+                        await run_in_threadpool(recover_stale_jobs)
+                    except Exception as e:
+                        print(f"Synthesis worker: recovery failed: {e}")
+                continue
+
+            task = asyncio.create_task(self._process(*claimed))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _process(self, job_id: int, session_id: int, force: bool, generation: int) -> None:
+        try:
+            await generate_synthesis(session_id, self.anthropic_client, force=force, generation=generation)
+            await run_in_threadpool(complete_job, job_id)
+            self.completed += 1
+        except asyncio.CancelledError:
+            # Shutdown mid-run: left RUNNING, recovered by the next worker start
+            raise
+        except Exception as e:
+            print(f"Synthesis error for session {session_id} (job {job_id}): {e}")
+            try:
+                if await run_in_threadpool(fail_job, job_id, str(e)):
+                    self.retried += 1
+                else:
+                    self.failed += 1
+            except Exception as store_error:
+                print(f"Failed to record synthesis failure for job {job_id}: {store_error}")
+        finally:
+            self._slots.release()
+
+    async def stop(self) -> None:
+        """Stop consuming; in-flight jobs are cancelled and recovered on next start."""
+        tasks = list(self._in_flight)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict:
+        """Counters for this worker process."""
+        return {
+            "in_flight": len(self._in_flight),
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed
+        }
+
+
+# Singleton instance (one worker per process)
+_synthesis_worker: Optional[SynthesisWorker] = None
+
+
+def get_synthesis_worker() -> SynthesisWorker:
+    """Get or create the synthesis worker singleton."""
+    global _synthesis_worker
+    if _synthesis_worker is None:
+        settings = get_settings()
+        _synthesis_worker = SynthesisWorker(
+            concurrency=settings.synthesis_concurrency,
+            poll_interval=settings.synthesis_poll_interval
+        )
+    return _synthesis_worker
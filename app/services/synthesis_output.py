@@ -0,0 +1,269 @@
+"""
+The 55 App - Synthesis Output Parsing
+
+Turns Claude's synthesis text into a validated SynthesisOutput, shared by live
+sessions (synthesis.py) and the landing-page demo.
+
+- PartialJsonObject picks completed top-level fields out of a streamed response.
+- extract_json_object() finds the outermost JSON object, so code fences,
+  preambles and trailing prose no longer fail the whole synthesis.
+- parse_or_repair() asks Claude only to fix invalid JSON instead of rerunning
+  the full synthesis, and counts how often that saves a round-trip. Output
+  cut off by the token limit is not repaired (the repair would have to invent
+  the missing sections) - it raises SynthesisTruncatedError so the job retries.
+"""
+
+import json
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+from anthropic import AsyncAnthropic
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas import SynthesisOutput
+from app.services.prompts import repair_messages
+
+
+class SynthesisParseError(ValueError):
+    """Model output contained no JSON object or one that fails SynthesisOutput."""
+
+
+class SynthesisTruncatedError(SynthesisParseError):
+    """Model output stopped before the JSON object closed - retry, don't repair."""
+
+
+# Validators for individual sections of a streamed SynthesisOutput
+_SECTION_ADAPTERS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in SynthesisOutput.model_fields.items()
+}
+
+
+class PartialJsonObject:
+    """
+    Incremental parser for a JSON object arriving in chunks.
+
+    feed() returns the top-level fields whose values became complete with the
+    new text. Anything before the opening brace (e.g. a ```json fence) is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # just past the last complete field
+        self._decoder = json.JSONDecoder()
+        self.closed = False
+
+    def feed(self, text: str) -> Dict[str, object]:
+        """Append a chunk and return newly completed fields."""
+        self._buffer += text
+        buffer = self._buffer
+        completed: Dict[str, object] = {}
+
+        if self._pos is None:
+            start = buffer.find("{")
+            if start < 0:
+                return completed
+            self._pos = start + 1
+
+        while not self.closed:
+            pos = self._skip_separators(buffer, self._pos)
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "}":
+                self.closed = True
+                break
+            try:
+                key, pos = self._decoder.raw_decode(buffer, pos)
+                pos = self._skip_separators(buffer, pos, ":")
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # field still incomplete
+            if not isinstance(key, str):
+                break
+            if end >= len(buffer) and not isinstance(value, (str, list, dict)):
+                break  # a number or literal at the end may still be growing
+            completed[key] = value
+            self._pos = end
+
+        return completed
+
+    @staticmethod
+    def _skip_separators(buffer: str, pos: int, separators: str = ",") -> int:
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in separators):
+            pos += 1
+        return pos
+
+
+def validate_section(name: str, value: object) -> Optional[object]:
+    """Validate one streamed section; returns its JSON-ready value or None if unusable."""
+    adapter = _SECTION_ADAPTERS.get(name)
+    if adapter is None:
+        return None
+    try:
+        return adapter.dump_python(adapter.validate_python(value), mode="json")
+    except ValidationError:
+        return None
+
+
+# An opening brace followed by a key: the start of a JSON object, not prose
+_OBJECT_START = re.compile(r'\{\s*"')
+
+
+def _balanced_object_end(text: str, start: int) -> int:
+    """Index just past the brace matching text[start], or -1 if it never closes."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def extract_json_object(text: str) -> Tuple[dict, bool]:
+    """
+    Return the outermost JSON object in text and whether extraction was needed.
+
+    Tries each opening brace in turn, matching it to its closing brace
+    (string-aware), and skips code fences, preambles, trailing prose and
+    brace pairs that are not JSON. A brace that never closes is skipped if it
+    is prose; an object key after it means the output was cut off. The flag is
+    False when the text was exactly one JSON object.
+
+    Raises SynthesisTruncatedError when an object never closes and no later
+    brace yields one.
+    """
+    unclosed = False
+    start = text.find("{")
+    while start >= 0:
+        end = _balanced_object_end(text, start)
+        if end < 0:
+            if _OBJECT_START.match(text, start):
+                break  # Every later brace is nested in this cut-off object
+            unclosed = True
+            start = text.find("{", start + 1)
+            continue
+        try:
+            value = json.loads(text[start:end])
+        except ValueError:
+            start = text.find("{", end)
+            continue
+        clean = not text[:start].strip() and not text[end:].strip()
+        return value, not clean
+    if unclosed or start >= 0:
+        raise SynthesisTruncatedError("Output ends before the JSON object is complete")
+    raise SynthesisParseError("No JSON object found in model output")
+
+
+def parse_synthesis_output(text: str) -> Tuple[SynthesisOutput, bool]:
+    """Extract and validate a SynthesisOutput. Returns (result, extraction needed)."""
+    data, extracted = extract_json_object(text)
+    try:
+        return SynthesisOutput.model_validate(data), extracted
+    except ValidationError as e:
+        raise SynthesisParseError(f"Output does not match the schema: {e}") from e
+
+
+class SynthesisOutputStats:
+    """Per-process counters for synthesis output parsing and repairs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.extracted = 0
+        self.repairs_attempted = 0
+        self.repairs_succeeded = 0
+        self.repairs_failed = 0
+        self.truncated = 0
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "parsed": self.parsed,
+                "extracted": self.extracted,
+                "repairs_attempted": self.repairs_attempted,
+                # Each successful repair replaced a full synthesis re-run
+                "round_trips_saved": self.repairs_succeeded,
+                "repairs_failed": self.repairs_failed,
+                "truncated": self.truncated
+            }
+
+
+# Singleton instance
+_output_stats = SynthesisOutputStats()
+
+
+def get_synthesis_output_stats() -> SynthesisOutputStats:
+    """Get the synthesis output stats singleton."""
+    return _output_stats
+
+
+async def parse_or_repair(
+    text: str,
+    anthropic_client: AsyncAnthropic,
+    model: str,
+    timeout: Optional[float] = None,
+    stop_reason: Optional[str] = None
+) -> SynthesisOutput:
+    """
+    Parse model output, asking the model once to repair it if that fails.
+
+    The repair request carries only the schema, the invalid output and the
+    error - not the team responses. Raises SynthesisParseError if the repaired
+    output is still invalid (or propagates API errors from the repair call).
+
+    Truncated output (stop_reason "max_tokens" or an unclosed top-level
+    object) raises SynthesisTruncatedError without a repair request.
+    """
+    stats = get_synthesis_output_stats()
+    if stop_reason == "max_tokens":
+        stats.count("truncated")
+        raise SynthesisTruncatedError("Output hit the max_tokens limit")
+    try:
+        result, extracted = parse_synthesis_output(text)
+    except SynthesisTruncatedError:
+        stats.count("truncated")
+        raise
+    except SynthesisParseError as e:
+        error = str(e)
+    else:
+        stats.count("parsed")
+        if extracted:
+            stats.count("extracted")
+        return result
+
+    print(f"Synthesis output invalid, requesting repair: {error[:200]}")
+    stats.count("repairs_attempted")
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    try:
+        message = await anthropic_client.messages.create(
+            model=model,
+            max_tokens=2048,
+            messages=repair_messages(text, error),
+            **kwargs
+        )
+        result, _ = parse_synthesis_output(message.content[0].text)
+    except Exception:
+        stats.count("repairs_failed")
+        raise
+    stats.count("repairs_succeeded")
+    return result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark image pagination for seeded (per-session) shuffles.
+
+Compares the previous per-request approach (copy the full list, shuffle with
+the seed, slice one page) with ImageLibrary.get_paginated_images(), which
+shuffles once per seed and then slices the memoized order. Uses a synthetic
+manifest, so no image files are needed.
+
+Usage (from the site root):
+    python scripts/bench_images.py [--sizes 200 2000 20000] [--pages 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("FACILITATOR_PASSWORD_HASH", "bench")
+
+from app.services.images import ImageLibrary, MANIFEST_VERSION, opaque_image_id  # noqa: E402
+
+PER_PAGE = 42
+
+
+def build_library(size: int, tmpdir: Path) -> ImageLibrary:
+    manifest_path = tmpdir / f"manifest-{size}.json"
+    images = [
+        {"id": opaque_image_id(f"img{i:05d}"), "filename": f"img{i:05d}.jpg"}
+        for i in range(size)
+    ]
+    manifest_path.write_text(json.dumps({"version": MANIFEST_VERSION, "images": images}))
+    return ImageLibrary(image_dir=tmpdir, manifest_path=manifest_path)
+
+
+def previous_page(library: ImageLibrary, seed: int, page: int) -> list:
+    """The pre-memoization path: copy, shuffle and slice on every request."""
+    images = library.discover_images().copy()
+    random.Random(seed).shuffle(images)
+    start = (page - 1) * PER_PAGE
+    return images[start:start + PER_PAGE]
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--pages", type=int, default=200, help="Page requests per measurement")
+    args = parser.parse_args()
+
+    tmpdir = Path(tempfile.mkdtemp(prefix="the55-bench-images-"))
+    print(f"{'images':>7} {'previous':>12} {'first (miss)':>14} {'cached page':>13} {'speedup':>8}")
+    for size in args.sizes:
+        library = build_library(size, tmpdir)
+        library.discover_images()  # load the manifest outside the measurement
+        seed = 1234
+        total_pages = max(1, (size + PER_PAGE - 1) // PER_PAGE)
+
+        # Same result as before memoization
+        assert library.get_paginated_images(seed, 2, PER_PAGE)["images"] == previous_page(library, seed, 2)
+
+        before = timed(lambda i: previous_page(library, seed, i % total_pages + 1), args.pages)
+        first = timed(lambda i: library.get_paginated_images(seed + 1 + i, 1, PER_PAGE), 20)
+        cached = timed(lambda i: library.get_paginated_images(seed, i % total_pages + 1, PER_PAGE), args.pages)
+        print(f"{size:>7} {before:>10.1f}us {first:>12.1f}us {cached:>11.1f}us {before / cached:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF session report export: cold vs warm latency.
+
+- previous: fonts parsed for every report (the pre-cache behaviour)
+- cold:     first report in a fresh process (parses and pre-subsets the
+            fonts once; the app does this in the background at startup)
+- warm:     fonts already parsed, report content changed (full render)
+- cached:   unchanged session exported again (served from the report cache)
+
+Also checks that reports rendered with the shared fonts match reports
+rendered with freshly parsed fonts (everything but the embedded font
+subsets, which may be cut from the pre-subset Latin font). Runs on synthetic
+session data; no database needed.
+
+Usage (from the site root):
+    python scripts/bench_pdf.py [--runs 20]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("FACILITATOR_PASSWORD_HASH", "bench")
+
+from app.services import pdf_export  # noqa: E402
+from app.services.pdf_export import PdfReportCache, generate_session_pdf  # noqa: E402
+
+
+def make_session(i: int):
+    statements = [
+        {
+            "name": f"Theme {n}",
+            "statement": f"Insight {n} for run {i}: handoffs between product and sales teams lose context.",
+            "participants": ["Alex", "Sam", "Jordan"][: 1 + n % 3]
+        }
+        for n in range(6)
+    ]
+    session = SimpleNamespace(
+        id=1,
+        month="2026-10",
+        synthesis_themes=f"Run {i}. The team agrees on direction but the work is not fitting together. " * 4,
+        synthesis_statements=pdf_export.json.dumps(statements)
+    )
+    team = SimpleNamespace(
+        team_name="Leadership Team",
+        strategy_statement="Become the default choice for mid-market logistics by 2028."
+    )
+    return session, team
+
+
+def parse_fonts_per_report(session, team) -> bytes:
+    """The pre-cache render: parse every font file for every report."""
+    return pdf_export._render_session_pdf(session, team, share_fonts=False)
+
+
+def comparable_objects(pdf: bytes) -> dict:
+    """PDF objects without the creation date, the file ID and embedded font files."""
+    pdf = re.sub(rb"/CreationDate \(D:[^)]*\)|/ID \[[^\]]*\]", b"", pdf)
+    return {
+        num: body for num, body in re.findall(rb"\n(\d+) 0 obj\n(.*?)\nendobj", pdf, re.S)
+        if b"/Length1" not in body  # FontFile2 stream
+    }
+
+
+def timed_ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cache = PdfReportCache()
+    cold = timed_ms(lambda: cache.get_or_render(*make_session(0)))
+
+    # Interleave the two render paths so machine noise hits both equally
+    previous, warm = [], []
+    for i in range(1, args.runs + 1):
+        previous.append(timed_ms(lambda: parse_fonts_per_report(*make_session(i))))
+        warm.append(timed_ms(lambda: cache.get_or_render(*make_session(i))))
+    cached = [timed_ms(lambda: cache.get_or_render(*make_session(args.runs))) for _ in range(args.runs)]
+
+    shared_fonts = generate_session_pdf(*make_session(0))
+    parsed_fonts = parse_fonts_per_report(*make_session(0))
+    assert comparable_objects(shared_fonts) == comparable_objects(parsed_fonts), "shared fonts changed the output"
+
+    print(f"previous (parse fonts per report): {statistics.median(previous):7.1f} ms")
+    print(f"cold (first report, loads fonts):  {cold:7.1f} ms  (app startup preloads them)")
+    print(f"warm (fonts cached, new content):  {statistics.median(warm):7.1f} ms")
+    print(f"cached (unchanged session):        {statistics.median(cached):7.3f} ms")
+    print(f"report size: {len(shared_fonts)} bytes; {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent participant submits against the app in-process.
+
+Simulates the room tapping "submit" at once while facilitator screens poll
+status at a fixed rate, all on one event loop (as in a single Gunicorn worker),
+and reports latency percentiles. Optionally a second connection periodically
+holds the SQLite write lock (another worker or a synthesis commit), which is
+where blocking database calls stall every request on the loop.
+Uses a throwaway SQLite database.
+
+Usage (from the site root):
+    python scripts/bench_submit.py [--members 60] [--rounds 5] [--pollers 10]
+                                   [--poll-interval 0.1] [--lock-ms 0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+_tmpdir = tempfile.mkdtemp(prefix="the55-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("FACILITATOR_PASSWORD_HASH", "bench")
+os.environ.setdefault("ANTHROPIC_API_KEY", "sk-bench")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.services.auth import create_session_token  # noqa: E402
+from app.db.database import Base, SessionLocal, engine, dispose_engines  # noqa: E402
+from app.db.migrations import apply_migrations  # noqa: E402
+from app.db.models import Team, Member, Session  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label, latencies):
+    if not latencies:
+        return
+    ms = [v * 1000 for v in latencies]
+    print(
+        f"{label:<8} n={len(ms):<5} p50={percentile(ms, 50):7.1f}ms "
+        f"p95={percentile(ms, 95):7.1f}ms p99={percentile(ms, 99):7.1f}ms max={max(ms):7.1f}ms"
+    )
+
+
+def seed(members):
+    Base.metadata.create_all(bind=engine)
+    apply_migrations(engine)
+    db = SessionLocal()
+    try:
+        team = Team(company_name="Bench", team_name="Bench", code="BENCH2")
+        db.add(team)
+        db.commit()
+        db.add_all([Member(team_id=team.id, name=f"Member {i:03d}") for i in range(members)])
+        db.commit()
+        session = Session(team_id=team.id, month="2026-01")
+        db.add(session)
+        db.commit()
+        member_ids = [m.id for m in db.query(Member).filter(Member.team_id == team.id).all()]
+        return team.code, session.id, member_ids
+    finally:
+        db.close()
+
+
+def hold_write_lock(stop, hold_ms, gap_ms=500):
+    """Repeatedly take and hold the database write lock from another connection."""
+    conn = sqlite3.connect(f"{_tmpdir}/bench.db", timeout=30, isolation_level=None)
+    while not stop.is_set():
+        conn.execute("BEGIN IMMEDIATE")
+        time.sleep(hold_ms / 1000)
+        conn.execute("COMMIT")
+        stop.wait(gap_ms / 1000)
+    conn.close()
+
+
+async def run(args):
+    code, session_id, member_ids = seed(args.members)
+    transport = httpx.ASGITransport(app=app)
+    cookies = {"session": create_session_token(get_settings())}
+    submit_latencies, poll_latencies = [], []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies=cookies) as client:
+        async def submit(member_id, round_no):
+            started = time.perf_counter()
+            response = await client.post(
+                f"/join/{code}/session/{session_id}/member/{member_id}/respond",
+                data={"image_id": f"img-{round_no}", "bullets": json.dumps([f"Round {round_no}"])},
+            )
+            if round_no >= 0:
+                submit_latencies.append(time.perf_counter() - started)
+            assert response.status_code in (200, 303), response.status_code
+
+        # Unmeasured warm-up round (opens pooled connections, fills caches)
+        await asyncio.gather(*(submit(m, -1) for m in member_ids))
+
+        async def poll(stop):
+            while not stop.is_set():
+                started = time.perf_counter()
+                response = await client.get(f"/admin/sessions/{session_id}/status")
+                elapsed = time.perf_counter() - started
+                poll_latencies.append(elapsed)
+                assert response.status_code == 200, response.status_code
+                await asyncio.sleep(max(0.0, args.poll_interval - elapsed))
+
+        writer_stop = threading.Event()
+        if args.lock_ms:
+            threading.Thread(target=hold_write_lock, args=(writer_stop, args.lock_ms), daemon=True).start()
+
+        for round_no in range(args.rounds):
+            stop = asyncio.Event()
+            pollers = [asyncio.create_task(poll(stop)) for _ in range(args.pollers)]
+            await asyncio.gather(*(submit(m, round_no) for m in member_ids))
+            stop.set()
+            await asyncio.gather(*pollers)
+        writer_stop.set()
+
+    # No lifespan under ASGITransport - close pooled aiosqlite connections ourselves
+    await dispose_engines()
+
+    report("submit", submit_latencies)
+    report("status", poll_latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--pollers", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Seconds between polls per poller")
+    parser.add_argument("--lock-ms", type=int, default=0, help="Hold the write lock this long every 500ms")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
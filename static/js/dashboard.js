@@ -2,8 +2,8 @@
  * The 55 - Dashboard Tab Navigation & Dynamic Content
  *
  * Manages three tabs: Companies, Teams, Sessions
- * Each tab loads data dynamically from API endpoints
- * Search filters content on the active tab
+ * Each tab loads a page at a time from its API endpoint ("Load more" fetches the next)
+ * Search is sent to the server and reloads the active tab
  */
 (function() {
     'use strict';
@@ -24,11 +24,21 @@
         return;
     }
 
+    // Per-tab list configuration and paging state
+    const lists = {
+        companies: { url: '/admin/api/companies', container: companyList, render: renderCompanies, noun: 'companies' },
+        teams: { url: '/admin/api/teams', container: teamList, render: renderTeams, noun: 'teams' },
+        sessions: { url: '/admin/api/sessions', container: sessionsList, render: renderSessions, noun: 'sessions' }
+    };
+    Object.values(lists).forEach(list => {
+        list.search = null;       // Search term of the loaded items (null = not loaded)
+        list.nextCursor = null;
+        list.requestId = 0;       // Responses for superseded requests are ignored
+    });
+
     // State
     let currentTab = 'companies';
-    let companiesData = null;
-    let teamsData = null;
-    let sessionsData = null;
+    let currentSearch = '';
     let debounceTimer;
 
     // ========================================
@@ -65,18 +75,9 @@
             searchInput.placeholder = placeholders[tab] || 'Search...';
         }
 
-        // Load data if not already loaded
-        if (tab === 'companies' && !companiesData) {
-            loadCompanies();
-        } else if (tab === 'teams' && !teamsData) {
-            loadTeams();
-        } else if (tab === 'sessions' && !sessionsData) {
-            loadSessions();
-        }
-
-        // Apply current search filter
-        if (searchInput && searchInput.value) {
-            filterCurrentTab(searchInput.value);
+        // Load data if not loaded yet or loaded for another search
+        if (lists[tab] && lists[tab].search !== currentSearch) {
+            loadList(tab, false);
         }
     }
 
@@ -84,59 +85,88 @@
     // Data Loading
     // ========================================
 
-    async function loadCompanies() {
+    async function loadList(tab, append) {
+        const list = lists[tab];
+        const requestId = ++list.requestId;
+        const search = currentSearch;
+
+        const params = new URLSearchParams();
+        if (search) params.set('search', search);
+        if (append && list.nextCursor) params.set('cursor', list.nextCursor);
+        const query = params.toString();
+
         try {
-            const response = await fetch('/admin/api/companies');
-            if (!response.ok) throw new Error('Failed to load companies');
-            companiesData = await response.json();
-            renderCompanies(companiesData);
+            const response = await fetch(query ? `${list.url}?${query}` : list.url);
+            if (!response.ok) throw new Error(`Failed to load ${list.noun}`);
+            const page = await response.json();
+            if (requestId !== list.requestId) return;
+
+            list.search = search;
+            list.nextCursor = page.next_cursor;
+            showPage(list, page.items || [], append);
         } catch (error) {
-            console.error('Error loading companies:', error);
-            companyList.innerHTML = '<div class="empty-state">Failed to load companies. Please refresh.</div>';
+            if (requestId !== list.requestId) return;
+            console.error(`Error loading ${list.noun}:`, error);
+            if (append) {
+                const button = list.container.querySelector('.load-more-btn');
+                if (button) {
+                    button.disabled = false;
+                    button.textContent = 'Load more';
+                }
+            } else {
+                list.container.innerHTML = `<div class="empty-state">Failed to load ${list.noun}. Please refresh.</div>`;
+            }
         }
     }
 
-    async function loadTeams() {
-        try {
-            const response = await fetch('/admin/api/teams');
-            if (!response.ok) throw new Error('Failed to load teams');
-            teamsData = await response.json();
-            renderTeams(teamsData);
-        } catch (error) {
-            console.error('Error loading teams:', error);
-            teamList.innerHTML = '<div class="empty-state">Failed to load teams. Please refresh.</div>';
+    function showPage(list, items, append) {
+        const more = list.container.querySelector('.load-more');
+        if (more) more.remove();
+
+        if (!append && items.length === 0) {
+            list.container.innerHTML = list.search
+                ? '<div class="empty-state">No results match your search.</div>'
+                : `<div class="empty-state">No ${list.noun} found.</div>`;
+            return;
         }
-    }
 
-    async function loadSessions() {
-        try {
-            const response = await fetch('/admin/api/sessions');
-            if (!response.ok) throw new Error('Failed to load sessions');
-            sessionsData = await response.json();
-            renderSessions(sessionsData);
-        } catch (error) {
-            console.error('Error loading sessions:', error);
-            sessionsList.innerHTML = '<div class="empty-state">Failed to load sessions. Please refresh.</div>';
+        const html = list.render(items);
+        if (append) {
+            list.container.insertAdjacentHTML('beforeend', html);
+        } else {
+            list.container.innerHTML = html;
+        }
+
+        if (list.nextCursor) {
+            list.container.insertAdjacentHTML('beforeend', `
+            <div class="load-more" style="text-align: center; padding: var(--space-4);">
+                <button type="button" class="btn btn-ghost btn-small load-more-btn">Load more</button>
+            </div>
+        `);
         }
     }
 
+    Object.entries(lists).forEach(([tab, list]) => {
+        list.container.addEventListener('click', function(e) {
+            const button = e.target.closest('.load-more-btn');
+            if (!button) return;
+            button.disabled = true;
+            button.textContent = 'Loading...';
+            loadList(tab, true);
+        });
+    });
+
     // ========================================
     // Rendering
     // ========================================
 
     function renderCompanies(companies) {
-        if (!companies || companies.length === 0) {
-            companyList.innerHTML = '<div class="empty-state">No companies found.</div>';
-            return;
-        }
-
-        const html = companies.map(company => {
+        return companies.map(company => {
             const companyName = company.name || 'Unknown';
-            const searchText = companyName.toLowerCase();
             const teamsList = company.teams || [];
 
             return `
-            <div class="company-item" data-search="${escapeAttr(searchText)}">
+            <div class="company-item">
                 <div class="company-header" onclick="this.parentElement.classList.toggle('expanded')">
                     <span class="company-name">${escapeHtml(companyName)}</span>
                     <span class="company-team-count">${teamsList.length} team${teamsList.length !== 1 ? 's' : ''}</span>
@@ -153,24 +183,16 @@
                 </div>
             </div>
         `}).join('');
-
-        companyList.innerHTML = html;
     }
 
     function renderTeams(teams) {
-        if (!teams || teams.length === 0) {
-            teamList.innerHTML = '<div class="empty-state">No teams found.</div>';
-            return;
-        }
-
-        const html = teams.map(team => {
+        return teams.map(team => {
             const companyName = team.company_name || '';
             const teamName = team.team_name || '';
             const code = team.code || '';
-            const searchText = `${companyName} ${teamName} ${code}`.toLowerCase();
 
             return `
-            <div class="team-row" data-search="${escapeAttr(searchText)}">
+            <div class="team-row">
                 <a href="/admin/sessions/team/${team.id}" class="team-info">
                     <div class="team-company">${escapeHtml(companyName)}</div>
                     <div class="team-name">${escapeHtml(teamName)}</div>
@@ -185,25 +207,17 @@
                 </div>
             </div>
         `}).join('');
-
-        teamList.innerHTML = html;
     }
 
     function renderSessions(sessions) {
-        if (!sessions || sessions.length === 0) {
-            sessionsList.innerHTML = '<div class="empty-state">No sessions found.</div>';
-            return;
-        }
-
-        const html = sessions.map(session => {
+        return sessions.map(session => {
             const companyName = session.company_name || '';
             const teamName = session.team_name || '';
             const month = session.month || '';
             const state = session.state || 'draft';
-            const searchText = `${companyName} ${teamName} ${month}`.toLowerCase();
 
             return `
-            <a href="/admin/sessions/${session.id}" class="session-list-item" data-search="${escapeAttr(searchText)}">
+            <a href="/admin/sessions/${session.id}" class="session-list-item">
                 <div class="session-list-info">
                     <div class="session-list-company">${escapeHtml(companyName)}</div>
                     <div class="session-list-team">${escapeHtml(teamName)}</div>
@@ -212,71 +226,25 @@
                 <span class="session-state state-${escapeAttr(state)}">${escapeHtml(state)}</span>
             </a>
         `}).join('');
-
-        sessionsList.innerHTML = html;
     }
 
     // ========================================
-    // Search & Filter
+    // Search
     // ========================================
 
     if (searchInput) {
         searchInput.addEventListener('input', function(e) {
             clearTimeout(debounceTimer);
             debounceTimer = setTimeout(() => {
-                filterCurrentTab(e.target.value);
-            }, 150);
+                const term = (e.target.value || '').trim();
+                if (term === currentSearch) return;
+                currentSearch = term;
+                // Other tabs reload with the new search when opened
+                loadList(currentTab, false);
+            }, 250);
         });
     }
 
-    function filterCurrentTab(searchTerm) {
-        const term = (searchTerm || '').toLowerCase().trim();
-
-        let container;
-        let selector;
-
-        switch (currentTab) {
-            case 'companies':
-                container = companyList;
-                selector = '.company-item';
-                break;
-            case 'teams':
-                container = teamList;
-                selector = '.team-row';
-                break;
-            case 'sessions':
-                container = sessionsList;
-                selector = '.session-list-item';
-                break;
-        }
-
-        if (!container) return;
-
-        const items = container.querySelectorAll(selector);
-        let visibleCount = 0;
-
-        items.forEach(item => {
-            const searchText = item.dataset.search || '';
-            const isVisible = !term || searchText.includes(term);
-            item.style.display = isVisible ? '' : 'none';
-            if (isVisible) visibleCount++;
-        });
-
-        // Show empty state if no results
-        let emptyState = container.querySelector('.search-empty-state');
-        if (visibleCount === 0 && term) {
-            if (!emptyState) {
-                emptyState = document.createElement('div');
-                emptyState.className = 'empty-state search-empty-state';
-                emptyState.textContent = 'No results match your search.';
-                container.appendChild(emptyState);
-            }
-            emptyState.style.display = 'block';
-        } else if (emptyState) {
-            emptyState.style.display = 'none';
-        }
-    }
-
     // ========================================
     // Utility
     // ========================================
@@ -298,5 +266,5 @@
     // ========================================
 
     // Load initial tab (companies)
-    loadCompanies();
+    loadList('companies', false);
 })();
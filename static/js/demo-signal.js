@@ -13,6 +13,8 @@
 
     const DEMO_STATE_KEY = 'the55-demo-response';
     const MAX_PAGES = 1;  // All 60 images on one page
+    // Rendered tile width (auto-fill grid of 90-160px tiles); full image on selection
+    const GRID_SIZES = '(max-width: 640px) 33vw, 160px';
 
     // Get configuration from DOM
     const imageBrowser = document.querySelector('.image-browser');
@@ -147,13 +149,18 @@
             return `
                 <div class="image-card ${isSelected ? 'selected' : ''}"
                      data-image-id="${img.id}"
+                     ${img.placeholder ? `style="background-image: url('${img.placeholder}')"` : ''}
                      data-image-url="${img.url}"
                      role="button"
                      tabindex="0"
                      aria-label="Image option ${imageNum}${isSelected ? ' (selected)' : ''}">
-                    <img src="${img.url}"
-                         alt="Image option"
-                         loading="${idx < 6 ? 'eager' : 'lazy'}">
+                    <picture>
+                        ${img.avif_srcset ? `<source type="image/avif" srcset="${img.avif_srcset}" sizes="${GRID_SIZES}">` : ''}
+                        ${img.srcset ? `<source type="image/webp" srcset="${img.srcset}" sizes="${GRID_SIZES}">` : ''}
+                        <img src="${img.url}"
+                             alt="Image option"
+                             loading="${idx < 6 ? 'eager' : 'lazy'}">
+                    </picture>
                 </div>
             `;
         }).join('');
@@ -2,8 +2,9 @@
  * The 55 - Meeting Screen Controller
  *
  * Handles unified meeting screen functionality:
- * - Status polling during capture phase
+ * - Live status stream (SSE, polling fallback) during capture phase
  * - All-submitted detection and status collapse
+ * - Progressive synthesis preview while sections stream in (closed state)
  * - State change detection and ceremony reveal
  * - Keyboard navigation for synthesis levels (1/2/3)
  */
@@ -11,8 +12,10 @@
 (function() {
     'use strict';
 
-    const POLL_INTERVAL = 2500; // 2.5 seconds
+    const POLL_INTERVAL = 2500; // 2.5 seconds (fallback only)
     let pollTimer = null;
+    let eventSource = null;
+    let lastEtag = null;
     let previousSubmittedCount = 0;
 
     // Get meeting screen element
@@ -94,34 +97,124 @@
     async function pollStatus() {
         try {
             const response = await fetch(`/admin/sessions/${sessionId}/status`, {
-                credentials: 'same-origin'
+                credentials: 'same-origin',
+                cache: 'no-store',
+                headers: lastEtag ? { 'If-None-Match': lastEtag } : {}
             });
 
+            // 304: nothing changed since the last poll
+            if (response.status === 304) return;
+
             if (!response.ok) {
                 console.error('Status poll failed:', response.status);
                 return;
             }
 
+            lastEtag = response.headers.get('ETag');
             const data = await response.json();
+            handleStatus(data);
+        } catch (error) {
+            console.error('Status poll error:', error);
+        }
+    }
 
-            // State transition detection
-            if (data.state !== currentState) {
-                handleStateTransition(currentState, data.state, data);
-                return;
-            }
+    /**
+     * Apply a status update (full poll result or live delta)
+     */
+    function handleStatus(data) {
+        // State transition detection
+        if (data.state !== currentState) {
+            handleStateTransition(currentState, data.state, data);
+            return;
+        }
+
+        // Update state label in control strip
+        const stateLabel = document.getElementById('state-label');
+        if (stateLabel) stateLabel.textContent = data.state.charAt(0).toUpperCase() + data.state.slice(1);
 
-            // Update state label in control strip
-            const stateLabel = document.getElementById('state-label');
-            if (stateLabel) stateLabel.textContent = data.state.charAt(0).toUpperCase() + data.state.slice(1);
+        // Update UI for capture mode
+        if (currentState === 'draft' || currentState === 'capturing') {
+            updateCaptureUI(data);
+            checkAllSubmitted(data);
+        } else if (currentState === 'closed') {
+            renderSynthesisPreview(data.synthesis_partial);
+        }
+    }
+
+    /**
+     * Build an element with optional class and text content
+     */
+    function createElement(tag, className, text) {
+        const el = document.createElement(tag);
+        if (className) el.className = className;
+        if (text !== undefined) el.textContent = text;
+        return el;
+    }
+
+    /**
+     * Render synthesis sections that have finished streaming (closed state).
+     * Sections are appended once, in arrival order, so earlier ones don't re-animate.
+     */
+    function renderSynthesisPreview(partial) {
+        const preview = document.getElementById('synthesis-preview');
+        if (!preview) return;
+
+        if (!partial || Object.keys(partial).length === 0) {
+            // Nothing yet, or a retried attempt started over
+            preview.hidden = true;
+            preview.replaceChildren();
+            return;
+        }
 
-            // Update UI for capture mode
-            if (currentState === 'draft' || currentState === 'capturing') {
-                updateCaptureUI(data);
-                checkAllSubmitted(data);
+        function addSection(key, build) {
+            let section = preview.querySelector(`[data-section="${key}"]`);
+            if (!section) {
+                section = build();
+                section.dataset.section = key;
+                preview.append(section);
+            }
+            return section;
+        }
+
+        if (partial.themes) {
+            addSection('themes', function() {
+                const themes = createElement('div', 'meeting-themes');
+                themes.append(createElement('h2', null, 'What We Heard'), createElement('p', null, partial.themes));
+                return themes;
+            });
+        }
+        if (partial.statements && partial.statements.length) {
+            addSection('statements', function() {
+                const insights = createElement('div');
+                insights.append(createElement('h2', null, 'Key Insights'));
+                const list = createElement('ul', 'meeting-insights');
+                partial.statements.forEach(function(stmt) {
+                    const item = document.createElement('li');
+                    item.append(
+                        createElement('span', 'insight-statement', stmt.statement),
+                        createElement('span', 'insight-names', ` \u2014 ${stmt.participants.join(', ')}`)
+                    );
+                    list.append(item);
+                });
+                insights.append(list);
+                return insights;
+            });
+        }
+        if (partial.gap_type) {
+            const gap = addSection('gap', function() {
+                const gapSection = createElement('div', 'meeting-gap');
+                gapSection.append(
+                    createElement('h2', null, 'Suggested Gap'),
+                    createElement('span', `meeting-gap-badge gap-${partial.gap_type.toLowerCase()}`, partial.gap_type)
+                );
+                return gapSection;
+            });
+            if (partial.gap_reasoning && !gap.querySelector('.meeting-gap-reasoning')) {
+                gap.append(createElement('p', 'meeting-gap-reasoning', partial.gap_reasoning));
             }
-        } catch (error) {
-            console.error('Status poll error:', error);
         }
+
+        preview.hidden = preview.children.length === 0;
     }
 
     /**
@@ -129,7 +222,7 @@
      */
     function handleStateTransition(fromState, toState, data) {
         console.log(`Meeting state transition: ${fromState} -> ${toState}`);
-        stopPolling();
+        stopUpdates();
 
         if (toState === 'revealed') {
             triggerCeremonyReveal();
@@ -231,6 +324,29 @@
         });
     }
 
+    /**
+     * Start live stream, returns false if EventSource is unsupported
+     */
+    function startStream() {
+        if (!window.EventSource) return false;
+
+        eventSource = new EventSource(`/admin/sessions/${sessionId}/events`);
+        eventSource.addEventListener('status', function(event) {
+            handleStatus(JSON.parse(event.data));
+        });
+        eventSource.addEventListener('gone', stopUpdates);
+        eventSource.onerror = function() {
+            // Browser retries transient errors itself; CLOSED means the stream was refused
+            if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+                eventSource = null;
+                console.warn('Meeting status stream unavailable, falling back to polling');
+                startPolling();
+            }
+        };
+        console.log('Meeting status stream started');
+        return true;
+    }
+
     /**
      * Start polling
      */
@@ -241,9 +357,13 @@
     }
 
     /**
-     * Stop polling
+     * Stop stream and polling
      */
-    function stopPolling() {
+    function stopUpdates() {
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+        }
         if (pollTimer) {
             clearInterval(pollTimer);
             pollTimer = null;
@@ -261,10 +381,10 @@
             initKeyboardShortcuts();
         }
 
-        // Start polling for draft, capturing, and closed states
+        // Watch status for draft, capturing, and closed states
         // (to detect state changes and auto-reload)
         if (currentState === 'draft' || currentState === 'capturing' || currentState === 'closed') {
-            startPolling();
+            if (!startStream()) startPolling();
         }
     }
 
@@ -272,7 +392,7 @@
     init();
 
     // Clean up on page unload
-    window.addEventListener('beforeunload', stopPolling);
+    window.addEventListener('beforeunload', stopUpdates);
 })();
 
 /**
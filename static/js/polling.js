@@ -1,15 +1,18 @@
 /**
- * The 55 - Session Status Polling
+ * The 55 - Session Status Updates
  *
- * Polls session status API every 2-3 seconds during capturing state.
+ * Subscribes to the live status stream (Server-Sent Events) during capturing state,
+ * falling back to polling the status API every 2.5 seconds if the stream is unavailable.
  * Updates member submission status in real-time.
  */
 
 (function() {
     'use strict';
 
-    const POLL_INTERVAL = 2500; // 2.5 seconds
+    const POLL_INTERVAL = 2500; // 2.5 seconds (fallback only)
     let pollTimer = null;
+    let eventSource = null;
+    let lastEtag = null;
 
     // Get session ID from data attribute (supports session view and capture views)
     const sessionView = document.querySelector('.session-view, .session-control, .capture-control');
@@ -24,27 +27,40 @@
     async function pollStatus() {
         try {
             const response = await fetch(`/admin/sessions/${sessionId}/status`, {
-                credentials: 'same-origin'
+                credentials: 'same-origin',
+                cache: 'no-store',
+                headers: lastEtag ? { 'If-None-Match': lastEtag } : {}
             });
 
+            // 304: nothing changed since the last poll
+            if (response.status === 304) return;
+
             if (!response.ok) {
                 console.error('Status poll failed:', response.status);
                 return;
             }
 
+            lastEtag = response.headers.get('ETag');
             const data = await response.json();
-            updateUI(data);
-
-            // If state changed from capturing, stop polling and reload
-            if (data.state !== 'capturing') {
-                stopPolling();
-                window.location.reload();
-            }
+            handleStatus(data);
         } catch (error) {
             console.error('Status poll error:', error);
         }
     }
 
+    /**
+     * Apply a status update (full poll result or live delta)
+     */
+    function handleStatus(data) {
+        updateUI(data);
+
+        // If state changed from capturing, stop updates and reload
+        if (data.state !== 'capturing') {
+            stopUpdates();
+            window.location.reload();
+        }
+    }
+
     /**
      * Update UI with new status data
      */
@@ -115,6 +131,29 @@
         });
     }
 
+    /**
+     * Start live stream, returns false if EventSource is unsupported
+     */
+    function startStream() {
+        if (!window.EventSource) return false;
+
+        eventSource = new EventSource(`/admin/sessions/${sessionId}/events`);
+        eventSource.addEventListener('status', function(event) {
+            handleStatus(JSON.parse(event.data));
+        });
+        eventSource.addEventListener('gone', stopUpdates);
+        eventSource.onerror = function() {
+            // Browser retries transient errors itself; CLOSED means the stream was refused
+            if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+                eventSource = null;
+                console.warn('Status stream unavailable, falling back to polling');
+                startPolling();
+            }
+        };
+        console.log('Status stream started');
+        return true;
+    }
+
     /**
      * Start polling
      */
@@ -125,9 +164,13 @@
     }
 
     /**
-     * Stop polling
+     * Stop stream and polling
      */
-    function stopPolling() {
+    function stopUpdates() {
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+        }
         if (pollTimer) {
             clearInterval(pollTimer);
             pollTimer = null;
@@ -135,9 +178,9 @@
         }
     }
 
-    // Start polling on page load
-    startPolling();
+    // Start live updates on page load
+    if (!startStream()) startPolling();
 
     // Clean up on page unload
-    window.addEventListener('beforeunload', stopPolling);
+    window.addEventListener('beforeunload', stopUpdates);
 })();
@@ -0,0 +1,63 @@
+"""
+Shared test setup: the app runs against a throwaway database and cache
+directories, with startup image processing turned off.
+"""
+
+import os
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="the55-tests-")
+
+# Must be set before app.config is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["IMAGE_MANIFEST_PATH"] = f"{_TMP_DIR}/image_manifest.json"
+os.environ["IMAGE_PROCESSING_ON_STARTUP"] = "false"
+os.environ["IMAGE_PROCESSING_STATE_PATH"] = f"{_TMP_DIR}/image_sources.json"
+os.environ["QR_CACHE_DIR"] = f"{_TMP_DIR}/qr_cache"
+os.environ["SYNTHESIS_POLL_INTERVAL"] = "3600"  # Tests drive synthesis jobs themselves
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("FACILITATOR_PASSWORD_HASH", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "sk-test")
+
+import secrets  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.db.migrations import apply_migrations  # noqa: E402
+from app.db.models import Member, Team  # noqa: E402
+
+Base.metadata.create_all(bind=engine)
+apply_migrations(engine)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """App client logged in as the facilitator (app started once per module)."""
+    from app.main import app
+    from app.services.auth import create_session_token
+
+    with TestClient(app) as test_client:
+        test_client.cookies.set("session", create_session_token(get_settings()))
+        yield test_client
+
+
+@pytest.fixture
+def make_team():
+    """Create a team with the given number of members; returns (team_id, code, member_ids)."""
+    def _make_team(members: int = 3):
+        db = SessionLocal()
+        try:
+            code = secrets.token_hex(3).upper()
+            team = Team(company_name="Acme", team_name=f"Team {code}", code=code, strategy_statement="Win")
+            db.add(team)
+            db.commit()
+            member_rows = [Member(team_id=team.id, name=f"Member {i}") for i in range(members)]
+            db.add_all(member_rows)
+            db.commit()
+            return team.id, code, [m.id for m in member_rows]
+        finally:
+            db.close()
+    return _make_team
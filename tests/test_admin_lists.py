@@ -0,0 +1,59 @@
+"""
+Dashboard list APIs: keyset paging and malformed cursors.
+"""
+
+import base64
+import json
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.db.models import Team
+
+
+def _cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("path, values", [
+    ("/admin/api/teams", ["a", "b", "x"]),
+    ("/admin/api/teams", ["a", "b", [1]]),
+    ("/admin/api/teams", ["a", "b"]),
+    ("/admin/api/sessions", [None, "x"]),
+    ("/admin/api/sessions", ["not a date", 1]),
+])
+def test_malformed_cursor_is_rejected(client, path, values):
+    response = client.get(path, params={"cursor": _cursor(values)})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_teams_next_cursor_continues_listing(client, make_team):
+    for _ in range(3):
+        make_team(1)
+
+    first = client.get("/admin/api/teams", params={"limit": 2}).json()
+    second = client.get("/admin/api/teams", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+    first_ids = {team["id"] for team in first["items"]}
+    assert len(first_ids) == 2
+    assert second["items"] and not first_ids & {team["id"] for team in second["items"]}
+
+
+def test_search_folds_non_ascii_case(client, make_team):
+    team_id, _, _ = make_team(1)
+    db = SessionLocal()
+    try:
+        team = db.get(Team, team_id)
+        team.company_name = "ZÜRICH Logistik"
+        team.team_name = "Équipe Ölwerk"
+        db.commit()
+    finally:
+        db.close()
+
+    companies = client.get("/admin/api/companies", params={"search": "zü"}).json()["items"]
+    teams = client.get("/admin/api/teams", params={"search": "éQUIPE öl"}).json()["items"]
+
+    assert [company["name"] for company in companies] == ["ZÜRICH Logistik"]
+    assert [team["id"] for team in teams] == [team_id]
@@ -0,0 +1,73 @@
+"""
+Startup manifest: built in the background by the worker holding the image
+processing lock, never on the event loop.
+"""
+
+import fcntl
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.config import get_settings
+from app.services import image_processor
+from app.services.image_processor import run_on_startup, run_processing, write_manifest
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """Two processed images, with manifest and state files under tmp_path."""
+    image_dir = tmp_path / "reducedlive"
+    image_dir.mkdir()
+    for i in range(2):
+        Image.new("RGB", (8, 6), (i * 100, 0, 0)).save(image_dir / f"img{i}.jpg")
+    settings = get_settings()
+    monkeypatch.setattr(settings, "image_library_path", str(image_dir))
+    monkeypatch.setattr(settings, "image_manifest_path", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(settings, "image_processing_state_path", str(tmp_path / "sources.json"))
+    monkeypatch.setattr(settings, "image_processing_on_startup", False)
+    return image_dir
+
+
+def _manifest_images(library: Path) -> list:
+    with open(library.parent / "manifest.json", encoding="utf-8") as f:
+        return [entry["filename"] for entry in json.load(f)["images"]]
+
+
+def test_startup_returns_before_manifest_is_written(library, monkeypatch):
+    release = threading.Event()
+    real_write_manifest = write_manifest
+
+    def slow_write_manifest(*args, **kwargs):
+        release.wait(5)
+        return real_write_manifest(*args, **kwargs)
+
+    monkeypatch.setattr(image_processor, "write_manifest", slow_write_manifest)
+
+    run_on_startup()
+    assert not (library.parent / "manifest.json").exists()
+
+    release.set()
+    image_processor._processing_thread.join(5)
+    assert _manifest_images(library) == ["img0.jpg", "img1.jpg"]
+
+
+def test_manifest_is_written_by_one_worker(library):
+    lock_path = library.parent / "sources.lock"
+    with open(lock_path, "w") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)  # Another worker is already running
+        assert run_processing(process_images=False) is None
+    assert not (library.parent / "manifest.json").exists()
+
+    assert run_processing(process_images=False) == {"manifest_images": 2}
+    assert _manifest_images(library) == ["img0.jpg", "img1.jpg"]
+
+
+def test_shutdown_stops_manifest_build(library):
+    stop = threading.Event()
+    stop.set()
+
+    assert write_manifest(library, library.parent / "manifest.json", stop=stop) == 0
+    assert not (library.parent / "manifest.json").exists()
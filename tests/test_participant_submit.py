@@ -0,0 +1,48 @@
+"""
+Response submission against sessions that stopped capturing.
+"""
+
+from app.db.database import SessionLocal
+from app.db.models import Session, SessionState
+
+
+def _session(team_id: int, state: SessionState) -> int:
+    db = SessionLocal()
+    try:
+        session = Session(team_id=team_id, month="2026-10", state=state)
+        db.add(session)
+        db.commit()
+        return session.id
+    finally:
+        db.close()
+
+
+def _submit(client, code: str, session_id: int, member_id: int):
+    return client.post(
+        f"/join/{code}/session/{session_id}/member/{member_id}/respond",
+        data={"image_id": "img", "bullets": '["A bullet"]'},
+        follow_redirects=False
+    )
+
+
+def test_submit_to_closed_session_shows_closed_page_for_member(client, make_team):
+    team_id, code, member_ids = make_team(3)
+    session_id = _session(team_id, SessionState.CLOSED)
+
+    response = _submit(client, code, session_id, member_ids[1])
+
+    assert response.status_code == 200
+    assert response.template.name == "participant/session_closed.html"
+    assert response.context["member"].id == member_ids[1]
+    assert response.context["submission_error"]
+
+
+def test_submit_as_member_of_another_team_redirects(client, make_team):
+    team_id, code, _ = make_team(3)
+    _, _, other_member_ids = make_team(3)
+    session_id = _session(team_id, SessionState.CAPTURING)
+
+    response = _submit(client, code, session_id, other_member_ids[0])
+
+    assert response.status_code == 303
+    assert response.headers["location"] == "/join"
@@ -0,0 +1,67 @@
+"""
+PDF reports: shared fonts render the same document as fonts parsed per
+report, repeatedly, and a failure on the shared path falls back to add_font.
+"""
+
+import re
+from types import SimpleNamespace
+
+from app.services import pdf_export
+from app.services.pdf_export import PdfReportCache, SessionReportPDF
+
+
+def _report(session_id: int = 1):
+    """Session whose report uses two fonts: bold headings and regular text."""
+    session = SimpleNamespace(
+        id=session_id,
+        month="2026-10",
+        synthesis_themes="The team agrees on direction but the work is not fitting together.",
+        synthesis_statements=None
+    )
+    team = SimpleNamespace(team_name="Leadership Team", strategy_statement="Own mid-market logistics.")
+    return session, team
+
+
+def _undated(pdf: bytes) -> bytes:
+    return re.sub(rb"/CreationDate \(D:[^)]*\)|/ID \[[^\]]*\]", b"", pdf)
+
+
+def _objects(pdf: bytes) -> dict:
+    """PDF objects without the creation date, the file ID and embedded font files."""
+    return {
+        num: body for num, body in re.findall(rb"\n(\d+) 0 obj\n(.*?)\nendobj", _undated(pdf), re.S)
+        if b"/Length1" not in body  # FontFile2 stream - cut from the Latin subset when shared
+    }
+
+
+def _font_names(pdf: bytes) -> set:
+    return {name.split(b"+")[1] for name in re.findall(rb"/BaseFont /(\w+\+[\w-]+)", pdf)}
+
+
+def test_two_font_report_renders_twice_through_cache():
+    cache = PdfReportCache()
+    first = cache.render(*_report())
+    second = cache.render(*_report())
+
+    assert first.startswith(b"%PDF")
+    assert {b"Inter", b"InterBold"} <= _font_names(first)
+    assert _undated(first) == _undated(second)  # Shared fonts are not left subset by the first render
+    assert _objects(first) == _objects(pdf_export._render_session_pdf(*_report(), share_fonts=False))
+    assert cache.get_or_render(*_report()) is second
+    assert cache.stats()["shared_fonts"]
+
+
+def test_shared_font_failure_falls_back_to_add_font(monkeypatch):
+    def broken(self):
+        if self._shared_fonts:
+            raise KeyError("fpdf2 internals changed")
+
+    monkeypatch.setattr(SessionReportPDF, "_load_font_data", broken)
+    monkeypatch.setattr(pdf_export, "_shared_fonts_failed", False)
+    cache = PdfReportCache()
+
+    pdf = cache.render(*_report())
+
+    assert pdf.startswith(b"%PDF")
+    assert {b"Inter", b"InterBold"} <= _font_names(pdf)
+    assert not cache.stats()["shared_fonts"]
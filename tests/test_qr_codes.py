@@ -0,0 +1,48 @@
+"""
+QR code cache: the shared directory stays bounded whatever host headers
+clients send, and failed writes leave no temp files behind.
+"""
+
+import os
+import time
+
+from app.services import qr_codes
+from app.services.qr_codes import QrCodeCache, QrSpec
+
+
+def _spec(host: str, code: str = "ABC123") -> QrSpec:
+    return QrSpec(join_url=f"https://{host}/join?code={code}", code=code, fmt="svg")
+
+
+def test_disk_cache_keeps_most_recently_used_files(tmp_path):
+    cache = QrCodeCache(tmp_path, max_entries=2, max_files=3)
+    for i in range(6):
+        cache.get(_spec(f"host{i}.example"))
+        time.sleep(0.02)  # Distinct mtimes on coarse filesystem clocks
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 3
+    assert cache._path(_spec("host5.example")).name in files
+    assert cache.stats()["disk_evictions"] == 3
+
+
+def test_failed_write_removes_temp_file(tmp_path, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(qr_codes.os, "replace", fail_replace)
+    cache = QrCodeCache(tmp_path)
+
+    assert cache.get(_spec("example.com")).startswith(b"<svg")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stale_temp_files_are_pruned(tmp_path):
+    stale = tmp_path / "ABC123-old.png.999.tmp"
+    stale.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    cache = QrCodeCache(tmp_path)
+
+    cache.get(_spec("example.com"))
+
+    assert not stale.exists()
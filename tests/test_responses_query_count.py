@@ -0,0 +1,94 @@
+"""
+Session views and exports load responses with their members in a fixed
+number of queries: a 40-member team costs the same as a 3-member team.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.db.database import SessionLocal, engine
+from app.db.models import Response, Session, SessionState
+
+FACILITATOR_PATHS = ["", "/present", "/meeting", "/export", "/export/level3", "/export/markdown"]
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the engine while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def _revealed_session(make_team, members: int):
+    team_id, code, member_ids = make_team(members)
+    db = SessionLocal()
+    try:
+        statements = [{
+            "name": "Focus",
+            "statement": "Statement",
+            "participants": [f"Member {i}" for i in range(members)]
+        }]
+        session = Session(
+            team_id=team_id,
+            month="2026-10",
+            state=SessionState.REVEALED,
+            synthesis_themes="Themes",
+            synthesis_statements=json.dumps(statements),
+            synthesis_gap_type="Direction"
+        )
+        db.add(session)
+        db.commit()
+        db.add_all([
+            Response(session_id=session.id, member_id=m, image_id="img", bullets=json.dumps([f"b{m}"]))
+            for m in member_ids
+        ])
+        db.commit()
+        return session.id, code
+    finally:
+        db.close()
+
+
+def _count(client, url: str) -> int:
+    with QueryCounter() as counter:
+        response = client.get(url)
+    assert response.status_code == 200, url
+    return counter.count
+
+
+@pytest.fixture
+def sessions(make_team):
+    return {members: _revealed_session(make_team, members) for members in (3, 40)}
+
+
+@pytest.mark.parametrize("path", FACILITATOR_PATHS)
+def test_facilitator_views_query_count_independent_of_team_size(client, sessions, path):
+    small, _ = sessions[3]
+    large, _ = sessions[40]
+    _count(client, f"/admin/sessions/{small}{path}")  # Warm per-process caches
+
+    assert _count(client, f"/admin/sessions/{small}{path}") == _count(client, f"/admin/sessions/{large}{path}")
+
+
+def test_participant_synthesis_query_count_independent_of_team_size(client, sessions):
+    small, small_code = sessions[3]
+    large, large_code = sessions[40]
+    _count(client, f"/join/{small_code}/session/{small}/synthesis")
+
+    assert (
+        _count(client, f"/join/{small_code}/session/{small}/synthesis")
+        == _count(client, f"/join/{large_code}/session/{large}/synthesis")
+    )
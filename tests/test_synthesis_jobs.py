@@ -0,0 +1,362 @@
+"""
+Synthesis job queue driven by stub Anthropic clients: retries with backoff,
+final failure, recovery of jobs whose worker died, and supersession - a run
+started from an older response set must not store or reveal its result once
+the session was reopened or regenerated.
+"""
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.config import get_settings
+from app.db.database import SessionLocal, begin_write
+from app.db.models import JobStatus, Response, Session, SessionState, SynthesisJob
+from app.services.live import commit_session_change
+from app.services.synthesis import GENERATING_MARKER, generate_synthesis
+from app.services.synthesis_jobs import (
+    SynthesisWorker,
+    claim_next_job,
+    complete_job,
+    enqueue_synthesis,
+    recover_stale_jobs,
+    supersede_synthesis,
+)
+
+RESULT = json.dumps({
+    "themes": "Themes",
+    "statements": [{"name": "Focus", "statement": "S", "participants": ["Member 0"]}],
+    "gap_type": "Direction",
+    "gap_reasoning": "R",
+    "suggested_recalibrations": ["a", "b", "c"]
+})
+
+
+class GatedClient:
+    """Anthropic client stub whose streams wait until the gate is opened."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.messages = self
+
+    def stream(self, **kwargs):
+        return GatedStream(self.gate)
+
+
+class GatedStream:
+    def __init__(self, gate: asyncio.Event):
+        self.gate = gate
+        self.text_stream = self._text()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _text(self):
+        await self.gate.wait()
+        yield RESULT
+
+    async def get_final_message(self):
+        return SimpleNamespace(content=[SimpleNamespace(text=RESULT)], stop_reason="end_turn")
+
+
+class StubClient:
+    """Anthropic client stub that streams fixed text, or fails before streaming."""
+
+    def __init__(self, text: str = RESULT, stop_reason: str = "end_turn", error: Exception = None):
+        self.text = text
+        self.stop_reason = stop_reason
+        self.error = error
+        self.messages = self
+
+    def stream(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return StubStream(self.text, self.stop_reason)
+
+
+class StubStream:
+    def __init__(self, text: str, stop_reason: str):
+        self.text = text
+        self.stop_reason = stop_reason
+        self.text_stream = self._text()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _text(self):
+        yield self.text
+
+    async def get_final_message(self):
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)], stop_reason=self.stop_reason)
+
+
+def _closed_session(make_team) -> int:
+    team_id, _, member_ids = make_team(3)
+    db = SessionLocal()
+    try:
+        session = Session(
+            team_id=team_id, month="2026-10", state=SessionState.CLOSED, synthesis_themes=GENERATING_MARKER
+        )
+        db.add(session)
+        db.commit()
+        db.add_all([
+            Response(session_id=session.id, member_id=m, image_id="img", bullets=json.dumps([f"b{m}"]))
+            for m in member_ids
+        ])
+        db.commit()
+        return session.id
+    finally:
+        db.close()
+
+
+def _enqueue(session_id: int, force: bool = False) -> None:
+    db = SessionLocal()
+    try:
+        enqueue_synthesis(db, session_id, force=force)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _jobs(session_id: int) -> list:
+    db = SessionLocal()
+    try:
+        return [
+            (job.status, job.generation, job.force_regenerate)
+            for job in db.query(SynthesisJob).filter_by(session_id=session_id).order_by(SynthesisJob.id)
+        ]
+    finally:
+        db.close()
+
+
+def _session(session_id: int) -> Session:
+    db = SessionLocal()
+    try:
+        return db.get(Session, session_id)
+    finally:
+        db.close()
+
+
+def _claim(session_id: int):
+    claimed = claim_next_job("test:0")
+    assert claimed is not None and claimed[1] == session_id
+    return claimed
+
+
+def _latest_job(session_id: int) -> SynthesisJob:
+    db = SessionLocal()
+    try:
+        return db.query(SynthesisJob).filter_by(session_id=session_id).order_by(SynthesisJob.id.desc()).first()
+    finally:
+        db.close()
+
+
+def _update_job(job_id: int, **values) -> None:
+    db = SessionLocal()
+    try:
+        db.query(SynthesisJob).filter_by(id=job_id).update(values)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run_job(session_id: int, client) -> SynthesisWorker:
+    """Claim the session's job and run one attempt the way the worker loop does."""
+    worker = SynthesisWorker(anthropic_client=client)
+
+    async def run():
+        worker._slots = asyncio.Semaphore(0)  # _process releases the slot the run loop acquired
+        await worker._process(*_claim(session_id))
+
+    asyncio.run(run())
+    return worker
+
+
+def test_failed_attempts_are_retried_with_backoff(make_team):
+    base = get_settings().synthesis_retry_base_seconds
+    session_id = _closed_session(make_team)
+    _enqueue(session_id)
+
+    started = datetime.utcnow()
+    worker = _run_job(session_id, StubClient(error=RuntimeError("API overloaded")))
+    job = _latest_job(session_id)
+    assert worker.retried == 1
+    assert (job.status, job.attempts) == (JobStatus.QUEUED, 1)
+    assert "API overloaded" in job.last_error
+    assert job.run_after >= started + timedelta(seconds=base)
+    assert _session(session_id).synthesis_themes == GENERATING_MARKER
+
+    # Output cut off by max_tokens is retried too (not repaired), after twice the delay
+    _update_job(job.id, run_after=datetime.utcnow())
+    started = datetime.utcnow()
+    _run_job(session_id, StubClient(text=RESULT[:60], stop_reason="max_tokens"))
+    job = _latest_job(session_id)
+    assert (job.status, job.attempts) == (JobStatus.QUEUED, 2)
+    assert "max_tokens" in job.last_error
+    assert job.run_after >= started + timedelta(seconds=2 * base)
+    session = _session(session_id)
+    assert session.synthesis_themes == GENERATING_MARKER
+    assert session.synthesis_partial is None  # Sections streamed by the failed attempt are dropped
+
+    _update_job(job.id, run_after=datetime.utcnow())
+    worker = _run_job(session_id, StubClient())
+    assert worker.completed == 1
+    assert _latest_job(session_id).status == JobStatus.DONE
+    assert _session(session_id).state == SessionState.REVEALED
+
+
+def test_job_fails_for_good_after_max_attempts(make_team):
+    session_id = _closed_session(make_team)
+    _enqueue(session_id)
+    job = _latest_job(session_id)
+    _update_job(job.id, max_attempts=2)
+
+    _run_job(session_id, StubClient(error=RuntimeError("API overloaded")))
+    _update_job(job.id, run_after=datetime.utcnow())
+    worker = _run_job(session_id, StubClient(error=RuntimeError("API overloaded")))
+
+    job = _latest_job(session_id)
+    assert worker.failed == 1
+    assert (job.status, job.attempts) == (JobStatus.FAILED, 2)
+    assert job.finished_at is not None
+    session = _session(session_id)
+    assert session.state == SessionState.CLOSED
+    assert session.synthesis_themes == "Synthesis generation failed. Please try again."
+
+
+def test_recovery_requeues_job_whose_worker_died(make_team):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    live_session_id = _closed_session(make_team)
+    _enqueue(live_session_id)
+    live_job_id = _claim(live_session_id)[0]
+    _update_job(live_job_id, locked_by=f"{socket.gethostname()}:1")
+    dead_session_id = _closed_session(make_team)
+    _enqueue(dead_session_id)
+    dead_job_id = _claim(dead_session_id)[0]
+    _update_job(dead_job_id, locked_by=f"{socket.gethostname()}:{dead.pid}")
+
+    assert recover_stale_jobs() == 1
+
+    job = _latest_job(dead_session_id)
+    assert (job.id, job.status, job.attempts, job.locked_by) == (dead_job_id, JobStatus.QUEUED, 1, None)
+    assert "Worker stopped" in job.last_error
+    assert _latest_job(live_session_id).status == JobStatus.RUNNING  # Owner (pid 1) is alive
+    complete_job(live_job_id)
+    _update_job(dead_job_id, status=JobStatus.DONE)
+
+
+def test_reopened_session_drops_result_of_running_job(make_team):
+    session_id = _closed_session(make_team)
+    _enqueue(session_id)
+    job_id, _, force, generation = _claim(session_id)
+    client = GatedClient()
+
+    async def scenario():
+        run = asyncio.create_task(generate_synthesis(session_id, client, force=force, generation=generation))
+        await asyncio.sleep(0.05)
+
+        # Reopen for a latecomer, then close again while the first run is in flight
+        db = SessionLocal()
+        session = db.get(Session, session_id)
+        supersede_synthesis(db, session)
+        session.state = SessionState.CAPTURING
+        session.synthesis_themes = None
+        db.commit()
+        session.state = SessionState.CLOSED
+        session.synthesis_themes = GENERATING_MARKER
+        enqueue_synthesis(db, session_id)
+        db.commit()
+        db.close()
+
+        client.gate.set()
+        await run
+
+    asyncio.run(scenario())
+    complete_job(job_id)
+
+    session = _session(session_id)
+    assert session.state == SessionState.CLOSED
+    assert session.synthesis_themes == GENERATING_MARKER
+    assert session.synthesis_statements is None
+    assert _jobs(session_id) == [(JobStatus.SUPERSEDED, 0, False), (JobStatus.QUEUED, 1, False)]
+
+    # The fresh job stores and reveals
+    job_id, _, force, generation = _claim(session_id)
+    client = GatedClient()
+    client.gate.set()
+    asyncio.run(generate_synthesis(session_id, client, force=force, generation=generation))
+    complete_job(job_id)
+    session = _session(session_id)
+    assert session.state == SessionState.REVEALED
+    assert session.synthesis_themes == "Themes"
+
+
+def test_forced_retry_supersedes_running_job(make_team):
+    session_id = _closed_session(make_team)
+    _enqueue(session_id)
+    _claim(session_id)
+
+    _enqueue(session_id, force=True)
+
+    assert _jobs(session_id) == [(JobStatus.SUPERSEDED, 0, False), (JobStatus.QUEUED, 1, True)]
+    assert _session(session_id).synthesis_generation == 1
+    complete_job(_claim(session_id)[0])
+
+
+def test_retry_with_unchanged_inputs_reuses_running_job(make_team):
+    session_id = _closed_session(make_team)
+    _enqueue(session_id)
+    _claim(session_id)
+
+    db = SessionLocal()
+    db.get(Session, session_id).synthesis_themes = None  # Retry clears the synthesis first
+    enqueue_synthesis(db, session_id)
+    db.commit()
+    db.close()
+
+    assert _jobs(session_id) == [(JobStatus.RUNNING, 0, False)]
+    assert _session(session_id).synthesis_themes == GENERATING_MARKER
+
+
+def test_concurrent_retries_share_one_active_job(make_team):
+    session_id = _closed_session(make_team)
+    first_queued = threading.Event()
+    errors = []
+
+    def retry(force: bool, hold: float):
+        # What the retry route does, holding its transaction open for a while
+        db = SessionLocal()
+        try:
+            begin_write(db)
+            db.get(Session, session_id).synthesis_themes = None
+            enqueue_synthesis(db, session_id, force=force)
+            first_queued.set()
+            time.sleep(hold)
+            commit_session_change(db, session_id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    other_worker = threading.Thread(target=retry, args=(False, 0.2))
+    other_worker.start()
+    first_queued.wait()
+    retry(True, 0)
+    other_worker.join()
+
+    assert errors == []
+    assert _jobs(session_id) == [(JobStatus.QUEUED, 0, True)]
+    complete_job(_claim(session_id)[0])
@@ -0,0 +1,79 @@
+"""
+Synthesis output parsing: small syntax errors are repaired, truncated output
+raises a retryable error without a repair request.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.synthesis_output import SynthesisTruncatedError, parse_or_repair
+
+RESULT = {
+    "themes": "Themes",
+    "statements": [{"name": "Focus", "statement": "S", "participants": ["Member 0"]}],
+    "gap_type": "Direction",
+    "gap_reasoning": "R",
+    "suggested_recalibrations": ["a", "b", "c"]
+}
+
+
+class RepairClient:
+    """Anthropic client stub that records repair requests and returns a valid result."""
+
+    def __init__(self):
+        self.messages = self
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(RESULT))], stop_reason="end_turn")
+
+
+def _parse(text: str, client: RepairClient, stop_reason: str = "end_turn"):
+    return asyncio.run(parse_or_repair(text, client, "model", stop_reason=stop_reason))
+
+
+def test_small_syntax_error_is_repaired():
+    client = RepairClient()
+    text = json.dumps(RESULT)[:-1] + ",}"  # Trailing comma
+
+    assert _parse(text, client).themes == "Themes"
+    assert client.calls == 1
+
+
+def test_unclosed_object_raises_without_repair():
+    client = RepairClient()
+    text = json.dumps(RESULT)[:120]
+
+    with pytest.raises(SynthesisTruncatedError):
+        _parse(text, client)
+    assert client.calls == 0
+
+
+def test_max_tokens_stop_raises_without_repair():
+    client = RepairClient()
+    text = json.dumps(RESULT)  # Parses, but the model was cut off before finishing
+
+    with pytest.raises(SynthesisTruncatedError):
+        _parse(text, client, stop_reason="max_tokens")
+    assert client.calls == 0
+
+
+def test_unclosed_brace_in_preamble_is_skipped():
+    client = RepairClient()
+    text = "Note: use {braces.\n```json\n" + json.dumps(RESULT) + "\n```"
+
+    assert _parse(text, client).themes == "Themes"
+    assert client.calls == 0
+
+
+def test_cut_off_object_with_complete_nested_objects_is_truncated():
+    client = RepairClient()
+    text = "Here you go {braces.\n" + json.dumps(RESULT)[:-40]  # Statements closed, recalibrations cut
+
+    with pytest.raises(SynthesisTruncatedError):
+        _parse(text, client)
+    assert client.calls == 0